@@ -1,22 +1,37 @@
 from functools import lru_cache
+from typing import Optional
 from src.config.settings import settings
 from src.infrastructure.ml.embedding_service import EmbeddingService
 from src.infrastructure.ml.chunking_service import ChunkingService
 from src.infrastructure.ml.clustering_service import ClusteringService
 from src.infrastructure.ml.anomaly_service import AnomalyDetectionService
 from src.infrastructure.ml.quality_service import QualityClassificationService
-from src.infrastructure.persistence.document_repository import FileDocumentRepository
+from src.infrastructure.ml.knn_graph_service import KnnGraphService
+from src.infrastructure.ml.spatial_index_service import SpatialIndexService
+from src.infrastructure.cache.semantic_query_cache import SemanticQueryCache
+from src.infrastructure.cache.extracted_text_cache import ExtractedTextCache
+from src.infrastructure.concurrency.bounded_executor import BoundedExecutor
+from src.infrastructure.concurrency.single_flight import SingleFlight
+from src.infrastructure.scheduling.analytics_scheduler import AnalyticsScheduler
+from src.infrastructure.persistence.sqlite_document_repository import (
+    SqliteDocumentRepository,
+)
 from src.infrastructure.persistence.vector_repository import ChromaVectorRepository
 from src.infrastructure.persistence.model_repository import FileModelRepository
 from src.infrastructure.document.document_processor import DocumentProcessor
+from src.infrastructure.document.pdf_extraction_pool import IsolatedPdfExtractor
 from src.application.use_cases import (
     IngestDocumentUseCase,
+    ExtractDocumentTextUseCase,
+    ReprocessDocumentUseCase,
     SearchDocumentsUseCase,
     ClusterDocumentsUseCase,
     DetectAnomaliesUseCase,
     ClassifyQualityUseCase,
     GetVisualizationDataUseCase,
     GetSystemStatusUseCase,
+    RelatedContentUseCase,
+    RefreshAnalyticsUseCase,
 )
 
 
@@ -35,43 +50,134 @@ def get_chunking_service() -> ChunkingService:
 @lru_cache()
 def get_clustering_service() -> ClusteringService:
     # input: none; creates singleton clustering service; output: service instance
-    return ClusteringService()
+    return ClusteringService(
+        settings.cluster_drift_threshold,
+        settings.cluster_batch_size,
+        settings.cluster_max_vocabulary,
+        settings.cluster_auto_k_workers,
+        settings.cluster_auto_k_sample_size,
+    )
 
 
 @lru_cache()
 def get_anomaly_service() -> AnomalyDetectionService:
     # input: none; creates singleton anomaly service; output: service instance
-    return AnomalyDetectionService()
+    return AnomalyDetectionService(
+        settings.anomaly_n_jobs, settings.anomaly_reservoir_size
+    )
 
 
 @lru_cache()
 def get_quality_service() -> QualityClassificationService:
     # input: none; creates singleton quality service; output: service instance
-    return QualityClassificationService()
+    return QualityClassificationService(online_weight=settings.quality_online_weight)
+
+
+@lru_cache()
+def get_knn_graph_service() -> KnnGraphService:
+    # input: none; creates singleton knn graph service; output: service instance
+    return KnnGraphService(k=settings.knn_graph_k)
+
+
+@lru_cache()
+def get_spatial_index_service() -> SpatialIndexService:
+    # input: none; creates singleton spatial index; output: service instance
+    return SpatialIndexService(settings.visualization_max_level)
+
+
+@lru_cache()
+def get_query_cache() -> SemanticQueryCache:
+    # input: none; creates singleton search result cache; output: cache instance
+    return SemanticQueryCache(
+        settings.search_cache_size, settings.search_cache_threshold
+    )
 
 
 @lru_cache()
-def get_document_repository() -> FileDocumentRepository:
-    # input: none; creates singleton document repository; output: repository instance
-    return FileDocumentRepository(settings.documents_db_dir)
+def get_search_executor() -> BoundedExecutor:
+    # input: none; creates singleton pool for latency-sensitive reads; output: executor instance
+    return BoundedExecutor(
+        "search", settings.search_workers, settings.search_queue_size
+    )
+
+
+@lru_cache()
+def get_analytics_executor() -> BoundedExecutor:
+    # input: none; creates singleton pool for heavy model and ingest jobs; output: executor instance
+    return BoundedExecutor(
+        "analytics", settings.analytics_workers, settings.analytics_queue_size
+    )
+
+
+@lru_cache()
+def get_analytics_flight() -> SingleFlight:
+    # input: none; creates singleton coalescer for identical analytics requests; output: coalescer instance
+    return SingleFlight()
+
+
+@lru_cache()
+def get_document_repository() -> SqliteDocumentRepository:
+    # input: none; creates singleton document repository, importing legacy json once; output: repository instance
+    repository = SqliteDocumentRepository(settings.documents_sqlite_path)
+    repository.migrate_from_json(settings.documents_db_dir)
+    return repository
 
 
 @lru_cache()
 def get_vector_repository() -> ChromaVectorRepository:
     # input: none; creates singleton vector repository; output: repository instance
-    return ChromaVectorRepository(settings.chroma_persist_dir)
+    return ChromaVectorRepository(
+        settings.chroma_persist_dir, settings.vector_batch_size
+    )
 
 
 @lru_cache()
 def get_model_repository() -> FileModelRepository:
     # input: none; creates singleton model repository; output: repository instance
-    return FileModelRepository(settings.models_dir)
+    return FileModelRepository(
+        settings.models_dir, settings.model_max_versions, settings.model_mmap_threshold
+    )
+
+
+@lru_cache()
+def get_pdf_extractor() -> Optional[IsolatedPdfExtractor]:
+    # input: none; creates singleton supervised pdf worker pool when enabled; output: pool or None
+    if not settings.pdf_isolation_enabled:
+        return None
+    return IsolatedPdfExtractor(
+        settings.pdf_workers,
+        settings.pdf_timeout_seconds,
+        settings.pdf_max_rss,
+        settings.pdf_page_timeout_seconds,
+        settings.pdf_max_address_space,
+    )
 
 
 @lru_cache()
 def get_document_processor() -> DocumentProcessor:
     # input: none; creates singleton document processor; output: processor instance
-    return DocumentProcessor()
+    return DocumentProcessor(get_pdf_extractor())
+
+
+@lru_cache()
+def get_text_cache() -> ExtractedTextCache:
+    # input: none; creates singleton extracted text cache; output: cache instance
+    return ExtractedTextCache(settings.extracted_text_cache_dir)
+
+
+def get_extract_text_use_case() -> ExtractDocumentTextUseCase:
+    # input: none; creates cached text extraction use case; output: use case instance
+    return ExtractDocumentTextUseCase(get_document_processor(), get_text_cache())
+
+
+def get_reprocess_use_case() -> ReprocessDocumentUseCase:
+    # input: none; creates document reprocessing use case; output: use case instance
+    return ReprocessDocumentUseCase(
+        get_document_repository(),
+        get_vector_repository(),
+        get_extract_text_use_case(),
+        get_ingest_use_case(),
+    )
 
 
 def get_ingest_use_case() -> IngestDocumentUseCase:
@@ -81,12 +187,18 @@ def get_ingest_use_case() -> IngestDocumentUseCase:
         get_vector_repository(),
         get_chunking_service(),
         get_embedding_service(),
+        get_clustering_service(),
+        get_model_repository(),
+        get_anomaly_service(),
+        get_quality_service(),
     )
 
 
 def get_search_use_case() -> SearchDocumentsUseCase:
     # input: none; creates search use case with dependencies; output: use case instance
-    return SearchDocumentsUseCase(get_vector_repository(), get_embedding_service())
+    return SearchDocumentsUseCase(
+        get_vector_repository(), get_embedding_service(), get_query_cache()
+    )
 
 
 def get_cluster_use_case() -> ClusterDocumentsUseCase:
@@ -106,17 +218,53 @@ def get_anomaly_use_case() -> DetectAnomaliesUseCase:
 def get_quality_use_case() -> ClassifyQualityUseCase:
     # input: none; creates quality use case with dependencies; output: use case instance
     return ClassifyQualityUseCase(
-        get_vector_repository(), get_quality_service(), get_model_repository()
+        get_vector_repository(),
+        get_quality_service(),
+        get_model_repository(),
+        retrain_every=settings.quality_retrain_every,
+    )
+
+
+def get_related_use_case() -> RelatedContentUseCase:
+    # input: none; creates related content use case with dependencies; output: use case instance
+    return RelatedContentUseCase(
+        get_vector_repository(),
+        get_knn_graph_service(),
+        get_model_repository(),
+        save_every=settings.knn_graph_save_every,
     )
 
 
 def get_visualization_use_case() -> GetVisualizationDataUseCase:
     # input: none; creates visualization use case with dependencies; output: use case instance
     return GetVisualizationDataUseCase(
-        get_vector_repository(), get_clustering_service()
+        get_vector_repository(),
+        get_clustering_service(),
+        get_model_repository(),
+        get_spatial_index_service(),
     )
 
 
 def get_status_use_case() -> GetSystemStatusUseCase:
     # input: none; creates status use case with dependencies; output: use case instance
     return GetSystemStatusUseCase(get_document_repository(), get_vector_repository())
+
+
+@lru_cache()
+def get_analytics_scheduler() -> AnalyticsScheduler:
+    # input: none; creates singleton background analytics scheduler; output: scheduler instance
+    refresh_use_case = RefreshAnalyticsUseCase(
+        get_cluster_use_case(),
+        get_anomaly_use_case(),
+        get_visualization_use_case(),
+        settings.n_clusters,
+        settings.anomaly_contamination,
+        settings.analytics_anomaly_limit,
+    )
+    return AnalyticsScheduler(
+        refresh_use_case.jobs(),
+        get_vector_repository().get_generation,
+        settings.analytics_refresh_interval,
+        settings.analytics_refresh_min_changes,
+        settings.analytics_max_staleness,
+    )
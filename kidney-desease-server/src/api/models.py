@@ -22,11 +22,21 @@ class DocumentResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
+class DocumentPageResponse(BaseModel):
+    # response model for one keyset page of documents
+    documents: List[DocumentResponse]
+    next_cursor: Optional[str] = None
+
+
 class SearchRequest(BaseModel):
     # request model for semantic search
     query: str = Field(..., min_length=1, description="Search query text")
     top_k: int = Field(10, ge=1, le=100, description="Number of results to return")
     filter_document_id: Optional[str] = Field(None, description="Filter by document ID")
+    filter_cluster_id: Optional[int] = Field(None, description="Filter by cluster ID")
+    filter_quality_label: Optional[QualityLabel] = Field(
+        None, description="Filter by stored quality label"
+    )
 
 
 class SearchResultResponse(BaseModel):
@@ -45,9 +55,60 @@ class SearchResponse(BaseModel):
     total_results: int
 
 
+class SearchCacheStatsResponse(BaseModel):
+    # response model for query cache statistics
+    entries: int
+    capacity: int
+    similarity_threshold: float
+    generation: int
+    hits: int
+    misses: int
+    hit_rate: float
+    saved_seconds: float
+
+
+class SimilarChunksResponse(BaseModel):
+    # response model for more-like-this search
+    chunk_id: str
+    results: List[SearchResultResponse]
+    total_results: int
+
+
+class RelatedChunkResponse(BaseModel):
+    # response model for a knn graph neighbour
+    chunk_id: str
+    score: float
+
+
+class RelatedChunksResponse(BaseModel):
+    # response model for related chunks endpoint
+    chunk_id: str
+    related: List[RelatedChunkResponse]
+
+
+class RelatedDocumentResponse(BaseModel):
+    # response model for a related document
+    document_id: str
+    score: float
+
+
+class RelatedDocumentsResponse(BaseModel):
+    # response model for related documents endpoint
+    document_id: str
+    related: List[RelatedDocumentResponse]
+
+
 class ClusterRequest(BaseModel):
     # request model for clustering
     n_clusters: int = Field(5, ge=2, le=20, description="Number of clusters")
+    refit: bool = Field(
+        False, description="Force a full refit instead of reusing the online model"
+    )
+    auto_k: bool = Field(
+        False, description="Select the number of clusters automatically"
+    )
+    k_min: int = Field(2, ge=2, le=50, description="Smallest k evaluated in auto mode")
+    k_max: int = Field(10, ge=2, le=50, description="Largest k evaluated in auto mode")
 
 
 class ClusterInfoResponse(BaseModel):
@@ -58,10 +119,29 @@ class ClusterInfoResponse(BaseModel):
     representative_chunks: List[str]
 
 
+class KScoreResponse(BaseModel):
+    # response model for one point of the k selection curve
+    k: int
+    silhouette: float
+    inertia: float
+
+
 class ClusterResponse(BaseModel):
     # response model for clustering endpoint
     clusters: List[ClusterInfoResponse]
     total_chunks: int
+    refitted: bool = True
+    drift_ratio: float = 0.0
+    n_clusters: Optional[int] = None
+    elbow_k: Optional[int] = None
+    k_scores: List[KScoreResponse] = []
+
+
+class ClusterSnapshotResponse(ClusterResponse):
+    # response model for the background-computed clustering snapshot
+    computed_at: datetime
+    generation: int
+    stale: bool
 
 
 class AnomalyRequest(BaseModel):
@@ -69,6 +149,9 @@ class AnomalyRequest(BaseModel):
     contamination: float = Field(
         0.1, ge=0.01, le=0.5, description="Expected anomaly rate"
     )
+    limit: int = Field(
+        100, ge=1, le=1000, description="Number of most anomalous chunks to return"
+    )
 
 
 class AnomalyResultResponse(BaseModel):
@@ -84,6 +167,14 @@ class AnomalyResponse(BaseModel):
     results: List[AnomalyResultResponse]
     total_anomalies: int
     total_chunks: int
+    next_cursor: Optional[str] = None
+
+
+class AnomalySnapshotResponse(AnomalyResponse):
+    # response model for the background-computed anomaly snapshot
+    computed_at: datetime
+    generation: int
+    stale: bool
 
 
 class QualityTrainingRequest(BaseModel):
@@ -91,6 +182,9 @@ class QualityTrainingRequest(BaseModel):
     training_data: List[Dict[str, Any]] = Field(
         ..., description="List of training samples with 'chunk_id' and 'label' fields"
     )
+    incremental: bool = Field(
+        False, description="Fold labels into the live model instead of retraining"
+    )
 
 
 class QualityTrainingResponse(BaseModel):
@@ -120,6 +214,73 @@ class VisualizationResponse(BaseModel):
     texts: List[str]
     chunk_ids: List[str]
     document_ids: List[str]
+    computed_at: Optional[datetime] = None
+    generation: Optional[int] = None
+    stale: bool = False
+
+
+class VisualizationBinResponse(BaseModel):
+    # response model for an aggregated grid cell
+    x: float
+    y: float
+    count: int
+    label: int
+
+
+class VisualizationPointResponse(BaseModel):
+    # response model for a raw scatter point
+    chunk_id: str
+    document_id: str
+    x: float
+    y: float
+    label: int
+    text: str
+
+
+class VisualizationTileResponse(BaseModel):
+    # response model for level-of-detail visualization data
+    zoom: int
+    mode: str
+    bounds: List[float]
+    total_in_viewport: int
+    bins: List[VisualizationBinResponse]
+    points: List[VisualizationPointResponse]
+    stale: bool = False
+
+
+class ModelVersionResponse(BaseModel):
+    # response model for one published model version
+    version: int
+    created_at: datetime
+    size: int
+    mmap: bool
+    current: bool
+    metrics: Dict[str, float]
+    checkpoint: bool = False
+
+
+class ModelVersionsResponse(BaseModel):
+    # response model for a model's version history
+    model_name: str
+    versions: List[ModelVersionResponse]
+
+
+class AnalyticsSnapshotResponse(BaseModel):
+    # response model for one analytics snapshot's freshness
+    generation: int
+    corpus_version: int
+    computed_at: datetime
+    duration_seconds: float
+    age_seconds: float
+    stale: bool
+
+
+class AnalyticsStatusResponse(BaseModel):
+    # response model for the background analytics scheduler
+    running: bool
+    pending_changes: int
+    last_cycle_at: Optional[datetime] = None
+    snapshots: Dict[str, AnalyticsSnapshotResponse]
 
 
 class SystemStatusResponse(BaseModel):
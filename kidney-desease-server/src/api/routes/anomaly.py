@@ -1,59 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 import logging
 from src.api.models import (
     AnomalyRequest,
     AnomalyResponse,
-    AnomalyResultResponse
+    AnomalyResultResponse,
+    AnomalySnapshotResponse
 )
-from src.api.dependencies import get_anomaly_use_case
+from src.api.dependencies import (
+    get_anomaly_use_case,
+    get_analytics_executor,
+    get_analytics_flight,
+    get_analytics_scheduler
+)
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/anomaly", tags=["anomaly"])
 
 
-@router.post("/detect", response_model=AnomalyResponse)
-async def detect_anomalies(
-    request: AnomalyRequest,
-    anomaly_use_case = Depends(get_anomaly_use_case)
-):
-    try:
-        results = anomaly_use_case.execute(contamination=request.contamination)
-
-        # Limit results to 1000 items
-        if len(results) > 1000:
-            results = results[:1000]
-
-        anomaly_responses = [
+def _to_response(page, response_model=AnomalyResponse, **extra) -> AnomalyResponse:
+    # input: ranked page dict, response class, extra fields; maps to api model; output: anomaly response
+    return response_model(
+        results=[
             AnomalyResultResponse(
                 chunk_id=result.chunk_id,
                 is_anomaly=result.is_anomaly,
                 anomaly_score=result.anomaly_score,
                 metadata=result.metadata
             )
-            for result in results
-        ]
-        
-        total_anomalies = sum(1 for r in anomaly_responses if r.is_anomaly)
-        
-        logger.info(
-            f"Anomaly detection completed: {total_anomalies}/{len(anomaly_responses)} anomalies "
-            f"(limited to 1000 results)"
+            for result in page["results"]
+        ],
+        total_anomalies=page["total_anomalies"],
+        total_chunks=page["total_chunks"],
+        next_cursor=page["next_cursor"],
+        **extra
+    )
+
+
+@router.post("/detect", response_model=AnomalyResponse)
+async def detect_anomalies(
+    request: AnomalyRequest,
+    anomaly_use_case = Depends(get_anomaly_use_case),
+    analytics_executor = Depends(get_analytics_executor),
+    analytics_flight = Depends(get_analytics_flight)
+):
+    # input: anomaly request; refits or joins an identical run and ranks anomalies; output: first ranked page
+    try:
+        page = await analytics_flight.run(
+            ("anomaly_detect", request.contamination, request.limit),
+            analytics_executor.run,
+            anomaly_use_case.execute,
+            contamination=request.contamination,
+            limit=request.limit
         )
-        
-        return AnomalyResponse(
-            results=anomaly_responses,
-            total_anomalies=total_anomalies,
-            total_chunks=len(anomaly_responses)
+
+        logger.info(
+            f"Anomaly detection completed: {page['total_anomalies']}/{page['total_chunks']} anomalies, "
+            f"returning {len(page['results'])} most anomalous"
         )
 
+        return _to_response(page)
+
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Anomaly detection error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Anomaly detection failed: {str(e)}"
         )
+
+
+@router.get("/results", response_model=AnomalyResponse)
+async def get_stored_anomalies(
+    only_anomalies: bool = True,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    anomaly_use_case = Depends(get_anomaly_use_case),
+    analytics_executor = Depends(get_analytics_executor)
+):
+    # input: anomaly-only flag, page size, cursor; ranks stored scores; output: ranked page
+    try:
+        page = await analytics_executor.run(
+            anomaly_use_case.get_stored,
+            only_anomalies=only_anomalies,
+            limit=limit,
+            cursor=cursor
+        )
+        return _to_response(page)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+    except Exception as e:
+        logger.error(f"Stored anomaly lookup error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Stored anomaly lookup failed: {str(e)}"
+        )
+
+
+@router.get("/latest", response_model=AnomalySnapshotResponse)
+async def get_latest_anomalies(
+    scheduler = Depends(get_analytics_scheduler)
+):
+    # input: none; reads the background anomaly snapshot; output: ranked page with freshness
+    snapshot = scheduler.get("anomalies")
+
+    if snapshot is None:
+        scheduler.trigger()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anomaly snapshot not computed yet; refresh scheduled"
+        )
+
+    return _to_response(
+        snapshot["result"],
+        AnomalySnapshotResponse,
+        computed_at=snapshot["computed_at"],
+        generation=snapshot["generation"],
+        stale=snapshot["stale"]
+    )
@@ -1,21 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 import logging
-from src.api.models import ClusterRequest, ClusterResponse, ClusterInfoResponse
-from src.api.dependencies import get_cluster_use_case
+from src.api.models import (
+    ClusterRequest,
+    ClusterResponse,
+    ClusterInfoResponse,
+    ClusterSnapshotResponse,
+    KScoreResponse,
+)
+from src.api.dependencies import (
+    get_cluster_use_case,
+    get_analytics_executor,
+    get_analytics_flight,
+    get_analytics_scheduler,
+)
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/clustering", tags=["clustering"])
 
 
-@router.post("/cluster", response_model=ClusterResponse)
-async def perform_clustering(
-    request: ClusterRequest, cluster_use_case=Depends(get_cluster_use_case)
-):
-    # input: cluster request; performs clustering; output: cluster information
-    try:
-        cluster_info = cluster_use_case.execute(n_clusters=request.n_clusters)
-
-        cluster_responses = [
+def _to_response(cluster_info, last_run, response_model=ClusterResponse, **extra):
+    # input: cluster infos, run details, response class, extra fields; maps to api model; output: cluster response
+    return response_model(
+        clusters=[
             ClusterInfoResponse(
                 cluster_id=info.cluster_id,
                 size=info.size,
@@ -23,21 +30,89 @@ async def perform_clustering(
                 representative_chunks=info.representative_chunks,
             )
             for info in cluster_info
-        ]
+        ],
+        total_chunks=sum(info.size for info in cluster_info),
+        refitted=last_run.get("refitted", True),
+        drift_ratio=last_run.get("drift_ratio", 0.0),
+        n_clusters=last_run.get("n_clusters"),
+        elbow_k=last_run.get("elbow_k"),
+        k_scores=[KScoreResponse(**score) for score in last_run.get("k_scores", [])],
+        **extra,
+    )
+
 
-        total_chunks = sum(info.size for info in cluster_info)
+@router.post("/cluster", response_model=ClusterResponse)
+async def perform_clustering(
+    request: ClusterRequest,
+    cluster_use_case=Depends(get_cluster_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+    analytics_flight=Depends(get_analytics_flight),
+):
+    # input: cluster request; performs or joins an identical clustering run; output: cluster information
+    def run_clustering():
+        cluster_info = cluster_use_case.execute(
+            n_clusters=request.n_clusters,
+            refit=request.refit,
+            auto_k=request.auto_k,
+            k_min=request.k_min,
+            k_max=request.k_max,
+        )
+        return cluster_info, cluster_use_case.last_run
+
+    try:
+        key = (
+            "cluster",
+            request.n_clusters,
+            request.refit,
+            request.auto_k,
+            request.k_min,
+            request.k_max,
+        )
+        cluster_info, last_run = await analytics_flight.run(
+            key, analytics_executor.run, run_clustering
+        )
+
+        response = _to_response(cluster_info, last_run)
 
         logger.info(
-            f"Clustering completed: {len(cluster_responses)} clusters, {total_chunks} chunks"
+            f"Clustering completed: {len(response.clusters)} clusters, {response.total_chunks} chunks"
         )
 
-        return ClusterResponse(clusters=cluster_responses, total_chunks=total_chunks)
+        return response
 
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Clustering error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Clustering failed: {str(e)}",
         )
+
+
+@router.get("/latest", response_model=ClusterSnapshotResponse)
+async def get_latest_clusters(scheduler=Depends(get_analytics_scheduler)):
+    # input: none; reads the background clustering snapshot; output: clusters with freshness
+    snapshot = scheduler.get("clustering")
+
+    if snapshot is None:
+        scheduler.trigger()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Clustering snapshot not computed yet; refresh scheduled",
+        )
+
+    return _to_response(
+        snapshot["result"]["clusters"],
+        snapshot["result"]["last_run"],
+        ClusterSnapshotResponse,
+        computed_at=snapshot["computed_at"],
+        generation=snapshot["generation"],
+        stale=snapshot["stale"],
+    )
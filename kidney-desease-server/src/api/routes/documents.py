@@ -1,12 +1,22 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
-from typing import List
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    UploadFile,
+    File,
+    Depends,
+    HTTPException,
+    Query,
+    status,
+)
+from typing import List, Optional
+from datetime import datetime
 import uuid
-import shutil
 from pathlib import Path
 import logging
 from src.api.models import (
     DocumentUploadResponse,
     DocumentResponse,
+    DocumentPageResponse,
     MessageResponse,
     ErrorResponse,
 )
@@ -14,8 +24,18 @@ from src.domain.entities import Document, DocumentType, ProcessingStatus
 from src.api.dependencies import (
     get_ingest_use_case,
     get_document_repository,
-    get_document_processor,
+    get_extract_text_use_case,
+    get_reprocess_use_case,
     get_vector_repository,
+    get_related_use_case,
+    get_analytics_executor,
+    get_analytics_scheduler,
+)
+from src.application.services import ExtractionFailedError
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
+from src.infrastructure.document.upload_stream import (
+    UploadTooLargeError,
+    stream_upload,
 )
 from src.config.settings import settings
 
@@ -29,9 +49,14 @@ router = APIRouter(prefix="/documents", tags=["documents"])
     status_code=status.HTTP_201_CREATED,
 )
 async def upload_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     ingest_use_case=Depends(get_ingest_use_case),
-    doc_processor=Depends(get_document_processor),
+    extract_use_case=Depends(get_extract_text_use_case),
+    doc_repo=Depends(get_document_repository),
+    related_use_case=Depends(get_related_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+    scheduler=Depends(get_analytics_scheduler),
 ):
     # input: uploaded file; processes and ingests; output: upload response
     try:
@@ -49,24 +74,65 @@ async def upload_document(
 
         file_path = upload_dir / f"{doc_id}.{file_extension}"
 
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        upload = await analytics_executor.run(
+            stream_upload,
+            file.file,
+            file_path,
+            settings.max_upload_size,
+            settings.upload_memory_limit,
+            settings.upload_chunk_size,
+        )
 
         logger.info(f"File uploaded: {file.filename} -> {file_path}")
 
-        content = doc_processor.extract_text(str(file_path), file_extension)
-        content = doc_processor.clean_text(content)
-
         document = Document(
             id=doc_id,
             filename=file.filename,
             doc_type=DocumentType.PDF if file_extension == "pdf" else DocumentType.TXT,
-            content=content,
+            content="",
             status=ProcessingStatus.PENDING,
-            metadata={"file_path": str(file_path)},
+            metadata={
+                "file_path": str(file_path),
+                "file_size": upload.size,
+                "file_hash": upload.sha256,
+            },
         )
 
-        processed_doc = ingest_use_case.execute(document)
+        try:
+            extraction = await analytics_executor.run(
+                extract_use_case.execute,
+                str(file_path),
+                file_extension,
+                upload.sha256,
+                upload.data,
+            )
+        except ExtractionFailedError as e:
+            # keep a failed record instead of erroring so the upload is traceable
+            document.status = ProcessingStatus.FAILED
+            document.metadata.update({"error": str(e), "extraction_error": e.reason})
+            doc_repo.save(document)
+            return DocumentUploadResponse(
+                document_id=document.id,
+                filename=document.filename,
+                status=document.status,
+                message=f"Text extraction failed ({e.reason}): {str(e)}",
+            )
+
+        document.content = extraction["text"]
+        document.metadata.update(
+            {
+                "page_offsets": extraction["page_offsets"],
+                "extractor_version": extraction["extractor_version"],
+                "skipped_pages": extraction["skipped_pages"],
+            }
+        )
+
+        processed_doc = await analytics_executor.run(
+            ingest_use_case.execute, document
+        )
+
+        background_tasks.add_task(related_use_case.index_document, processed_doc.id)
+        scheduler.notify_change()
 
         return DocumentUploadResponse(
             document_id=processed_doc.id,
@@ -75,6 +141,18 @@ async def upload_document(
             message=f"Document uploaded and processed successfully. Created {processed_doc.metadata.get('chunks_count', 0)} chunks.",
         )
 
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+        )
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Error uploading document: {str(e)}")
         raise HTTPException(
@@ -83,6 +161,93 @@ async def upload_document(
         )
 
 
+@router.get("/page", response_model=DocumentPageResponse)
+async def page_documents(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_filter: Optional[ProcessingStatus] = Query(None, alias="status"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    doc_repo=Depends(get_document_repository),
+):
+    # input: page size, cursor, status and date filters; reads one keyset page; output: documents and next cursor
+    try:
+        documents, next_cursor = doc_repo.list_page(
+            limit=limit,
+            cursor=cursor,
+            status=status_filter,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return DocumentPageResponse(
+        documents=[
+            DocumentResponse(
+                id=doc.id,
+                filename=doc.filename,
+                doc_type=doc.doc_type,
+                created_at=doc.created_at,
+                status=doc.status,
+                metadata=doc.metadata,
+            )
+            for doc in documents
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/{document_id}/reprocess", response_model=DocumentResponse)
+async def reprocess_document(
+    document_id: str,
+    background_tasks: BackgroundTasks,
+    reprocess_use_case=Depends(get_reprocess_use_case),
+    related_use_case=Depends(get_related_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+    scheduler=Depends(get_analytics_scheduler),
+):
+    # input: document id; re-chunks and re-embeds using cached extracted text; output: document response
+    try:
+        document = await analytics_executor.run(
+            reprocess_use_case.execute, document_id
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExtractionFailedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Text extraction failed ({e.reason}): {str(e)}",
+        )
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        logger.error(f"Error reprocessing document {document_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reprocessing document: {str(e)}",
+        )
+
+    related_use_case.remove_document(document_id)
+    background_tasks.add_task(related_use_case.index_document, document_id)
+    scheduler.notify_change()
+
+    return DocumentResponse(
+        id=document.id,
+        filename=document.filename,
+        doc_type=document.doc_type,
+        created_at=document.created_at,
+        status=document.status,
+        metadata=document.metadata,
+    )
+
+
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(document_id: str, doc_repo=Depends(get_document_repository)):
     # input: document id; retrieves document; output: document response
@@ -129,6 +294,8 @@ async def delete_document(
     document_id: str,
     doc_repo=Depends(get_document_repository),
     vector_repo=Depends(get_vector_repository),
+    related_use_case=Depends(get_related_use_case),
+    scheduler=Depends(get_analytics_scheduler),
 ):
     # input: document id; deletes document and chunks; output: success message
     document = doc_repo.get_by_id(document_id)
@@ -140,8 +307,10 @@ async def delete_document(
         )
 
     vector_repo.delete_by_document(document_id)
+    related_use_case.remove_document(document_id)
 
     doc_repo.delete(document_id)
+    scheduler.notify_change()
 
     if "file_path" in document.metadata:
         file_path = Path(document.metadata["file_path"])
@@ -6,23 +6,46 @@ from src.api.models import (
     QualityTrainingResponse,
     QualityPredictionResponse,
     QualityAssessmentResponse,
+    MessageResponse,
 )
-from src.api.dependencies import get_quality_use_case, get_vector_repository
+from src.api.dependencies import (
+    get_quality_use_case,
+    get_vector_repository,
+    get_analytics_executor,
+)
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/quality", tags=["quality"])
 
 
+def _spawn_follow_up(analytics_executor, job):
+    # input: analytics pool, job; queues restamping after training; output: none
+    try:
+        analytics_executor.spawn(job)
+    except ExecutorSaturatedError:
+        # the model is already live; stale labels are reclassified on the next predict
+        logger.warning(f"Analytics pool full, skipped follow-up {job.__name__}")
+
+
 @router.post("/train", response_model=QualityTrainingResponse)
 async def train_quality_classifier(
     request: QualityTrainingRequest,
     quality_use_case=Depends(get_quality_use_case),
     vector_repo=Depends(get_vector_repository),
+    analytics_executor=Depends(get_analytics_executor),
 ):
     try:
         training_samples = []
-        
-        chunks = vector_repo.get_all_chunks()
+
+        labeled_ids = [
+            item.get("chunk_id")
+            for item in request.training_data
+            if item.get("chunk_id")
+        ]
+        chunks = await analytics_executor.run(
+            vector_repo.get_chunks_by_ids, labeled_ids
+        )
         chunks_dict = {c.id: c for c in chunks}
 
         for item in request.training_data:
@@ -53,7 +76,9 @@ async def train_quality_classifier(
             if hasattr(embedding, 'tolist'):
                 embedding = embedding.tolist()
 
-            training_samples.append({"embedding": embedding, "label": label})
+            training_samples.append(
+                {"chunk_id": chunk_id, "embedding": embedding, "label": label}
+            )
 
         if len(training_samples) < 2:
             raise HTTPException(
@@ -61,7 +86,27 @@ async def train_quality_classifier(
                 detail=f"Need at least 2 training samples, got {len(training_samples)}. Please provide more labeled data.",
             )
 
-        metrics = quality_use_case.train(training_samples)
+        if request.incremental:
+            metrics = await analytics_executor.run(
+                quality_use_case.learn, training_samples
+            )
+            # the update published a new version; restamp stored labels off the request path
+            if quality_use_case.retrain_due():
+                _spawn_follow_up(analytics_executor, quality_use_case.retrain_and_backfill)
+            else:
+                _spawn_follow_up(analytics_executor, quality_use_case.backfill)
+
+            logger.info(f"Quality classifier updated with {len(training_samples)} samples")
+
+            return QualityTrainingResponse(
+                message=f"Quality classifier updated incrementally with {len(training_samples)} samples",
+                metrics=metrics,
+            )
+
+        metrics = await analytics_executor.run(
+            quality_use_case.train, training_samples
+        )
+        _spawn_follow_up(analytics_executor, quality_use_case.backfill)
 
         logger.info(f"Quality classifier trained with {len(training_samples)} samples")
 
@@ -72,6 +117,14 @@ async def train_quality_classifier(
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Training error: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -80,14 +133,37 @@ async def train_quality_classifier(
         )
 
 
+@router.post(
+    "/retrain", response_model=MessageResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def retrain_quality_classifier(
+    quality_use_case=Depends(get_quality_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+):
+    # input: none; queues full retrain on all stored labels in the analytics pool; output: accepted message
+    try:
+        analytics_executor.spawn(quality_use_case.retrain_and_backfill)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    logger.info("Quality classifier retrain scheduled")
+    return MessageResponse(message="Quality classifier retrain scheduled")
+
+
 @router.post("/predict", response_model=QualityPredictionResponse)
 async def predict_quality(
     chunk_ids: Optional[List[str]] = None,
     quality_use_case=Depends(get_quality_use_case),
+    analytics_executor=Depends(get_analytics_executor),
 ):
-    # input: optional chunk ids; predicts quality; output: quality assessments
+    # input: optional chunk ids; reads stored quality labels; output: quality assessments
     try:
-        assessments = quality_use_case.predict(chunk_ids=chunk_ids)
+        assessments = await analytics_executor.run(
+            quality_use_case.predict, chunk_ids=chunk_ids
+        )
 
         assessment_responses = [
             QualityAssessmentResponse(
@@ -109,6 +185,12 @@ async def predict_quality(
 
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from src.api.models import ModelVersionResponse, ModelVersionsResponse, MessageResponse
+from src.api.dependencies import (
+    get_model_repository,
+    get_clustering_service,
+    get_anomaly_service,
+    get_quality_service,
+    get_knn_graph_service,
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/models", tags=["models"])
+
+MODEL_SERVICES = {
+    "kmeans_clustering": get_clustering_service,
+    "pca_reduction": get_clustering_service,
+    "isolation_forest_anomaly": get_anomaly_service,
+    "quality_classifier": get_quality_service,
+    "knn_graph": get_knn_graph_service,
+}
+
+
+@router.get("/{model_name}/versions", response_model=ModelVersionsResponse)
+async def list_model_versions(
+    model_name: str, model_repo=Depends(get_model_repository)
+):
+    # input: model name; reads registry manifest; output: version history
+    versions = model_repo.list_versions(model_name)
+
+    if not versions:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model {model_name} has no published versions",
+        )
+
+    return ModelVersionsResponse(
+        model_name=model_name,
+        versions=[
+            ModelVersionResponse(
+                version=v["version"],
+                created_at=v["created_at"],
+                size=v["size"],
+                mmap=v["mmap"],
+                current=v["current"],
+                checkpoint=v.get("checkpoint", False),
+                metrics=v["metrics"],
+            )
+            for v in versions
+        ],
+    )
+
+
+@router.post("/{model_name}/rollback/{version}", response_model=MessageResponse)
+async def rollback_model(
+    model_name: str, version: int, model_repo=Depends(get_model_repository)
+):
+    # input: model name, version; repoints registry and reloads live service; output: confirmation
+    try:
+        model_repo.rollback(model_name, version)
+
+        get_service = MODEL_SERVICES.get(model_name)
+        if get_service:
+            get_service().load_model(model_repo)
+
+        logger.info(f"Model {model_name} rolled back to version {version}")
+        return MessageResponse(
+            message=f"Model {model_name} rolled back to version {version}"
+        )
+
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Rollback error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Rollback failed: {str(e)}",
+        )
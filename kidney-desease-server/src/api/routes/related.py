@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+import logging
+from src.api.models import (
+    RelatedChunkResponse,
+    RelatedChunksResponse,
+    RelatedDocumentResponse,
+    RelatedDocumentsResponse,
+    MessageResponse,
+)
+from src.api.dependencies import (
+    get_related_use_case,
+    get_search_executor,
+    get_analytics_executor,
+)
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/related", tags=["related"])
+
+
+@router.post(
+    "/rebuild", response_model=MessageResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def rebuild_knn_graph(
+    related_use_case=Depends(get_related_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+):
+    # input: none; queues full graph rebuild in the analytics pool; output: accepted message
+    try:
+        analytics_executor.spawn(related_use_case.rebuild)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    logger.info("kNN graph rebuild scheduled")
+    return MessageResponse(message="kNN graph rebuild scheduled")
+
+
+@router.get("/chunks/{chunk_id}", response_model=RelatedChunksResponse)
+async def get_related_chunks(
+    chunk_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    related_use_case=Depends(get_related_use_case),
+    search_executor=Depends(get_search_executor),
+):
+    # input: chunk id, k; reads graph neighbours; output: related chunks
+    try:
+        related = await search_executor.run(
+            related_use_case.related_chunks, chunk_id, top_k=top_k
+        )
+
+        return RelatedChunksResponse(
+            chunk_id=chunk_id,
+            related=[RelatedChunkResponse(**item) for item in related],
+        )
+
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        logger.error(f"Related chunks error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Related chunks lookup failed: {str(e)}",
+        )
+
+
+@router.get("/documents/{document_id}", response_model=RelatedDocumentsResponse)
+async def get_related_documents(
+    document_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    related_use_case=Depends(get_related_use_case),
+    search_executor=Depends(get_search_executor),
+):
+    # input: document id, k; aggregates graph neighbours; output: related documents
+    try:
+        related = await search_executor.run(
+            related_use_case.related_documents, document_id, top_k=top_k
+        )
+
+        return RelatedDocumentsResponse(
+            document_id=document_id,
+            related=[RelatedDocumentResponse(**item) for item in related],
+        )
+
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        logger.error(f"Related documents error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Related documents lookup failed: {str(e)}",
+        )
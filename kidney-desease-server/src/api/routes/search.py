@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 import logging
-from src.api.models import SearchRequest, SearchResponse, SearchResultResponse
-from src.api.dependencies import get_search_use_case
+from src.api.models import (
+    SearchRequest,
+    SearchResponse,
+    SearchResultResponse,
+    SearchCacheStatsResponse,
+    SimilarChunksResponse,
+)
+from src.api.dependencies import get_search_use_case, get_search_executor
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/search", tags=["search"])
@@ -9,16 +16,31 @@ router = APIRouter(prefix="/search", tags=["search"])
 
 @router.post("/", response_model=SearchResponse)
 async def search_documents(
-    request: SearchRequest, search_use_case=Depends(get_search_use_case)
+    request: SearchRequest,
+    search_use_case=Depends(get_search_use_case),
+    search_executor=Depends(get_search_executor),
 ):
     # input: search request; performs semantic search; output: search results
     try:
-        filter_metadata = None
+        conditions = []
         if request.filter_document_id:
-            filter_metadata = {"document_id": request.filter_document_id}
+            conditions.append({"document_id": request.filter_document_id})
+        if request.filter_cluster_id is not None:
+            conditions.append({"cluster_id": request.filter_cluster_id})
+        if request.filter_quality_label is not None:
+            conditions.append({"quality_label": request.filter_quality_label.value})
+
+        filter_metadata = None
+        if len(conditions) == 1:
+            filter_metadata = conditions[0]
+        elif conditions:
+            filter_metadata = {"$and": conditions}
 
-        results = search_use_case.execute(
-            query=request.query, top_k=request.top_k, filters=filter_metadata
+        results = await search_executor.run(
+            search_use_case.execute,
+            query=request.query,
+            top_k=request.top_k,
+            filters=filter_metadata,
         )
 
         search_results = [
@@ -42,9 +64,77 @@ async def search_documents(
             total_results=len(search_results),
         )
 
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Search error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Search failed: {str(e)}",
         )
+
+
+@router.get("/cache/stats", response_model=SearchCacheStatsResponse)
+async def get_search_cache_stats(search_use_case=Depends(get_search_use_case)):
+    # input: none; reads query cache counters; output: cache statistics
+    return SearchCacheStatsResponse(**search_use_case.cache_stats())
+
+
+@router.get("/similar/{chunk_id}", response_model=SimilarChunksResponse)
+async def search_similar_chunks(
+    chunk_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    exclude_same_document: bool = False,
+    search_use_case=Depends(get_search_use_case),
+    search_executor=Depends(get_search_executor),
+):
+    # input: chunk id, k, doc exclusion flag; finds neighbours of stored chunk; output: search results
+    try:
+        results = await search_executor.run(
+            search_use_case.find_similar,
+            chunk_id=chunk_id,
+            top_k=top_k,
+            exclude_same_document=exclude_same_document,
+        )
+
+        search_results = [
+            SearchResultResponse(
+                chunk_id=result.chunk_id,
+                document_id=result.document_id,
+                content=result.content,
+                score=result.score,
+                metadata=result.metadata,
+            )
+            for result in results
+        ]
+
+        logger.info(
+            f"Similar search completed: chunk_id='{chunk_id}', results={len(search_results)}"
+        )
+
+        return SimilarChunksResponse(
+            chunk_id=chunk_id,
+            results=search_results,
+            total_results=len(search_results),
+        )
+
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        logger.error(f"Similar search error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Similar search failed: {str(e)}",
+        )
@@ -1,7 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 import logging
-from src.api.models import SystemStatusResponse
-from src.api.dependencies import get_status_use_case
+from src.api.models import (
+    SystemStatusResponse,
+    AnalyticsStatusResponse,
+    MessageResponse,
+)
+from src.api.dependencies import get_status_use_case, get_analytics_scheduler
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/status", tags=["status"])
@@ -9,7 +13,7 @@ router = APIRouter(prefix="/status", tags=["status"])
 
 @router.get("/", response_model=SystemStatusResponse)
 async def get_system_status(status_use_case=Depends(get_status_use_case)):
-    # input: none; retrieves system stats; output: system status
+    # input: none; reads maintained counters; output: system status
     try:
         status_data = status_use_case.execute()
 
@@ -26,3 +30,21 @@ async def get_system_status(status_use_case=Depends(get_status_use_case)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve system status: {str(e)}",
         )
+
+
+@router.get("/analytics", response_model=AnalyticsStatusResponse)
+async def get_analytics_status(scheduler=Depends(get_analytics_scheduler)):
+    # input: none; reads scheduler state; output: snapshot freshness and pending changes
+    return AnalyticsStatusResponse(**scheduler.status())
+
+
+@router.post(
+    "/analytics/refresh",
+    response_model=MessageResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def refresh_analytics(scheduler=Depends(get_analytics_scheduler)):
+    # input: none; wakes the scheduler for an immediate recompute; output: accepted message
+    scheduler.trigger()
+    logger.info("Analytics refresh requested")
+    return MessageResponse(message="Analytics refresh scheduled")
@@ -1,7 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from typing import Optional
 import logging
-from src.api.models import VisualizationResponse
-from src.api.dependencies import get_visualization_use_case
+from src.api.models import (
+    VisualizationResponse,
+    VisualizationTileResponse,
+    MessageResponse,
+)
+from src.api.dependencies import (
+    get_visualization_use_case,
+    get_analytics_executor,
+    get_analytics_flight,
+    get_analytics_scheduler,
+)
+from src.infrastructure.concurrency.bounded_executor import ExecutorSaturatedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/visualization", tags=["visualization"])
@@ -10,10 +21,32 @@ router = APIRouter(prefix="/visualization", tags=["visualization"])
 @router.get("/data", response_model=VisualizationResponse)
 async def get_visualization_data(
     visualization_use_case=Depends(get_visualization_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+    analytics_flight=Depends(get_analytics_flight),
+    scheduler=Depends(get_analytics_scheduler),
 ):
-    # input: none; prepares visualization data; output: 2D embeddings and metadata
+    # input: none; serves the fresh snapshot or prepares data on demand; output: 2D embeddings and metadata
     try:
-        viz_data = visualization_use_case.execute()
+        snapshot = scheduler.get("visualization")
+        if snapshot is not None and not snapshot["stale"]:
+            viz_data = snapshot["result"]
+            freshness = {
+                "computed_at": snapshot["computed_at"],
+                "generation": snapshot["generation"],
+            }
+        else:
+            viz_data = await analytics_flight.run(
+                "visualization_data",
+                analytics_executor.run,
+                visualization_use_case.execute,
+            )
+            freshness = {}
+
+        if viz_data["unprojected"]:
+            try:
+                analytics_executor.spawn(visualization_use_case.project_missing)
+            except ExecutorSaturatedError:
+                logger.warning("Analytics pool full, projection of missing chunks deferred")
 
         logger.info(
             f"Visualization data prepared: {len(viz_data['embeddings_2d'])} points"
@@ -25,13 +58,99 @@ async def get_visualization_data(
             texts=viz_data["texts"],
             chunk_ids=viz_data["chunk_ids"],
             document_ids=viz_data["document_ids"],
+            **freshness,
         )
 
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Visualization error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Visualization data generation failed: {str(e)}",
         )
+
+
+@router.get("/tiles", response_model=VisualizationTileResponse)
+async def get_visualization_tiles(
+    background_tasks: BackgroundTasks,
+    zoom: int = Query(0, ge=0, le=20),
+    x_min: Optional[float] = None,
+    x_max: Optional[float] = None,
+    y_min: Optional[float] = None,
+    y_max: Optional[float] = None,
+    max_points: int = Query(5000, ge=1, le=50000),
+    visualization_use_case=Depends(get_visualization_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+    analytics_flight=Depends(get_analytics_flight),
+    scheduler=Depends(get_analytics_scheduler),
+):
+    # input: zoom, viewport, point budget; reads the last spatial index; output: density bins or raw points
+    try:
+        tile = await analytics_executor.run(
+            visualization_use_case.get_tiles,
+            zoom=zoom,
+            x_min=x_min,
+            x_max=x_max,
+            y_min=y_min,
+            y_max=y_max,
+            max_points=max_points,
+        )
+
+        if tile["stale"] and scheduler.get("visualization") is None:
+            # without scheduled refreshes, rebuild once in the background and keep serving this index
+            background_tasks.add_task(
+                analytics_flight.run,
+                "visualization_index",
+                analytics_executor.run,
+                visualization_use_case.refresh_index,
+            )
+
+        logger.info(
+            f"Visualization tiles served: zoom={tile['zoom']}, mode={tile['mode']}, "
+            f"total={tile['total_in_viewport']}"
+        )
+
+        return VisualizationTileResponse(**tile)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except Exception as e:
+        logger.error(f"Visualization tiles error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Visualization tiles generation failed: {str(e)}",
+        )
+
+
+@router.post(
+    "/projection", response_model=MessageResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def refresh_projection(
+    refit: bool = False,
+    visualization_use_case=Depends(get_visualization_use_case),
+    analytics_executor=Depends(get_analytics_executor),
+):
+    # input: refit flag; queues projection refresh in the analytics pool; output: accepted message
+    try:
+        analytics_executor.spawn(visualization_use_case.refresh_projection, refit)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    logger.info(f"Projection refresh scheduled (refit={refit})")
+    return MessageResponse(message="Projection refresh scheduled")
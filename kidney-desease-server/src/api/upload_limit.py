@@ -0,0 +1,50 @@
+from typing import Iterable
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSizeLimitMiddleware:
+    # caps request bodies on upload routes before the multipart parser spools them
+
+    def __init__(self, app, max_body_size: int, paths: Iterable[str]):
+        # input: asgi app, byte cap including multipart framing, guarded paths; initializes; output: none
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        # input: asgi scope, receive, send; rejects or meters guarded requests; output: none
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Upload exceeds the {self.max_body_size} byte limit"
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_body_size:
+            logger.warning(f"Rejected upload declaring {int(declared)} bytes")
+            response = JSONResponse(
+                {"detail": detail}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            # stops reading the socket once the cap is passed, covering chunked bodies
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # HTTPException passes through the body parser unchanged and becomes the 413
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=detail,
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
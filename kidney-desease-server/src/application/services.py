@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Any, Dict
-from src.domain.entities import Chunk, ClusterInfo, QualityLabel
+from typing import List, Tuple, Optional, Any, Dict, Iterable
+from src.domain.entities import Chunk, ClusterInfo, QualityLabel, SearchResult
 from src.domain.repositories import IModelRepository
 
 
@@ -37,6 +37,49 @@ class IClusteringService(ABC):
         # input: embeddings, texts, k; clusters data; output: labels and cluster info
         pass
 
+    @abstractmethod
+    def select_k(
+        self,
+        embeddings: List[List[float]],
+        k_min: int,
+        k_max: int,
+        strata: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        # input: embeddings, k range, sampling strata; sweeps k; output: chosen k and score curve
+        pass
+
+    @abstractmethod
+    def predict(
+        self, embeddings: List[List[float]], texts: List[str]
+    ) -> Tuple[List[int], List[ClusterInfo]]:
+        # input: embeddings, texts; assigns with fitted model; output: labels and cluster info
+        pass
+
+    @abstractmethod
+    def partial_fit(self, embeddings: List[List[float]]) -> List[int]:
+        # input: new embeddings; assigns and folds into online model; output: labels
+        pass
+
+    @abstractmethod
+    def is_fitted(self) -> bool:
+        # input: none; checks model state; output: fitted boolean
+        pass
+
+    @abstractmethod
+    def get_n_clusters(self) -> Optional[int]:
+        # input: none; reads the fitted model's k; output: cluster count or None
+        pass
+
+    @abstractmethod
+    def drift_ratio(self) -> float:
+        # input: none; compares online error to fit-time error; output: drift ratio
+        pass
+
+    @abstractmethod
+    def needs_refit(self, n_clusters: int) -> bool:
+        # input: requested k; checks model usability; output: refit boolean
+        pass
+
     @abstractmethod
     def reduce_dimensions(
         self, embeddings: List[List[float]], n_components: int = 2
@@ -45,8 +88,25 @@ class IClusteringService(ABC):
         pass
 
     @abstractmethod
-    def save_model(self, model_repo: IModelRepository) -> bool:
-        # input: model repo; persists model; output: success status
+    def fit_projection(
+        self, embedding_batches: Iterable[List[List[float]]], n_components: int = 2
+    ) -> int:
+        # input: streamed embedding pages, n_dims; fits projection; output: samples seen
+        pass
+
+    @abstractmethod
+    def project(self, embeddings: List[List[float]]) -> List[List[float]]:
+        # input: embeddings; applies saved projection; output: reduced embeddings
+        pass
+
+    @abstractmethod
+    def has_projection(self) -> bool:
+        # input: none; checks projection state; output: fitted boolean
+        pass
+
+    @abstractmethod
+    def save_model(self, model_repo: IModelRepository, checkpoint: bool = False) -> bool:
+        # input: model repo, checkpoint flag for incremental updates; persists model; output: success status
         pass
 
     @abstractmethod
@@ -65,6 +125,30 @@ class IAnomalyDetectionService(ABC):
         # input: embeddings, contamination; detects anomalies; output: labels and scores
         pass
 
+    @abstractmethod
+    def fit_stream(
+        self,
+        embedding_batches: Iterable[List[List[float]]],
+        contamination: float = 0.1,
+    ) -> int:
+        # input: streamed embedding pages, contamination; fits on a sample; output: corpus size seen
+        pass
+
+    @abstractmethod
+    def score(self, embeddings: List[List[float]]) -> Tuple[List[int], List[float]]:
+        # input: embeddings; scores with fitted model; output: labels and scores
+        pass
+
+    @abstractmethod
+    def is_fitted(self) -> bool:
+        # input: none; checks model state; output: fitted boolean
+        pass
+
+    @abstractmethod
+    def get_contamination(self) -> Optional[float]:
+        # input: none; reads the fitted model's contamination; output: rate or None when unfitted
+        pass
+
     @abstractmethod
     def save_model(self, model_repo: IModelRepository) -> bool:
         # input: model repo; persists model; output: success status
@@ -86,6 +170,13 @@ class IQualityClassificationService(ABC):
         # input: embeddings, labels; trains classifier; output: performance metrics
         pass
 
+    @abstractmethod
+    def partial_fit(
+        self, embeddings: List[List[float]], labels: List[str]
+    ) -> Dict[str, float]:
+        # input: embeddings, labels; folds a label batch into the live model under a new version; output: batch metrics
+        pass
+
     @abstractmethod
     def predict(
         self, embeddings: List[List[float]]
@@ -99,11 +190,195 @@ class IQualityClassificationService(ABC):
         pass
 
     @abstractmethod
-    def save_model(self, model_repo: IModelRepository) -> bool:
-        # input: model repo; persists model; output: success status
+    def get_version(self) -> Optional[str]:
+        # input: none; reads current model version; output: version string or None
+        pass
+
+    @abstractmethod
+    def save_model(self, model_repo: IModelRepository, checkpoint: bool = False) -> bool:
+        # input: model repo, checkpoint flag for online updates; persists model; output: success status
         pass
 
     @abstractmethod
     def load_model(self, model_repo: IModelRepository) -> bool:
         # input: model repo; loads model; output: success status
         pass
+
+
+class IKnnGraphService(ABC):
+    # interface for precomputed nearest-neighbour graph
+
+    @abstractmethod
+    def build(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        embeddings: List[List[float]],
+    ) -> int:
+        # input: ids, doc ids, embeddings; builds graph; output: node count
+        pass
+
+    @abstractmethod
+    def add(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        embeddings: List[List[float]],
+    ) -> int:
+        # input: new ids, doc ids, embeddings; folds nodes into graph; output: added count
+        pass
+
+    @abstractmethod
+    def remove_document(self, document_id: str) -> int:
+        # input: document id; drops its nodes from lookups; output: removed count
+        pass
+
+    @abstractmethod
+    def related_chunks(self, chunk_id: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        # input: chunk id, k; reads neighbours; output: (chunk id, similarity) pairs
+        pass
+
+    @abstractmethod
+    def related_documents(
+        self, document_id: str, top_k: int = 10
+    ) -> List[Tuple[str, float]]:
+        # input: document id, k; aggregates neighbours; output: (doc id, score) pairs
+        pass
+
+    @abstractmethod
+    def is_built(self) -> bool:
+        # input: none; checks graph state; output: built boolean
+        pass
+
+    @abstractmethod
+    def unsaved_changes(self) -> int:
+        # input: none; counts nodes added or removed since the last save or load; output: change count
+        pass
+
+    @abstractmethod
+    def save_model(self, model_repo: IModelRepository, checkpoint: bool = False) -> bool:
+        # input: model repo, checkpoint flag for incremental updates; persists graph; output: success status
+        pass
+
+    @abstractmethod
+    def load_model(self, model_repo: IModelRepository) -> bool:
+        # input: model repo; loads graph; output: success status
+        pass
+
+
+class ISemanticQueryCache(ABC):
+    # interface for embedding-keyed search result caching
+
+    @abstractmethod
+    def lookup(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        generation: int,
+    ) -> Optional[List[SearchResult]]:
+        # input: query vector, k, filters, index generation; finds cached results; output: results or None
+        pass
+
+    @abstractmethod
+    def store(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        generation: int,
+        results: List[SearchResult],
+        search_seconds: float,
+    ):
+        # input: query vector, k, filters, generation, results, latency; caches entry; output: none
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        # input: none; summarizes cache effectiveness; output: stats dictionary
+        pass
+
+
+class ISpatialIndexService(ABC):
+    # interface for level-of-detail spatial indexing of 2d points
+
+    @abstractmethod
+    def build(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        texts: List[str],
+        coordinates: List[List[float]],
+        labels: List[int],
+        generation: int,
+    ) -> int:
+        # input: point attributes, index generation; builds grid index; output: point count
+        pass
+
+    @abstractmethod
+    def query(
+        self,
+        x_min: Optional[float],
+        x_max: Optional[float],
+        y_min: Optional[float],
+        y_max: Optional[float],
+        zoom: int,
+        max_points: int,
+    ) -> Dict[str, Any]:
+        # input: viewport, zoom, raw point budget; reads overlapping cells; output: bins or points
+        pass
+
+
+class ExtractionFailedError(RuntimeError):
+    # raised when a file's text could not be extracted; reason is timeout, memory, crash or error
+
+    def __init__(self, reason: str, message: str):
+        # input: failure category, description; initializes; output: none
+        super().__init__(message)
+        self.reason = reason
+
+
+class IDocumentProcessor(ABC):
+    # interface for raw file text extraction and cleaning
+
+    @abstractmethod
+    def extract_pages(
+        self, file_path: str, file_type: str, data: Optional[bytes] = None
+    ) -> Tuple[List[str], List[int]]:
+        # input: file path, type, optional in-memory bytes; extracts raw text per page; output: page texts and skipped page indexes
+        pass
+
+    @abstractmethod
+    def clean_pages(self, pages: List[str]) -> Tuple[str, List[int]]:
+        # input: raw page texts; cleans and joins them; output: text and page start offsets
+        pass
+
+    @abstractmethod
+    def get_extractor_version(self, file_type: str) -> str:
+        # input: file type; names the extraction logic in use; output: version string
+        pass
+
+
+class IExtractedTextCache(ABC):
+    # interface for extracted text keyed by raw file hash and extractor version
+
+    @abstractmethod
+    def get(self, file_hash: str, extractor_version: str) -> Optional[Dict[str, Any]]:
+        # input: raw file hash, extractor version; reads cached extraction; output: entry or None
+        pass
+
+    @abstractmethod
+    def put(
+        self,
+        file_hash: str,
+        extractor_version: str,
+        text: str,
+        page_offsets: List[int],
+    ):
+        # input: raw file hash, extractor version, cleaned text, page offsets; stores extraction; output: none
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        # input: none; summarizes cache effectiveness; output: stats dictionary
+        pass
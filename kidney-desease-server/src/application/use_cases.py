@@ -1,18 +1,35 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple, Callable
+import base64
+import hashlib
+import heapq
 import logging
+import os
+import threading
+import time
 from src.domain.entities import (
     Document, Chunk, SearchResult, ProcessingStatus, 
-    ClusterInfo, AnomalyResult, QualityAssessment
+    ClusterInfo, AnomalyResult, QualityAssessment, QualityLabel
 )
 from src.domain.repositories import IDocumentRepository, IVectorRepository, IModelRepository
 from src.application.services import (
     IEmbeddingService, IChunkingService, IClusteringService,
-    IAnomalyDetectionService, IQualityClassificationService
+    IAnomalyDetectionService, IQualityClassificationService, IKnnGraphService,
+    ISemanticQueryCache, ISpatialIndexService, IDocumentProcessor,
+    IExtractedTextCache, ExtractionFailedError
 )
 
 logger = logging.getLogger(__name__)
 
 
+def quality_metadata(label: QualityLabel, confidence: float, version: str) -> Dict[str, Any]:
+    # input: predicted label, confidence, model version; builds chunk metadata fields; output: metadata dictionary
+    return {
+        'quality_label': label.value,
+        'quality_confidence': float(confidence),
+        'quality_model_version': version
+    }
+
+
 class IngestDocumentUseCase:
     # orchestrates document ingestion pipeline
     
@@ -21,12 +38,20 @@ class IngestDocumentUseCase:
         doc_repo: IDocumentRepository,
         vector_repo: IVectorRepository,
         chunking_service: IChunkingService,
-        embedding_service: IEmbeddingService
+        embedding_service: IEmbeddingService,
+        clustering_service: Optional[IClusteringService] = None,
+        model_repo: Optional[IModelRepository] = None,
+        anomaly_service: Optional[IAnomalyDetectionService] = None,
+        quality_service: Optional[IQualityClassificationService] = None
     ):
         self.doc_repo = doc_repo
         self.vector_repo = vector_repo
         self.chunking_service = chunking_service
         self.embedding_service = embedding_service
+        self.clustering_service = clustering_service
+        self.model_repo = model_repo
+        self.anomaly_service = anomaly_service
+        self.quality_service = quality_service
     
     def execute(self, document: Document) -> Document:
         # input: document entity; processes and stores; output: processed document
@@ -39,11 +64,16 @@ class IngestDocumentUseCase:
             for chunk in chunks:
                 chunk.embedding = self.embedding_service.embed_text(chunk.content)
             
+            self._assign_clusters(chunks)
+            self._project_chunks(chunks)
+            self._score_anomalies(chunks)
+            self._classify_quality(chunks)
+            
             self.vector_repo.add_chunks(chunks)
             
             document.status = ProcessingStatus.COMPLETED
             document.metadata['chunks_count'] = len(chunks)
-            document = self.doc_repo.save(document)
+            self.doc_repo.update_status(document.id, document.status, document.metadata)
             
             logger.info(f"Document {document.id} ingested successfully")
             return document
@@ -52,8 +82,204 @@ class IngestDocumentUseCase:
             logger.error(f"Error ingesting document {document.id}: {str(e)}")
             document.status = ProcessingStatus.FAILED
             document.metadata['error'] = str(e)
-            self.doc_repo.save(document)
+            # the first save may be what failed, in which case nothing exists to update
+            if not self.doc_repo.update_status(document.id, document.status, document.metadata):
+                self.doc_repo.save(document)
+            raise
+    
+    def _assign_clusters(self, chunks: List[Chunk]):
+        # input: embedded chunks; labels them with the persisted online model; output: none
+        if not chunks or not self.clustering_service or not self.model_repo:
+            return
+        
+        try:
+            if not self.clustering_service.is_fitted():
+                self.clustering_service.load_model(self.model_repo)
+            if not self.clustering_service.is_fitted():
+                return
+            
+            labels = self.clustering_service.partial_fit([c.embedding for c in chunks])
+            for chunk, label in zip(chunks, labels):
+                chunk.metadata['cluster_id'] = int(label)
+            
+            # per-upload updates replace one checkpoint instead of evicting fitted versions
+            self.clustering_service.save_model(self.model_repo, checkpoint=True)
+        
+        except Exception as e:
+            logger.warning(f"Cluster assignment on ingest skipped: {str(e)}")
+    
+    def _project_chunks(self, chunks: List[Chunk]):
+        # input: embedded chunks; stores 2d coordinates from the saved projection; output: none
+        if not chunks or not self.clustering_service or not self.model_repo:
+            return
+        
+        try:
+            if not self.clustering_service.has_projection():
+                self.clustering_service.load_model(self.model_repo)
+            if not self.clustering_service.has_projection():
+                return
+            
+            points = self.clustering_service.project([c.embedding for c in chunks])
+            for chunk, point in zip(chunks, points):
+                chunk.metadata['x_2d'] = float(point[0])
+                chunk.metadata['y_2d'] = float(point[1])
+        
+        except Exception as e:
+            logger.warning(f"Projection on ingest skipped: {str(e)}")
+    
+    def _score_anomalies(self, chunks: List[Chunk]):
+        # input: embedded chunks; stores scores from the persisted anomaly model; output: none
+        if not chunks or not self.anomaly_service or not self.model_repo:
+            return
+        
+        try:
+            if not self.anomaly_service.is_fitted():
+                self.anomaly_service.load_model(self.model_repo)
+            if not self.anomaly_service.is_fitted():
+                return
+            
+            labels, scores = self.anomaly_service.score([c.embedding for c in chunks])
+            for chunk, label, score in zip(chunks, labels, scores):
+                chunk.metadata['anomaly_score'] = float(score)
+                chunk.metadata['is_anomaly'] = bool(label == -1)
+        
+        except Exception as e:
+            logger.warning(f"Anomaly scoring on ingest skipped: {str(e)}")
+    
+    def _classify_quality(self, chunks: List[Chunk]):
+        # input: embedded chunks; stores labels from the persisted quality model; output: none
+        if not chunks or not self.quality_service or not self.model_repo:
+            return
+        
+        try:
+            if not self.quality_service.is_trained():
+                self.quality_service.load_model(self.model_repo)
+            if not self.quality_service.is_trained():
+                return
+            
+            version = self.quality_service.get_version()
+            labels, confidences = self.quality_service.predict([c.embedding for c in chunks])
+            for chunk, label, confidence in zip(chunks, labels, confidences):
+                chunk.metadata.update(quality_metadata(label, confidence, version))
+        
+        except Exception as e:
+            logger.warning(f"Quality classification on ingest skipped: {str(e)}")
+
+
+class ExtractDocumentTextUseCase:
+    # extracts cleaned text from a raw file, reusing cached output for identical bytes
+    
+    def __init__(
+        self,
+        doc_processor: IDocumentProcessor,
+        text_cache: IExtractedTextCache
+    ):
+        self.doc_processor = doc_processor
+        self.text_cache = text_cache
+    
+    def execute(
+        self,
+        file_path: str,
+        file_type: str,
+        file_hash: Optional[str] = None,
+        data: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        # input: file path, type, optional raw hash and in-memory bytes; extracts or reads cache; output: text, page offsets and cache details
+        if file_hash is None:
+            file_hash = self._hash(file_path, data)
+        version = self.doc_processor.get_extractor_version(file_type)
+        
+        cached = self.text_cache.get(file_hash, version)
+        if cached is not None:
+            logger.info(f"Reused extracted text for {file_path} ({file_hash[:12]})")
+            return {
+                'text': cached['text'],
+                'page_offsets': cached['page_offsets'],
+                'file_hash': file_hash,
+                'extractor_version': version,
+                'skipped_pages': [],
+                'cached': True
+            }
+        
+        pages, skipped_pages = self.doc_processor.extract_pages(file_path, file_type, data)
+        text, page_offsets = self.doc_processor.clean_pages(pages)
+        
+        # partial extractions are not cached so a later run with a larger budget can fill them in
+        if not skipped_pages:
+            try:
+                self.text_cache.put(file_hash, version, text, page_offsets)
+            except Exception as e:
+                logger.warning(f"Could not cache extracted text for {file_path}: {str(e)}")
+        
+        return {
+            'text': text,
+            'page_offsets': page_offsets,
+            'file_hash': file_hash,
+            'extractor_version': version,
+            'skipped_pages': skipped_pages,
+            'cached': False
+        }
+    
+    def _hash(self, file_path: str, data: Optional[bytes]) -> str:
+        # input: file path, optional in-memory bytes; hashes raw content in blocks; output: sha256 hex digest
+        digest = hashlib.sha256()
+        if data is not None:
+            digest.update(data)
+            return digest.hexdigest()
+        
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+
+class ReprocessDocumentUseCase:
+    # re-chunks and re-embeds a stored document from its original file
+    
+    def __init__(
+        self,
+        doc_repo: IDocumentRepository,
+        vector_repo: IVectorRepository,
+        extract_use_case: ExtractDocumentTextUseCase,
+        ingest_use_case: IngestDocumentUseCase
+    ):
+        self.doc_repo = doc_repo
+        self.vector_repo = vector_repo
+        self.extract_use_case = extract_use_case
+        self.ingest_use_case = ingest_use_case
+    
+    def execute(self, doc_id: str) -> Document:
+        # input: document id; re-extracts through the cache and re-ingests; output: processed document
+        document = self.doc_repo.get_by_id(doc_id)
+        if document is None:
+            raise LookupError(f"Document {doc_id} not found")
+        
+        file_path = document.metadata.get('file_path')
+        if not file_path or not os.path.exists(file_path):
+            raise ValueError(f"Document {doc_id} has no stored source file")
+        
+        try:
+            extraction = self.extract_use_case.execute(
+                file_path, document.doc_type.value, document.metadata.get('file_hash')
+            )
+        except ExtractionFailedError as e:
+            # the previous chunks stay indexed, so only the failure is recorded
+            document.metadata.update({'error': str(e), 'extraction_error': e.reason})
+            self.doc_repo.update_status(doc_id, document.status, document.metadata)
             raise
+        
+        self.vector_repo.delete_by_document(doc_id)
+        
+        document.content = extraction['text']
+        document.metadata.pop('error', None)
+        document.metadata.pop('extraction_error', None)
+        document.metadata.update({
+            'file_hash': extraction['file_hash'],
+            'page_offsets': extraction['page_offsets'],
+            'extractor_version': extraction['extractor_version'],
+            'skipped_pages': extraction['skipped_pages']
+        })
+        return self.ingest_use_case.execute(document)
 
 
 class SearchDocumentsUseCase:
@@ -62,10 +288,12 @@ class SearchDocumentsUseCase:
     def __init__(
         self,
         vector_repo: IVectorRepository,
-        embedding_service: IEmbeddingService
+        embedding_service: IEmbeddingService,
+        query_cache: Optional[ISemanticQueryCache] = None
     ):
         self.vector_repo = vector_repo
         self.embedding_service = embedding_service
+        self.query_cache = query_cache
     
     def execute(
         self,
@@ -75,14 +303,65 @@ class SearchDocumentsUseCase:
     ) -> List[SearchResult]:
         # input: query text, k, filters; searches; output: ranked results
         query_embedding = self.embedding_service.embed_text(query)
+        generation = self.vector_repo.get_generation()
+        
+        if self.query_cache:
+            cached = self.query_cache.lookup(query_embedding, top_k, filters, generation)
+            if cached is not None:
+                logger.info(f"Search served from query cache with {len(cached)} results")
+                return cached
+        
+        start = time.perf_counter()
         results = self.vector_repo.search(query_embedding, top_k, filters)
+        
+        if self.query_cache:
+            self.query_cache.store(
+                query_embedding, top_k, filters, generation,
+                results, time.perf_counter() - start
+            )
+        
         logger.info(f"Search completed with {len(results)} results")
         return results
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        # input: none; reads query cache counters; output: stats dictionary
+        if not self.query_cache:
+            return {}
+        return self.query_cache.stats()
+    
+    def find_similar(
+        self,
+        chunk_id: str,
+        top_k: int = 10,
+        exclude_same_document: bool = False
+    ) -> List[SearchResult]:
+        # input: source chunk id, k, doc exclusion flag; queries with stored vector; output: ranked neighbours
+        source = self.vector_repo.get_chunk_by_id(chunk_id)
+        
+        if source is None:
+            raise LookupError(f"Chunk {chunk_id} not found")
+        
+        if source.embedding is None or len(source.embedding) == 0:
+            raise ValueError(f"Chunk {chunk_id} has no stored embedding")
+        
+        filters = None
+        if exclude_same_document:
+            filters = {"document_id": {"$ne": source.document_id}}
+        
+        # one extra slot because the source chunk is its own nearest neighbour
+        results = self.vector_repo.search(list(source.embedding), top_k + 1, filters)
+        results = [r for r in results if r.chunk_id != chunk_id][:top_k]
+        
+        logger.info(f"Similar search for chunk {chunk_id} returned {len(results)} results")
+        return results
 
 
 class ClusterDocumentsUseCase:
     # performs clustering on document embeddings
     
+    # shared by api runs and scheduled refreshes so the live model and stored labels come from one fit
+    _fit_lock = threading.Lock()
+    
     def __init__(
         self,
         vector_repo: IVectorRepository,
@@ -92,9 +371,29 @@ class ClusterDocumentsUseCase:
         self.vector_repo = vector_repo
         self.clustering_service = clustering_service
         self.model_repo = model_repo
+        self.last_run: Dict[str, Any] = {}
+    
+    def execute(
+        self,
+        n_clusters: int = 5,
+        refit: bool = False,
+        auto_k: bool = False,
+        k_min: int = 2,
+        k_max: int = 10
+    ) -> List[ClusterInfo]:
+        # input: number of clusters, refit flag, auto k range; clusters embeddings one run at a time; output: cluster metadata
+        with self._fit_lock:
+            return self._cluster(n_clusters, refit, auto_k, k_min, k_max)
     
-    def execute(self, n_clusters: int = 5) -> List[ClusterInfo]:
-        # input: number of clusters; clusters embeddings; output: cluster metadata
+    def _cluster(
+        self,
+        n_clusters: int,
+        refit: bool,
+        auto_k: bool,
+        k_min: int,
+        k_max: int
+    ) -> List[ClusterInfo]:
+        # input: number of clusters, refit flag, auto k range; fits or assigns and stores labels; output: cluster metadata
         chunks = self.vector_repo.get_all_chunks()
         
         if not chunks:
@@ -103,151 +402,764 @@ class ClusterDocumentsUseCase:
         embeddings = [chunk.embedding for chunk in chunks]
         texts = [chunk.content for chunk in chunks]
         
-        cluster_labels, cluster_info = self.clustering_service.fit_predict(
-            embeddings, texts, n_clusters
-        )
+        selection: Dict[str, Any] = {}
+        if auto_k:
+            selection = self.clustering_service.select_k(
+                embeddings, k_min, k_max, strata=[chunk.document_id for chunk in chunks]
+            )
+            n_clusters = selection['n_clusters']
+        
+        if not self.clustering_service.is_fitted():
+            self.clustering_service.load_model(self.model_repo)
+        
+        refit = refit or self.clustering_service.needs_refit(n_clusters)
+        drift_ratio = self.clustering_service.drift_ratio()
+        
+        if refit:
+            cluster_labels, cluster_info = self.clustering_service.fit_predict(
+                embeddings, texts, n_clusters
+            )
+        else:
+            cluster_labels, cluster_info = self.clustering_service.predict(
+                embeddings, texts
+            )
         
+        self.last_run = {
+            'refitted': refit,
+            'drift_ratio': drift_ratio,
+            'n_clusters': n_clusters,
+            'elbow_k': selection.get('elbow_k'),
+            'k_scores': selection.get('scores', [])
+        }
+        
+        changed_ids = []
+        changed_metadata = []
         for i, chunk in enumerate(chunks):
-            chunk.metadata['cluster_id'] = int(cluster_labels[i])
+            label = int(cluster_labels[i])
+            if chunk.metadata.get('cluster_id') != label:
+                changed_ids.append(chunk.id)
+                changed_metadata.append({'cluster_id': label})
+            chunk.metadata['cluster_id'] = label
+        
+        self.vector_repo.update_metadata(changed_ids, changed_metadata)
         
         self.clustering_service.save_model(self.model_repo)
         
-        logger.info(f"Clustering completed with {n_clusters} clusters")
+        logger.info(f"Clustering completed with {n_clusters} clusters (refitted={refit})")
         return cluster_info
+    
+    def current_n_clusters(self) -> Optional[int]:
+        # input: none; loads the persisted model if needed; output: its k or None when unfitted
+        if not self.clustering_service.is_fitted():
+            self.clustering_service.load_model(self.model_repo)
+        return self.clustering_service.get_n_clusters()
 
 
 class DetectAnomaliesUseCase:
     # detects anomalous documents in corpus
     
+    # shared by api runs and scheduled refreshes so the live model and stored flags come from one fit
+    _fit_lock = threading.Lock()
+    # chunk set the stored scores describe; metadata writes by other jobs do not change it
+    _scored_generation: Optional[int] = None
+    
+    # (corpus generation, anomaly count); generations restart with the process, so this stays in memory
+    _stored_count: Optional[Tuple[int, int]] = None
+    
     def __init__(
         self,
         vector_repo: IVectorRepository,
         anomaly_service: IAnomalyDetectionService,
-        model_repo: IModelRepository
+        model_repo: IModelRepository,
+        page_size: int = 1000
     ):
         self.vector_repo = vector_repo
         self.anomaly_service = anomaly_service
         self.model_repo = model_repo
+        self.page_size = page_size
     
-    def execute(self, contamination: float = 0.1) -> List[AnomalyResult]:
-        # input: contamination rate; detects anomalies; output: anomaly results
-        chunks = self.vector_repo.get_all_chunks()
+    def execute(self, contamination: float = 0.1, limit: int = 100) -> Dict[str, Any]:
+        # input: contamination rate, page size; refits and rescores corpus one run at a time; output: first ranked page with totals
+        with self._fit_lock:
+            return self._detect(contamination, limit)
+    
+    def refresh(self, contamination: float, limit: int = 100) -> Dict[str, Any]:
+        # input: fallback contamination, page size; refits only when the corpus changed, keeping the live rate; output: first ranked page with totals
+        with self._fit_lock:
+            if not self.anomaly_service.is_fitted():
+                self.anomaly_service.load_model(self.model_repo)
+            
+            live = self.anomaly_service.get_contamination()
+            if live is not None and self._scored_generation == self.vector_repo.get_content_generation():
+                return self.get_stored(only_anomalies=False, limit=limit)
+            
+            # a rate chosen through the api must survive scheduled refreshes
+            return self._detect(live if live is not None else contamination, limit)
+    
+    def _detect(self, contamination: float, limit: int) -> Dict[str, Any]:
+        # input: contamination rate, page size; refits and rescores corpus; output: first ranked page with totals
+        # read first: chunks added while scoring leave the stored scores incomplete
+        content_generation = self.vector_repo.get_content_generation()
+        self.anomaly_service.fit_stream(
+            (
+                [chunk.embedding for chunk in page if chunk.embedding is not None]
+                for page in self.vector_repo.iter_chunks(self.page_size)
+            ),
+            contamination
+        )
+        self.anomaly_service.save_model(self.model_repo)
         
-        if not chunks:
-            raise ValueError("No chunks available for anomaly detection")
+        counts = {'total_chunks': 0, 'total_anomalies': 0}
         
-        embeddings = [chunk.embedding for chunk in chunks]
+        def scored_entries():
+            for page in self.vector_repo.iter_chunks(self.page_size):
+                page = [chunk for chunk in page if chunk.embedding is not None]
+                anomalies, scores = self.anomaly_service.score(
+                    [chunk.embedding for chunk in page]
+                )
+                
+                self.vector_repo.update_metadata(
+                    [chunk.id for chunk in page],
+                    [
+                        {'anomaly_score': float(score), 'is_anomaly': bool(label == -1)}
+                        for label, score in zip(anomalies, scores)
+                    ]
+                )
+                
+                for chunk, label, score in zip(page, anomalies, scores):
+                    counts['total_chunks'] += 1
+                    counts['total_anomalies'] += int(label == -1)
+                    yield float(score), chunk.id, bool(label == -1), chunk.content
         
-        # Check if embeddings are valid
-        if not embeddings or embeddings[0] is None:
-            raise ValueError("Chunks do not have embeddings. Please ensure documents are processed correctly.")
+        page_results, next_cursor = self._rank(scored_entries(), limit, None, 'all')
+        self._store_total(counts['total_anomalies'])
+        DetectAnomaliesUseCase._scored_generation = content_generation
         
-        anomalies, scores = self.anomaly_service.fit_predict(
-            embeddings, contamination
+        logger.info(f"Anomaly detection completed: {counts['total_anomalies']} anomalies found")
+        return {'results': page_results, 'next_cursor': next_cursor, **counts}
+    
+    def get_stored(
+        self,
+        only_anomalies: bool = True,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        # input: anomaly-only flag, page size, cursor; ranks stored scores; output: ranked page with totals
+        filters = {'is_anomaly': True} if only_anomalies else None
+        scope = 'anomalies' if only_anomalies else 'all'
+        
+        def stored_entries():
+            for page in self.vector_repo.iter_chunks(
+                self.page_size, include_embeddings=False, filter_metadata=filters
+            ):
+                for chunk in page:
+                    if 'anomaly_score' not in chunk.metadata:
+                        continue
+                    yield (
+                        float(chunk.metadata['anomaly_score']),
+                        chunk.id,
+                        bool(chunk.metadata.get('is_anomaly', False)),
+                        chunk.content
+                    )
+        
+        page_results, next_cursor = self._rank(stored_entries(), limit, cursor, scope)
+        
+        return {
+            'results': page_results,
+            'next_cursor': next_cursor,
+            'total_chunks': self.vector_repo.count_chunks(),
+            'total_anomalies': self._stored_total()
+        }
+    
+    def _store_total(self, total_anomalies: int):
+        # input: anomaly count; records it against the corpus generation it describes; output: none
+        DetectAnomaliesUseCase._stored_count = (self.vector_repo.get_generation(), total_anomalies)
+    
+    def _stored_total(self) -> int:
+        # input: none; reads the recorded anomaly count, recounting only after corpus changes; output: anomaly count
+        stored = DetectAnomaliesUseCase._stored_count
+        if stored is not None and stored[0] == self.vector_repo.get_generation():
+            return stored[1]
+        
+        # ingest scoring and deletions change the count; one scan serves every page until the next write
+        total_anomalies = self.vector_repo.count_chunks({'is_anomaly': True})
+        self._store_total(total_anomalies)
+        return total_anomalies
+    
+    def _rank(
+        self,
+        entries: Iterable[Tuple[float, str, bool, str]],
+        limit: int,
+        cursor: Optional[str],
+        scope: str
+    ) -> Tuple[List[AnomalyResult], Optional[str]]:
+        # input: (score, id, flag, text) stream, page size, cursor, ranked set; keeps a bounded heap; output: page and next cursor
+        after = self._decode_cursor(cursor, scope) if cursor else None
+        
+        candidates = (
+            entry for entry in entries
+            if after is None or (entry[0], entry[1]) > after
         )
+        # limit + 1 tells whether another page exists; previews are cut only for survivors
+        ranked = heapq.nsmallest(limit + 1, candidates, key=lambda e: (e[0], e[1]))
         
-        results = []
-        for i, chunk in enumerate(chunks):
-            result = AnomalyResult(
-                chunk_id=chunk.id,
-                is_anomaly=bool(anomalies[i] == -1),
-                anomaly_score=float(scores[i]),
-                metadata={"content_preview": chunk.content[:100]}
+        page = [
+            AnomalyResult(
+                chunk_id=chunk_id,
+                is_anomaly=is_anomaly,
+                anomaly_score=score,
+                metadata={"content_preview": content[:100]}
             )
-            results.append(result)
+            for score, chunk_id, is_anomaly, content in ranked[:limit]
+        ]
         
-        self.anomaly_service.save_model(self.model_repo)
+        next_cursor = None
+        if len(ranked) > limit:
+            last = ranked[limit - 1]
+            next_cursor = self._encode_cursor(scope, last[0], last[1])
         
-        anomaly_count = sum(1 for a in anomalies if a == -1)
-        logger.info(f"Anomaly detection completed: {anomaly_count} anomalies found")
-        return results
+        return page, next_cursor
+    
+    def _encode_cursor(self, scope: str, score: float, chunk_id: str) -> str:
+        # input: ranked set, score, chunk id; builds opaque cursor; output: cursor string
+        raw = f"{scope}|{score!r}|{chunk_id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+    
+    def _decode_cursor(self, cursor: str, scope: str) -> Tuple[float, str]:
+        # input: cursor string, ranked set being paged; parses position; output: (score, chunk id)
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            cursor_scope, score, chunk_id = raw.split("|", 2)
+            position = (float(score), chunk_id)
+        except Exception:
+            raise ValueError("Invalid pagination cursor")
+        
+        # a cursor only orders the set it was issued for
+        if cursor_scope != scope:
+            raise ValueError(
+                f"Pagination cursor was issued for only_anomalies={cursor_scope == 'anomalies'}"
+            )
+        return position
 
 
 class ClassifyQualityUseCase:
     # classifies document quality using supervised learning
     
+    _labels_lock = threading.Lock()
+    _retrain_lock = threading.Lock()
+    
     def __init__(
         self,
         vector_repo: IVectorRepository,
         quality_service: IQualityClassificationService,
-        model_repo: IModelRepository
+        model_repo: IModelRepository,
+        page_size: int = 1000,
+        retrain_every: int = 200
     ):
         self.vector_repo = vector_repo
         self.quality_service = quality_service
         self.model_repo = model_repo
+        self.page_size = page_size
+        self.retrain_every = retrain_every
     
     def train(self, training_data: List[Dict[str, Any]]) -> Dict[str, float]:
-        # input: labeled training data; trains classifier; output: metrics
+        # input: labeled training data; records labels and retrains on every known label; output: metrics
+        self._record_labels(training_data, pending=False)
+        return self.retrain()
+    
+    def learn(self, training_data: List[Dict[str, Any]]) -> Dict[str, float]:
+        # input: labeled training data; folds labels into the live blended model; output: batch metrics
         embeddings = [item['embedding'] for item in training_data]
         labels = [item['label'] for item in training_data]
         
-        metrics = self.quality_service.train(embeddings, labels)
-        self.quality_service.save_model(self.model_repo)
+        if not self.quality_service.is_trained():
+            self.quality_service.load_model(self.model_repo)
+        
+        metrics = self.quality_service.partial_fit(embeddings, labels)
+        # online versions replace one checkpoint so retrained versions stay available for rollback
+        self.quality_service.save_model(self.model_repo, checkpoint=True)
+        metrics['pending_labels'] = self._record_labels(training_data, pending=True)
+        
+        logger.info(f"Quality classifier updated online with {len(training_data)} labels")
+        return metrics
+    
+    def retrain(self) -> Dict[str, float]:
+        # input: none; fully retrains on the stored label set and swaps the live model; output: metrics
+        if not self._retrain_lock.acquire(blocking=False):
+            raise ValueError("A full quality retrain is already running")
+        
+        try:
+            store = self._load_labels()
+            chunks = self.vector_repo.get_chunks_by_ids(list(store['labels']))
+            chunks = [c for c in chunks if c.embedding is not None]
+            
+            if len(chunks) < 2:
+                raise ValueError(f"Need at least 2 labeled chunks, got {len(chunks)}")
+            
+            metrics = self.quality_service.train(
+                [c.embedding for c in chunks],
+                [store['labels'][c.id] for c in chunks]
+            )
+            self.quality_service.save_model(self.model_repo)
+            
+            # labels that arrived while training stay pending for the next retrain
+            with self._labels_lock:
+                latest = self._load_labels()
+                self.model_repo.save_model(
+                    {
+                        'labels': latest['labels'],
+                        'pending': max(0, latest['pending'] - store['pending'])
+                    },
+                    "quality_labels",
+                    checkpoint=True
+                )
+        
+        finally:
+            self._retrain_lock.release()
         
         logger.info(f"Quality classifier trained with accuracy: {metrics.get('accuracy', 0)}")
         return metrics
     
-    def predict(self, chunk_ids: Optional[List[str]] = None) -> List[QualityAssessment]:
-        # input: optional chunk ids; predicts quality; output: quality assessments
-        if not self.quality_service.is_trained():
-            if not self.quality_service.load_model(self.model_repo):
-                raise ValueError("Quality classifier not trained")
+    def retrain_and_backfill(self) -> int:
+        # input: none; retrains when possible, then restamps stored labels with the live model; output: updated count
+        try:
+            self.retrain()
+        except Exception as e:
+            # the live model may still be newer than stored labels, so the backfill runs regardless
+            logger.warning(f"Quality retrain skipped: {str(e)}")
+        return self.backfill()
+    
+    def retrain_due(self) -> bool:
+        # input: none; compares labels learned online against the retrain interval; output: due boolean
+        return self._load_labels()['pending'] >= self.retrain_every
+    
+    def backfill(self) -> int:
+        # input: none; restamps chunks labeled by an older model page by page; output: updated count
+        self._ensure_model()
+        version = self.quality_service.get_version()
         
-        chunks = self.vector_repo.get_all_chunks()
+        updated = 0
+        for page in self.vector_repo.iter_chunks(self.page_size):
+            stale = [
+                c for c in page
+                if c.embedding is not None and not self._is_current(c, version)
+            ]
+            if stale:
+                updated += self._classify_and_store(stale, version)
         
-        if chunk_ids:
-            chunks = [c for c in chunks if c.id in chunk_ids]
+        logger.info(f"Quality backfill stored predictions for {updated} chunks (model {version})")
+        return updated
+    
+    def predict(self, chunk_ids: Optional[List[str]] = None) -> List[QualityAssessment]:
+        # input: optional chunk ids; reads stored labels, classifying only stale chunks; output: quality assessments
+        self._ensure_model()
+        version = self.quality_service.get_version()
         
-        embeddings = [chunk.embedding for chunk in chunks]
+        if chunk_ids:
+            chunks = self.vector_repo.get_chunks_by_ids(chunk_ids, include_embeddings=False)
+        else:
+            chunks = [
+                c for page in self.vector_repo.iter_chunks(self.page_size, include_embeddings=False)
+                for c in page
+            ]
         
-        predictions, confidences = self.quality_service.predict(embeddings)
+        stale_ids = [c.id for c in chunks if not self._is_current(c, version)]
+        if stale_ids:
+            stale = self.vector_repo.get_chunks_by_ids(stale_ids)
+            self._classify_and_store([c for c in stale if c.embedding is not None], version)
+            refreshed = {c.id: c for c in stale}
+            chunks = [refreshed.get(c.id, c) for c in chunks]
         
         results = []
-        for i, chunk in enumerate(chunks):
+        for chunk in chunks:
+            if not self._is_current(chunk, version):
+                continue
             assessment = QualityAssessment(
                 chunk_id=chunk.id,
-                quality_label=predictions[i],
-                confidence=confidences[i],
+                quality_label=QualityLabel(chunk.metadata['quality_label']),
+                confidence=float(chunk.metadata['quality_confidence']),
                 features={"content_length": len(chunk.content)}
             )
             results.append(assessment)
         
-        logger.info(f"Quality classification completed for {len(results)} chunks")
+        logger.info(
+            f"Quality classification completed for {len(results)} chunks "
+            f"({len(stale_ids)} classified on demand)"
+        )
         return results
+    
+    def _classify_and_store(self, chunks: List[Chunk], version: str) -> int:
+        # input: embedded chunks, model version; predicts and persists labels; output: stored count
+        if not chunks:
+            return 0
+        
+        labels, confidences = self.quality_service.predict([c.embedding for c in chunks])
+        metadatas = []
+        for chunk, label, confidence in zip(chunks, labels, confidences):
+            fields = quality_metadata(label, confidence, version)
+            chunk.metadata.update(fields)
+            metadatas.append(fields)
+        
+        return self.vector_repo.update_metadata([c.id for c in chunks], metadatas)
+    
+    def _is_current(self, chunk: Chunk, version: str) -> bool:
+        # input: chunk, model version; checks stored label provenance; output: current boolean
+        return (
+            'quality_label' in chunk.metadata
+            and chunk.metadata.get('quality_model_version') == version
+        )
+    
+    def _record_labels(self, training_data: List[Dict[str, Any]], pending: bool) -> int:
+        # input: labeled training data, pending flag; merges into the stored label set; output: pending count
+        with self._labels_lock:
+            current = self._load_labels()
+            store = {'labels': dict(current['labels']), 'pending': current['pending']}
+            for item in training_data:
+                store['labels'][item['chunk_id']] = item['label']
+            if pending:
+                store['pending'] += len(training_data)
+            # the label set is working data, not a model worth keeping history of
+            self.model_repo.save_model(store, "quality_labels", checkpoint=True)
+        return store['pending']
+    
+    def _load_labels(self) -> Dict[str, Any]:
+        # input: none; reads the stored label set; output: labels by chunk id and pending count
+        return self.model_repo.load_model("quality_labels") or {'labels': {}, 'pending': 0}
+    
+    def _ensure_model(self):
+        # input: none; loads persisted classifier if needed; output: none
+        if not self.quality_service.is_trained():
+            if not self.quality_service.load_model(self.model_repo):
+                raise ValueError("Quality classifier not trained")
+
+
+class RelatedContentUseCase:
+    # serves related chunks and documents from the precomputed knn graph
+    
+    _recover_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        vector_repo: IVectorRepository,
+        knn_graph_service: IKnnGraphService,
+        model_repo: IModelRepository,
+        save_every: int = 500
+    ):
+        self.vector_repo = vector_repo
+        self.knn_graph_service = knn_graph_service
+        self.model_repo = model_repo
+        self.save_every = save_every
+    
+    def rebuild(self) -> int:
+        # input: none; rebuilds graph over all chunks; output: node count
+        chunks = [c for c in self.vector_repo.get_all_chunks() if c.embedding is not None]
+        
+        if not chunks:
+            raise ValueError("No chunks available for the kNN graph")
+        
+        n_nodes = self.knn_graph_service.build(
+            [c.id for c in chunks],
+            [c.document_id for c in chunks],
+            [c.embedding for c in chunks]
+        )
+        self.knn_graph_service.save_model(self.model_repo)
+        
+        logger.info(f"kNN graph rebuilt with {n_nodes} nodes")
+        return n_nodes
+    
+    def index_document(self, document_id: str) -> int:
+        # input: document id; folds its chunks into the graph; output: added count
+        if not self._ensure_graph():
+            return self.rebuild()
+        
+        chunks = [
+            c for c in self.vector_repo.get_all_chunks(document_id)
+            if c.embedding is not None
+        ]
+        added = self.knn_graph_service.add(
+            [c.id for c in chunks],
+            [c.document_id for c in chunks],
+            [c.embedding for c in chunks]
+        )
+        self._save_if_due()
+        return added
+    
+    def remove_document(self, document_id: str) -> int:
+        # input: document id; drops its nodes from the graph; output: removed count
+        if not self._ensure_graph():
+            return 0
+        
+        removed = self.knn_graph_service.remove_document(document_id)
+        if removed:
+            # saved at once: a crash must not bring deleted chunks back into results
+            self.knn_graph_service.save_model(self.model_repo, checkpoint=True)
+        return removed
+    
+    def flush(self) -> bool:
+        # input: none; persists incremental graph changes not yet saved; output: saved boolean
+        if self.knn_graph_service.unsaved_changes() == 0:
+            return False
+        return self.knn_graph_service.save_model(self.model_repo, checkpoint=True)
+    
+    def related_chunks(self, chunk_id: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        # input: chunk id, k; reads graph neighbours; output: related chunk entries
+        if not self._ensure_graph():
+            raise ValueError("kNN graph not built. Rebuild it first.")
+        
+        try:
+            related = self.knn_graph_service.related_chunks(chunk_id, top_k)
+        except LookupError:
+            chunk = self.vector_repo.get_chunk_by_id(chunk_id)
+            if chunk is None:
+                raise
+            self._recover(chunk.document_id)
+            related = self.knn_graph_service.related_chunks(chunk_id, top_k)
+        return [{'chunk_id': cid, 'score': score} for cid, score in related]
+    
+    def related_documents(self, document_id: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        # input: document id, k; reads aggregated neighbours; output: related document entries
+        if not self._ensure_graph():
+            raise ValueError("kNN graph not built. Rebuild it first.")
+        
+        try:
+            related = self.knn_graph_service.related_documents(document_id, top_k)
+        except LookupError:
+            self._recover(document_id)
+            related = self.knn_graph_service.related_documents(document_id, top_k)
+        return [{'document_id': did, 'score': score} for did, score in related]
+    
+    def _recover(self, document_id: str):
+        # input: stored document id missing from the graph; folds it in once; output: none
+        # additions are saved in batches, so a crash can lose recently indexed documents
+        with self._recover_lock:
+            try:
+                self.knn_graph_service.related_documents(document_id, 1)
+                return
+            except LookupError:
+                pass
+            
+            if self.index_document(document_id) == 0:
+                raise LookupError(f"Document {document_id} not found in kNN graph")
+            logger.info(f"Re-indexed {document_id} missing from the saved kNN graph")
+    
+    def _save_if_due(self):
+        # input: none; checkpoints the graph once enough nodes were added; output: none
+        # every save writes the whole graph, so additions are batched
+        if self.knn_graph_service.unsaved_changes() >= self.save_every:
+            self.knn_graph_service.save_model(self.model_repo, checkpoint=True)
+    
+    def _ensure_graph(self) -> bool:
+        # input: none; lazily loads persisted graph; output: availability boolean
+        if self.knn_graph_service.is_built():
+            return True
+        return self.knn_graph_service.load_model(self.model_repo)
 
 
 class GetVisualizationDataUseCase:
-    # prepares data for visualization
+    # serves persisted 2d projections for visualization
+    
+    _projection_lock = threading.Lock()
     
     def __init__(
         self,
         vector_repo: IVectorRepository,
-        clustering_service: IClusteringService
+        clustering_service: IClusteringService,
+        model_repo: IModelRepository,
+        spatial_index: Optional[ISpatialIndexService] = None,
+        page_size: int = 1000
     ):
         self.vector_repo = vector_repo
         self.clustering_service = clustering_service
+        self.model_repo = model_repo
+        self.spatial_index = spatial_index
+        self.page_size = page_size
     
     def execute(self) -> Dict[str, Any]:
-        # input: none; prepares viz data; output: 2D embeddings and metadata
-        chunks = self.vector_repo.get_all_chunks()
+        # input: none; reads stored coordinates; output: 2D embeddings and metadata of projected chunks, with the unprojected count
+        chunks = self._load_chunks()
         
         if not chunks:
             raise ValueError("No chunks available for visualization")
         
-        embeddings = [chunk.embedding for chunk in chunks]
-        texts = [chunk.content[:100] for chunk in chunks]
+        # chunks whose projection failed at ingest are left to project_missing, off the request path
+        projected = [chunk for chunk in chunks if 'x_2d' in chunk.metadata]
+        unprojected = len(chunks) - len(projected)
+        chunks = projected
+        
+        return {
+            'embeddings_2d': [
+                [chunk.metadata.get('x_2d', 0.0), chunk.metadata.get('y_2d', 0.0)]
+                for chunk in chunks
+            ],
+            'labels': [chunk.metadata.get('cluster_id', -1) for chunk in chunks],
+            'texts': [chunk.content[:100] for chunk in chunks],
+            'chunk_ids': [chunk.id for chunk in chunks],
+            'document_ids': [chunk.document_id for chunk in chunks],
+            'unprojected': unprojected
+        }
+    
+    def get_tiles(
+        self,
+        zoom: int = 0,
+        x_min: Optional[float] = None,
+        x_max: Optional[float] = None,
+        y_min: Optional[float] = None,
+        y_max: Optional[float] = None,
+        max_points: int = 5000
+    ) -> Dict[str, Any]:
+        # input: zoom, viewport, raw point budget; reads the last built spatial index; output: bins or points with staleness
+        if self.spatial_index is None:
+            raise ValueError("Spatial index not configured")
+        
+        # only the first request builds inline; later corpus changes are indexed by refresh_index
+        if self.spatial_index.generation is None:
+            self.refresh_index()
+        
+        tile = self.spatial_index.query(x_min, x_max, y_min, y_max, zoom, max_points)
+        tile['stale'] = self.spatial_index.generation != self.vector_repo.get_generation()
+        return tile
+    
+    def refresh_index(self) -> bool:
+        # input: none; rebuilds the spatial index when the corpus changed since the last build; output: rebuilt boolean
+        if self.spatial_index is None:
+            return False
         
-        embeddings_2d = self.clustering_service.reduce_dimensions(embeddings, n_components=2)
+        generation = self.vector_repo.get_generation()
+        if self.spatial_index.generation == generation:
+            return False
         
-        labels = [chunk.metadata.get('cluster_id', -1) for chunk in chunks]
+        chunks = self._load_chunks()
         
+        if not chunks:
+            raise ValueError("No chunks available for visualization")
+        
+        if any('x_2d' not in chunk.metadata for chunk in chunks):
+            self.project_missing()
+            # storing coordinates bumps the generation; read it again before the data it stamps
+            generation = self.vector_repo.get_generation()
+            chunks = self._load_chunks()
+        
+        self.spatial_index.build(
+            [chunk.id for chunk in chunks],
+            [chunk.document_id for chunk in chunks],
+            [chunk.content[:100] for chunk in chunks],
+            [
+                [chunk.metadata.get('x_2d', 0.0), chunk.metadata.get('y_2d', 0.0)]
+                for chunk in chunks
+            ],
+            [chunk.metadata.get('cluster_id', -1) for chunk in chunks],
+            generation
+        )
+        return True
+    
+    def refresh_projection(self, refit: bool = False) -> int:
+        # input: refit flag; fits projection if needed and stores coordinates; output: projected count
+        if not self.clustering_service.has_projection():
+            self.clustering_service.load_model(self.model_repo)
+        
+        if refit or not self.clustering_service.has_projection():
+            self.clustering_service.fit_projection(
+                [c.embedding for c in page if c.embedding is not None]
+                for page in self.vector_repo.iter_chunks(self.page_size)
+            )
+            self.clustering_service.save_model(self.model_repo)
+        
+        projected = 0
+        for page in self.vector_repo.iter_chunks(self.page_size):
+            page = [c for c in page if c.embedding is not None]
+            points = self.clustering_service.project([c.embedding for c in page])
+            self.vector_repo.update_metadata(
+                [c.id for c in page],
+                [{'x_2d': float(p[0]), 'y_2d': float(p[1])} for p in points]
+            )
+            projected += len(page)
+        
+        logger.info(f"Stored 2D projection for {projected} chunks (refit={refit})")
+        return projected
+    
+    def project_missing(self) -> int:
+        # input: none; stores coordinates for chunks that have none, fitting first if no projection exists; output: projected count
+        if not self._projection_lock.acquire(blocking=False):
+            return 0
+        
+        try:
+            if not self.clustering_service.has_projection():
+                self.clustering_service.load_model(self.model_repo)
+            if not self.clustering_service.has_projection():
+                return self.refresh_projection()
+            
+            missing = [c.id for c in self._load_chunks() if 'x_2d' not in c.metadata]
+            projected = 0
+            for start in range(0, len(missing), self.page_size):
+                page = self.vector_repo.get_chunks_by_ids(missing[start:start + self.page_size])
+                page = [c for c in page if c.embedding is not None]
+                points = self.clustering_service.project([c.embedding for c in page])
+                self.vector_repo.update_metadata(
+                    [c.id for c in page],
+                    [{'x_2d': float(p[0]), 'y_2d': float(p[1])} for p in points]
+                )
+                projected += len(page)
+        
+        finally:
+            self._projection_lock.release()
+        
+        if projected:
+            logger.info(f"Stored 2D projection for {projected} chunks missing coordinates")
+        return projected
+    
+    def _load_chunks(self) -> List[Chunk]:
+        # input: none; pages chunks without embeddings; output: chunk list
+        chunks = []
+        for page in self.vector_repo.iter_chunks(self.page_size, include_embeddings=False):
+            chunks.extend(page)
+        return chunks
+
+
+class RefreshAnalyticsUseCase:
+    # recomputes clustering, anomaly and visualization snapshots for background serving
+    
+    def __init__(
+        self,
+        cluster_use_case: ClusterDocumentsUseCase,
+        anomaly_use_case: DetectAnomaliesUseCase,
+        visualization_use_case: GetVisualizationDataUseCase,
+        n_clusters: int = 5,
+        contamination: float = 0.1,
+        anomaly_limit: int = 100
+    ):
+        self.cluster_use_case = cluster_use_case
+        self.anomaly_use_case = anomaly_use_case
+        self.visualization_use_case = visualization_use_case
+        self.n_clusters = n_clusters
+        self.contamination = contamination
+        self.anomaly_limit = anomaly_limit
+    
+    def jobs(self) -> Dict[str, Callable[[], Any]]:
+        # input: none; lists jobs in dependency order; output: named job callables
         return {
-            'embeddings_2d': embeddings_2d,
-            'labels': labels,
-            'texts': texts,
-            'chunk_ids': [chunk.id for chunk in chunks],
-            'document_ids': [chunk.document_id for chunk in chunks]
+            'clustering': self.clusters,
+            'anomalies': self.anomalies,
+            'visualization': self.visualization
         }
+    
+    def clusters(self) -> Dict[str, Any]:
+        # input: none; reclusters with drift-aware refit, keeping the live model's k; output: clusters and run details
+        # the configured k only seeds the first fit; a k chosen via the api or auto-k must survive refreshes
+        n_clusters = self.cluster_use_case.current_n_clusters() or self.n_clusters
+        cluster_info = self.cluster_use_case.execute(n_clusters=n_clusters)
+        return {'clusters': cluster_info, 'last_run': dict(self.cluster_use_case.last_run)}
+    
+    def anomalies(self) -> Dict[str, Any]:
+        # input: none; refits anomaly model on corpus changes, keeping the live contamination; output: first ranked page
+        # the configured rate only seeds the first fit, as the configured k does for clustering
+        return self.anomaly_use_case.refresh(self.contamination, limit=self.anomaly_limit)
+    
+    def visualization(self) -> Dict[str, Any]:
+        # input: none; projects chunks missing coordinates, gathers stored ones and rebuilds the tile index off the request path; output: visualization data
+        self.visualization_use_case.project_missing()
+        viz_data = self.visualization_use_case.execute()
+        self.visualization_use_case.refresh_index()
+        return viz_data
 
 
 class GetSystemStatusUseCase:
@@ -262,18 +1174,14 @@ class GetSystemStatusUseCase:
         self.vector_repo = vector_repo
     
     def execute(self) -> Dict[str, Any]:
-        # input: none; gathers stats; output: system status dictionary
-        documents = self.doc_repo.get_all(limit=10000)
-        chunks = self.vector_repo.get_all_chunks()
-        
-        status_counts = {}
-        for doc in documents:
-            status_counts[doc.status.value] = status_counts.get(doc.status.value, 0) + 1
+        # input: none; reads maintained counters; output: system status dictionary
+        stats = self.doc_repo.get_stats()
+        total_documents = stats['total_documents']
+        total_chunks = self.vector_repo.count_chunks()
         
         return {
-            'total_documents': len(documents),
-            'total_chunks': len(chunks),
-            'status_breakdown': status_counts,
-            'average_chunks_per_document': len(chunks) / len(documents) if documents else 0
+            'total_documents': total_documents,
+            'total_chunks': total_chunks,
+            'status_breakdown': stats['status_counts'],
+            'average_chunks_per_document': total_chunks / total_documents if total_documents else 0
         }
-    
\ No newline at end of file
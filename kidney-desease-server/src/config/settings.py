@@ -9,20 +9,63 @@ class Settings(BaseSettings):
     chroma_persist_dir: str = "./data/chroma_db"
     documents_dir: str = "./data/documents"
     models_dir: str = "./data/models"
+    model_max_versions: int = 5
+    model_mmap_threshold: int = 16 * 1024 * 1024
     documents_db_dir: str = "./data/documents_db"
+    documents_sqlite_path: str = "./data/documents.db"
+    extracted_text_cache_dir: str = "./data/extracted_text"
+
+    vector_batch_size: int = 5000
 
     chunk_size: int = 512
     chunk_overlap: int = 50
 
     min_quality_score: float = 0.6
+    quality_retrain_every: int = 200
+    quality_online_weight: float = 0.5
     anomaly_contamination: float = 0.1
+    anomaly_n_jobs: int = -1
+    anomaly_reservoir_size: int = 50000
     n_clusters: int = 5
+    cluster_drift_threshold: float = 1.5
+    cluster_batch_size: int = 1024
+    cluster_max_vocabulary: int = 50000
+    cluster_auto_k_workers: int = 4
+    cluster_auto_k_sample_size: int = 2000
+    knn_graph_k: int = 10
+    knn_graph_save_every: int = 500
+
+    visualization_max_level: int = 10
+
+    search_cache_size: int = 256
+    search_cache_threshold: float = 0.95
+
+    analytics_scheduler_enabled: bool = True
+    analytics_refresh_interval: float = 900.0
+    analytics_refresh_min_changes: int = 5
+    analytics_max_staleness: float = 3600.0
+    analytics_anomaly_limit: int = 100
+
+    search_workers: int = 8
+    search_queue_size: int = 64
+    analytics_workers: int = 2
+    analytics_queue_size: int = 8
 
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     log_level: str = "INFO"
 
     max_upload_size: int = 10 * 1024 * 1024
+    upload_memory_limit: int = 10 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
+    upload_multipart_overhead: int = 64 * 1024
+
+    pdf_isolation_enabled: bool = True
+    pdf_workers: int = 2
+    pdf_timeout_seconds: float = 60.0
+    pdf_max_rss: int = 512 * 1024 * 1024
+    pdf_max_address_space: int = 2 * 1024 * 1024 * 1024
+    pdf_page_timeout_seconds: float = 5.0
 
     class Config:
         env_file = ".env"
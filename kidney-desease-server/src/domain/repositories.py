@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from src.domain.entities import Document, Chunk, SearchResult
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from datetime import datetime
+from src.domain.entities import Document, Chunk, SearchResult, ProcessingStatus
 
 
 class IDocumentRepository(ABC):
@@ -21,11 +22,40 @@ class IDocumentRepository(ABC):
         # input: pagination params; retrieves documents; output: document list
         pass
 
+    @abstractmethod
+    def list_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[ProcessingStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        # input: page size, opaque cursor, status and date filters; reads newest first; output: documents and next cursor
+        pass
+
+    @abstractmethod
+    def get_by_content_hash(self, content_hash: str) -> Optional[Document]:
+        # input: sha256 of document content; finds a stored duplicate; output: document or None
+        pass
+
+    @abstractmethod
+    def update_status(
+        self, doc_id: str, status: ProcessingStatus, metadata: Dict[str, Any]
+    ) -> bool:
+        # input: document id, status, metadata; rewrites the metadata record only; output: found status
+        pass
+
     @abstractmethod
     def delete(self, doc_id: str) -> bool:
         # input: document id; deletes document; output: success status
         pass
 
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        # input: none; reads maintained counters; output: document totals by status and chunk counts
+        pass
+
 
 class IVectorRepository(ABC):
     # interface for vector storage and retrieval operations
@@ -50,6 +80,40 @@ class IVectorRepository(ABC):
         # input: optional doc id filter; retrieves chunks; output: chunk list
         pass
 
+    @abstractmethod
+    def iter_chunks(
+        self,
+        batch_size: int = 1000,
+        include_embeddings: bool = True,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[List[Chunk]]:
+        # input: page size, embedding flag, filters; streams stored chunks; output: chunk pages
+        pass
+
+    @abstractmethod
+    def count_chunks(self, filter_metadata: Optional[Dict[str, Any]] = None) -> int:
+        # input: optional filters; counts stored chunks; output: chunk count
+        pass
+
+    @abstractmethod
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[Chunk]:
+        # input: chunk id; retrieves stored chunk with embedding; output: chunk or None
+        pass
+
+    @abstractmethod
+    def update_metadata(
+        self, chunk_ids: List[str], metadatas: List[Dict[str, Any]]
+    ) -> int:
+        # input: chunk ids, partial metadata dicts; merges in batches; output: updated count
+        pass
+
+    @abstractmethod
+    def get_chunks_by_ids(
+        self, chunk_ids: List[str], include_embeddings: bool = True
+    ) -> List[Chunk]:
+        # input: chunk ids, embedding flag; looks up by id in batches; output: found chunks
+        pass
+
     @abstractmethod
     def delete_by_document(self, document_id: str) -> bool:
         # input: document id; deletes related chunks; output: success status
@@ -60,21 +124,49 @@ class IVectorRepository(ABC):
         # input: none; retrieves all embeddings; output: embedding matrix
         pass
 
+    @abstractmethod
+    def get_generation(self) -> int:
+        # input: none; reads write counter; output: current index generation
+        pass
+
+    @abstractmethod
+    def get_content_generation(self) -> int:
+        # input: none; reads the chunk add and delete counter; output: generation ignoring metadata writes
+        pass
+
 
 class IModelRepository(ABC):
     # interface for ML model persistence
 
     @abstractmethod
-    def save_model(self, model: Any, model_name: str) -> bool:
-        # input: model object, name; persists model; output: success status
+    def save_model(
+        self,
+        model: Any,
+        model_name: str,
+        metrics: Optional[Dict[str, float]] = None,
+        checkpoint: bool = False,
+    ) -> bool:
+        # input: model object, name, optional metrics, checkpoint flag; publishes a new version, checkpoints replacing each other outside retention; output: success status
         pass
 
     @abstractmethod
-    def load_model(self, model_name: str) -> Optional[Any]:
-        # input: model name; loads model; output: model object or None
+    def load_model(
+        self, model_name: str, version: Optional[int] = None
+    ) -> Optional[Any]:
+        # input: model name, optional version; loads current or given version; output: model object or None
         pass
 
     @abstractmethod
     def model_exists(self, model_name: str) -> bool:
         # input: model name; checks existence; output: exists boolean
         pass
+
+    @abstractmethod
+    def list_versions(self, model_name: str) -> List[Dict[str, Any]]:
+        # input: model name; reads published versions; output: version entries
+        pass
+
+    @abstractmethod
+    def rollback(self, model_name: str, version: int) -> bool:
+        # input: model name, version; makes a kept version current; output: success status
+        pass
@@ -0,0 +1,90 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from pathlib import Path
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import logging
+from src.application.services import IExtractedTextCache
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractedTextCache(IExtractedTextCache):
+    # on-disk gzip cache of cleaned text and page offsets keyed by raw file hash and extractor version
+
+    def __init__(self, cache_dir: str = "./data/extracted_text"):
+        # input: cache directory; initializes storage and counters; output: none
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        logger.info(f"Extracted text cache initialized at {self.cache_dir}")
+
+    def get(self, file_hash: str, extractor_version: str) -> Optional[Dict[str, Any]]:
+        # input: raw file hash, extractor version; reads cached extraction; output: entry or None
+        path = self._path(file_hash, extractor_version)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable text cache entry {path}: {str(e)}")
+            path.unlink(missing_ok=True)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(
+        self,
+        file_hash: str,
+        extractor_version: str,
+        text: str,
+        page_offsets: List[int],
+    ):
+        # input: raw file hash, extractor version, cleaned text, page offsets; writes entry atomically; output: none
+        path = self._path(file_hash, extractor_version)
+        entry = {
+            "file_hash": file_hash,
+            "extractor_version": extractor_version,
+            "text": text,
+            "page_offsets": page_offsets,
+            "created_at": datetime.now().isoformat(),
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                fileobj=raw, mode="wb", compresslevel=6
+            ) as f:
+                f.write(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        # input: none; summarizes cache effectiveness; output: stats dictionary
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _path(self, file_hash: str, extractor_version: str) -> Path:
+        # input: raw file hash, extractor version; derives entry file name; output: entry path
+        key = hashlib.sha256(f"{file_hash}:{extractor_version}".encode("utf-8"))
+        return self.cache_dir / f"{key.hexdigest()}.json.gz"
@@ -0,0 +1,131 @@
+from typing import List, Optional, Dict, Any
+import json
+import threading
+import numpy as np
+import logging
+from src.application.services import ISemanticQueryCache
+from src.domain.entities import SearchResult
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache(ISemanticQueryCache):
+    # caches search results keyed by near-duplicate query embeddings
+
+    def __init__(self, capacity: int = 256, similarity_threshold: float = 0.95):
+        # input: max entries, cosine threshold; initializes cache; output: none
+        self.capacity = capacity
+        self.similarity_threshold = similarity_threshold
+        self.vectors: Optional[np.ndarray] = None
+        self.entries: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.size = 0
+        self.next_slot = 0
+        self.generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def lookup(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        generation: int,
+    ) -> Optional[List[SearchResult]]:
+        # input: query vector, k, filters, index generation; finds near-duplicate entry; output: results or None
+        q = self._normalize(query_embedding)
+        filters_key = self._filters_key(filters)
+
+        with self._lock:
+            if not self._advance(generation) or self.size == 0:
+                self.misses += 1
+                return None
+
+            sims = self.vectors[: self.size] @ q
+            for slot in np.argsort(-sims):
+                if sims[slot] < self.similarity_threshold:
+                    break
+                entry = self.entries[slot]
+                if entry["filters_key"] == filters_key and entry["top_k"] >= top_k:
+                    self.hits += 1
+                    self.saved_seconds += entry["search_seconds"]
+                    return entry["results"][:top_k]
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        generation: int,
+        results: List[SearchResult],
+        search_seconds: float,
+    ):
+        # input: query vector, k, filters, generation, results, latency; caches entry; output: none
+        q = self._normalize(query_embedding)
+
+        with self._lock:
+            if not self._advance(generation):
+                # results computed before a newer write must not land in the fresh cache
+                return
+
+            if self.vectors is None:
+                self.vectors = np.zeros((self.capacity, q.shape[0]), dtype=np.float32)
+
+            slot = self.next_slot
+            self.vectors[slot] = q
+            self.entries[slot] = {
+                "filters_key": self._filters_key(filters),
+                "top_k": top_k,
+                "results": list(results),
+                "search_seconds": search_seconds,
+            }
+            self.next_slot = (slot + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def stats(self) -> Dict[str, Any]:
+        # input: none; summarizes cache effectiveness; output: stats dictionary
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self.size,
+                "capacity": self.capacity,
+                "similarity_threshold": self.similarity_threshold,
+                "generation": self.generation if self.generation is not None else -1,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
+
+    def _advance(self, generation: int) -> bool:
+        # input: caller's index generation; resets on newer generations only; output: current boolean
+        if self.generation is not None and generation < self.generation:
+            return False
+        if generation != self.generation:
+            self._reset(generation)
+        return True
+
+    def _reset(self, generation: int):
+        # input: new index generation; drops stale entries; output: none
+        if self.size:
+            logger.info(
+                f"Query cache invalidated: generation {self.generation} -> {generation}"
+            )
+        self.entries = [None] * self.capacity
+        self.size = 0
+        self.next_slot = 0
+        self.generation = generation
+
+    def _normalize(self, embedding: List[float]) -> np.ndarray:
+        # input: embedding; l2-normalizes vector; output: float32 vector
+        v = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm > 0 else v
+
+    def _filters_key(self, filters: Optional[Dict[str, Any]]) -> str:
+        # input: metadata filters; canonicalizes; output: comparable key
+        return json.dumps(filters, sort_keys=True) if filters else ""
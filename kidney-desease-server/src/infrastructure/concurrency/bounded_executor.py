@@ -0,0 +1,87 @@
+from typing import Any, Callable, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import functools
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    # raised when a pool has no free worker or queue slot
+    pass
+
+
+class BoundedExecutor:
+    # thread pool with a hard cap on running plus queued jobs
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        # input: pool name, worker count, queued job limit; starts pool; output: none
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-worker"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        # input: blocking callable and arguments; runs it off the event loop; output: callable result
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def spawn(self, fn: Callable[..., Any], *args, **kwargs):
+        # input: blocking callable and arguments; queues it without waiting, logging failures; output: none
+        name = getattr(fn, "__name__", repr(fn))
+
+        def report(done: Future):
+            # nobody awaits a spawned job, so its failure is only visible in the log
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(f"Background job {name} failed: {str(done.exception())}")
+
+        self.submit(fn, *args, **kwargs).add_done_callback(report)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        # input: blocking callable and arguments; takes a slot or rejects at once; output: job future
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"Executor {self.name} saturated, rejecting job")
+            raise ExecutorSaturatedError(f"{self.name} executor is at capacity")
+
+        with self._lock:
+            self._in_flight += 1
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release(None)
+            raise
+
+        # the slot frees when the job finishes, not when a cancelled caller stops waiting
+        future.add_done_callback(self._release)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        # input: none; reads pool counters; output: stats dictionary
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        # input: none; stops accepting work and lets running jobs finish; output: none
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future):
+        # input: finished future; returns its slot; output: none
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
@@ -0,0 +1,35 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    # coalesces identical in-flight async calls into one shared computation; event-loop confined
+
+    def __init__(self):
+        # input: none; initializes in-flight table; output: none
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def run(
+        self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        # input: request key, coroutine function and arguments; joins or starts the call; output: shared result
+        pending = self._calls.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            logger.info(f"Joined in-flight computation for {key}")
+            # shield so one waiter disconnecting does not cancel the others
+            return await asyncio.shield(pending)
+
+        future = asyncio.ensure_future(fn(*args, **kwargs))
+        self._calls[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, done: asyncio.Future):
+        # input: request key, finished future; drops it from the in-flight table; output: none
+        if self._calls.get(key) is done:
+            del self._calls[key]
@@ -1,37 +1,122 @@
-from typing import Optional
+from typing import Optional, BinaryIO, List, Tuple
+import io
 import PyPDF2
 import logging
 from pathlib import Path
+from src.application.services import IDocumentProcessor, ExtractionFailedError
+from src.infrastructure.document.pdf_extraction_pool import IsolatedPdfExtractor
 
 logger = logging.getLogger(__name__)
 
 
-class DocumentProcessor:
+class DocumentProcessor(IDocumentProcessor):
     # processes and extracts text from various document formats
 
+    # bump when extraction or cleaning output changes so cached text is not reused
+    EXTRACTOR_REVISION = 1
+
+    def __init__(self, pdf_extractor: Optional[IsolatedPdfExtractor] = None):
+        # input: optional isolated pdf worker pool; initializes; output: none
+        self.pdf_extractor = pdf_extractor
+
     def extract_text_from_pdf(self, file_path: str) -> str:
         # input: pdf file path; extracts text; output: extracted text
         try:
             with open(file_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_parts = []
-
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-
-                full_text = "\n".join(text_parts)
-                logger.info(
-                    f"Extracted {len(full_text)} characters from PDF: {file_path}"
-                )
-                return full_text
+                return self._read_pdf(file, file_path)
 
         except Exception as e:
             logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
             raise
 
+    def extract_text_from_bytes(self, data: bytes, file_type: str) -> str:
+        # input: raw file bytes, type; extracts text without touching disk; output: extracted text
+        file_type_lower = file_type.lower()
+
+        if file_type_lower == "pdf":
+            try:
+                return self._read_pdf(io.BytesIO(data), "in-memory upload")
+            except Exception as e:
+                logger.error(f"Error extracting text from PDF bytes: {str(e)}")
+                raise
+        elif file_type_lower in ["txt", "text"]:
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                text = data.decode("latin-1")
+            logger.info(f"Read {len(text)} characters from in-memory TXT")
+            return text
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+    def extract_pages(
+        self, file_path: str, file_type: str, data: Optional[bytes] = None
+    ) -> Tuple[List[str], List[int]]:
+        # input: file path, type, optional in-memory bytes; extracts raw text per page; output: page texts and skipped page indexes
+        file_type_lower = file_type.lower()
+
+        if file_type_lower == "pdf":
+            try:
+                if self.pdf_extractor is not None:
+                    return self.pdf_extractor.extract(file_path, data)
+                if data is not None:
+                    return self._read_pdf_pages(io.BytesIO(data), "in-memory upload"), []
+                with open(file_path, "rb") as file:
+                    return self._read_pdf_pages(file, file_path), []
+            except ExtractionFailedError as e:
+                logger.error(f"Error extracting pages from PDF {file_path}: {str(e)}")
+                raise
+            except Exception as e:
+                logger.error(f"Error extracting pages from PDF {file_path}: {str(e)}")
+                raise ExtractionFailedError("error", f"{type(e).__name__}: {str(e)}")
+        elif file_type_lower in ["txt", "text"]:
+            if data is not None:
+                return [self.extract_text_from_bytes(data, file_type_lower)], []
+            return [self.extract_text_from_txt(file_path)], []
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+    def clean_pages(self, pages: List[str]) -> Tuple[str, List[int]]:
+        # input: raw page texts; cleans each and joins them; output: text and page start offsets
+        parts = []
+        offsets = []
+        position = 0
+
+        for page in pages:
+            cleaned = self.clean_text(page)
+            if parts and cleaned:
+                position += 1
+            offsets.append(position)
+            if cleaned:
+                parts.append(cleaned)
+                position += len(cleaned)
+
+        return " ".join(parts), offsets
+
+    def get_extractor_version(self, file_type: str) -> str:
+        # input: file type; names the extraction logic in use; output: version string
+        if file_type.lower() == "pdf":
+            return f"pdf-pypdf2-{PyPDF2.__version__}-r{self.EXTRACTOR_REVISION}"
+        return f"{file_type.lower()}-r{self.EXTRACTOR_REVISION}"
+
+    def _read_pdf(self, stream: BinaryIO, source: str) -> str:
+        # input: binary pdf stream, source label for logs; extracts page text; output: extracted text
+        full_text = "\n".join(page for page in self._read_pdf_pages(stream, source) if page)
+        logger.info(f"Extracted {len(full_text)} characters from PDF: {source}")
+        return full_text
+
+    def _read_pdf_pages(self, stream: BinaryIO, source: str) -> List[str]:
+        # input: binary pdf stream, source label for logs; extracts each page; output: page texts
+        pdf_reader = PyPDF2.PdfReader(stream)
+        pages = []
+
+        for page_num in range(len(pdf_reader.pages)):
+            page = pdf_reader.pages[page_num]
+            pages.append(page.extract_text() or "")
+
+        logger.debug(f"Read {len(pages)} pages from PDF: {source}")
+        return pages
+
     def extract_text_from_txt(self, file_path: str) -> str:
         # input: txt file path; reads text; output: file content
         try:
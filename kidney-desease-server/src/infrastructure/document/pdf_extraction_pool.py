@@ -0,0 +1,274 @@
+from typing import Any, Dict, List, Optional, Tuple
+import io
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import threading
+import time
+import logging
+from src.application.services import ExtractionFailedError
+
+logger = logging.getLogger(__name__)
+
+
+class PdfExtractionError(ExtractionFailedError):
+    # raised when an isolated worker times out, exceeds memory, crashes or fails to parse
+    pass
+
+
+class _PageTimeout(BaseException):
+    # raised by the page alarm; BaseException so parser catch-alls do not swallow it
+    pass
+
+
+def _worker_main(conn, page_timeout_seconds: float, max_address_space: int):
+    # input: job pipe, per-page time budget, address space cap; extracts pdf pages until told to stop; output: none
+    import PyPDF2
+
+    if max_address_space > 0:
+        # hard cap: allocations fail with MemoryError here instead of waking the host oom killer
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            max_address_space = min(max_address_space, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (max_address_space, hard))
+
+    armed = {"on": False}
+
+    def on_alarm(signum, frame):
+        if armed["on"]:
+            raise _PageTimeout()
+
+    budgeted = page_timeout_seconds > 0 and hasattr(signal, "setitimer")
+    if budgeted:
+        signal.signal(signal.SIGALRM, on_alarm)
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        file_path, data = job
+        try:
+            reader = PyPDF2.PdfReader(io.BytesIO(data) if data is not None else file_path)
+            pages: List[str] = []
+            skipped: List[int] = []
+
+            for page_num in range(len(reader.pages)):
+                try:
+                    if budgeted:
+                        armed["on"] = True
+                        signal.setitimer(signal.ITIMER_REAL, page_timeout_seconds)
+                    text = reader.pages[page_num].extract_text() or ""
+                    armed["on"] = False
+                except _PageTimeout:
+                    text = ""
+                    skipped.append(page_num)
+                finally:
+                    armed["on"] = False
+                    if budgeted:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+                pages.append(text)
+
+            conn.send(("ok", pages, skipped))
+        except MemoryError:
+            reader = pages = None
+            conn.send(("memory", "Extraction hit the worker address space limit"))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {str(e)}"))
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    # input: process id; reads resident set size from procfs; output: bytes or None where unavailable
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Worker:
+    # one extraction subprocess and the parent end of its pipe
+
+    def __init__(self, ctx, page_timeout_seconds: float, max_address_space: int):
+        # input: multiprocessing context, per-page budget, address space cap; spawns the process; output: none
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, page_timeout_seconds, max_address_space),
+            name="pdf-extractor",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        # input: none; asks the process to exit; output: none
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        # input: none; terminates the process immediately; output: none
+        self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class IsolatedPdfExtractor:
+    # supervised subprocess pool that bounds pdf parsing by wall clock, memory and per-page time
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        timeout_seconds: float = 60.0,
+        max_rss_bytes: int = 512 * 1024 * 1024,
+        page_timeout_seconds: float = 5.0,
+        max_address_space: int = 2 * 1024 * 1024 * 1024,
+        poll_seconds: float = 0.1,
+    ):
+        # input: worker count, document timeout, rss cap, page budget, address space cap, supervision period; initializes; output: none
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.max_rss_bytes = max_rss_bytes
+        self.page_timeout_seconds = page_timeout_seconds
+        self.max_address_space = max_address_space
+        self.poll_seconds = poll_seconds
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "jobs": 0,
+            "timeouts": 0,
+            "memory_kills": 0,
+            "crashes": 0,
+            "errors": 0,
+            "skipped_pages": 0,
+        }
+
+    def extract(
+        self, file_path: str, data: Optional[bytes] = None
+    ) -> Tuple[List[str], List[int]]:
+        # input: pdf path, optional in-memory bytes; extracts in a worker under supervision; output: page texts and skipped page indexes
+        worker = self._acquire()
+        healthy = False
+        self._count("jobs")
+
+        try:
+            worker.conn.send((file_path, data))
+            result = self._wait(worker, file_path)
+            # a worker that ran out of address space may hold a fragmented heap
+            healthy = result[0] != "memory"
+        except (EOFError, OSError):
+            self._count("crashes")
+            worker.process.join(timeout=1)
+            raise PdfExtractionError(
+                "crash",
+                f"Extraction worker exited with code {worker.process.exitcode}",
+            )
+        finally:
+            if healthy:
+                self._idle.put(worker)
+            else:
+                self._replace(worker)
+
+        if result[0] == "memory":
+            self._count("memory_kills")
+            raise PdfExtractionError("memory", result[1])
+
+        if result[0] == "error":
+            self._count("errors")
+            raise PdfExtractionError("error", result[1])
+
+        _, pages, skipped = result
+        if skipped:
+            self._count("skipped_pages", len(skipped))
+            logger.warning(
+                f"Skipped {len(skipped)} pages over the {self.page_timeout_seconds}s budget in {file_path}"
+            )
+        return pages, skipped
+
+    def stats(self) -> Dict[str, Any]:
+        # input: none; reads pool counters; output: stats dictionary
+        with self._lock:
+            return {
+                "workers": self._started,
+                "idle": self._idle.qsize(),
+                **self._counters,
+            }
+
+    def shutdown(self):
+        # input: none; stops idle workers; output: none
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def _wait(self, worker: _Worker, file_path: str) -> Tuple[Any, ...]:
+        # input: busy worker, source label; polls for the result while enforcing limits; output: worker reply
+        deadline = time.monotonic() + self.timeout_seconds
+
+        while not worker.conn.poll(self.poll_seconds):
+            if not worker.process.is_alive():
+                self._count("crashes")
+                raise PdfExtractionError(
+                    "crash",
+                    f"Extraction worker exited with code {worker.process.exitcode}",
+                )
+
+            # secondary check; the rlimit set in the worker is the hard bound
+            rss = _rss_bytes(worker.process.pid)
+            if rss is not None and rss > self.max_rss_bytes:
+                self._count("memory_kills")
+                raise PdfExtractionError(
+                    "memory",
+                    f"Extraction exceeded {self.max_rss_bytes} bytes of memory",
+                )
+
+            if time.monotonic() > deadline:
+                self._count("timeouts")
+                raise PdfExtractionError(
+                    "timeout",
+                    f"Extraction exceeded {self.timeout_seconds}s for {file_path}",
+                )
+
+        return worker.conn.recv()
+
+    def _acquire(self) -> _Worker:
+        # input: none; takes an idle worker, spawning up to the pool size; output: worker
+        with self._lock:
+            if self._idle.empty() and self._started < self.max_workers:
+                self._started += 1
+                return _Worker(
+                    self._ctx, self.page_timeout_seconds, self.max_address_space
+                )
+        return self._idle.get()
+
+    def _replace(self, worker: _Worker):
+        # input: failed worker; kills it and spawns a fresh one in its slot; output: none
+        worker.kill()
+        logger.warning("Restarting pdf extraction worker")
+        try:
+            self._idle.put(
+                _Worker(self._ctx, self.page_timeout_seconds, self.max_address_space)
+            )
+        except Exception as e:
+            # free the slot so the next caller spawns instead of waiting forever
+            with self._lock:
+                self._started -= 1
+            logger.error(f"Could not restart pdf extraction worker: {str(e)}")
+
+    def _count(self, name: str, amount: int = 1):
+        # input: counter name, increment; updates stats; output: none
+        with self._lock:
+            self._counters[name] += amount
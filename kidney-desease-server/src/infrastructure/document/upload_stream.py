@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+from pathlib import Path
+import hashlib
+import io
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLargeError(ValueError):
+    # raised when an upload passes the configured size limit
+    pass
+
+
+@dataclass
+class StreamedUpload:
+    # stored upload with its size, raw-byte hash and in-memory copy when small enough
+    path: Path
+    size: int
+    sha256: str
+    data: Optional[bytes] = None
+
+
+def stream_upload(
+    source: BinaryIO,
+    target_path: Path,
+    max_size: int,
+    memory_limit: int,
+    chunk_size: int = 1024 * 1024,
+) -> StreamedUpload:
+    # input: parsed upload stream, destination, size cap, in-memory cap, read size; copies, hashes and buffers in one pass; output: streamed upload
+    # the raw request body is capped earlier by UploadSizeLimitMiddleware; this enforces the exact file size
+    digest = hashlib.sha256()
+    buffer: Optional[io.BytesIO] = io.BytesIO()
+    size = 0
+    tmp_path = target_path.with_name(f".{target_path.name}.part")
+
+    try:
+        with open(tmp_path, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(
+                        f"Upload exceeds the {max_size} byte limit"
+                    )
+
+                digest.update(chunk)
+                out.write(chunk)
+                if buffer is not None:
+                    if size <= memory_limit:
+                        buffer.write(chunk)
+                    else:
+                        buffer = None
+
+        os.replace(tmp_path, target_path)
+
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Stored upload of {size} bytes at {target_path}")
+    return StreamedUpload(
+        path=target_path,
+        size=size,
+        sha256=digest.hexdigest(),
+        data=buffer.getvalue() if buffer is not None else None,
+    )
@@ -1,4 +1,4 @@
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterable
 import numpy as np
 from sklearn.ensemble import IsolationForest
 import logging
@@ -11,9 +11,11 @@ logger = logging.getLogger(__name__)
 class AnomalyDetectionService(IAnomalyDetectionService):
     # detects anomalies using isolation forest
     
-    def __init__(self):
-        # input: none; initializes model; output: none
+    def __init__(self, n_jobs: int = -1, reservoir_size: int = 50000):
+        # input: parallel tree jobs, training reservoir size; initializes model; output: none
         self.model: Optional[IsolationForest] = None
+        self.n_jobs = n_jobs
+        self.reservoir_size = reservoir_size
     
     def fit_predict(
         self,
@@ -33,21 +35,95 @@ class AnomalyDetectionService(IAnomalyDetectionService):
         
         logger.info(f"Processing {X.shape[0]} embeddings with shape {X.shape[1]}")
         
-        self.model = IsolationForest(
-            contamination=contamination,
-            random_state=42,
-            n_estimators=100
-        )
+        model = self._new_model(contamination)
         
-        predictions = self.model.fit_predict(X)
+        predictions = model.fit_predict(X)
         
-        scores = self.model.score_samples(X)
+        scores = model.score_samples(X)
+        
+        # publish only once fitted so concurrent scorers never see a half-built forest
+        self.model = model
         
         n_anomalies = int(np.sum(predictions == -1))
         logger.info(f"Anomaly detection completed: {n_anomalies} anomalies detected")
         
         return predictions.tolist(), scores.tolist()
     
+    def fit_stream(
+        self,
+        embedding_batches: Iterable[List[List[float]]],
+        contamination: float = 0.1
+    ) -> int:
+        # input: streamed embedding pages, contamination; fits on a reservoir sample; output: corpus size seen
+        rng = np.random.default_rng(42)
+        reservoir: Optional[np.ndarray] = None
+        filled = 0
+        seen = 0
+        
+        for batch in embedding_batches:
+            X = np.asarray(batch, dtype=np.float32)
+            if X.shape[0] == 0:
+                continue
+            if reservoir is None:
+                reservoir = np.empty((self.reservoir_size, X.shape[1]), dtype=np.float32)
+            
+            take = min(self.reservoir_size - filled, X.shape[0])
+            if take > 0:
+                reservoir[filled:filled + take] = X[:take]
+                filled += take
+            
+            # algorithm R over the rest of the batch, vectorized
+            rest = X[take:]
+            if rest.shape[0]:
+                positions = seen + take + np.arange(rest.shape[0])
+                slots = rng.integers(0, positions + 1)
+                keep = slots < self.reservoir_size
+                reservoir[slots[keep]] = rest[keep]
+            
+            seen += X.shape[0]
+        
+        if not filled:
+            raise ValueError("No embeddings provided for anomaly detection")
+        
+        model = self._new_model(contamination)
+        model.fit(reservoir[:filled])
+        self.model = model
+        
+        logger.info(f"Anomaly model fitted on a {filled}-sample reservoir of {seen} embeddings")
+        return seen
+    
+    def score(self, embeddings: List[List[float]]) -> Tuple[List[int], List[float]]:
+        # input: embeddings; scores with fitted model; output: labels and scores
+        if not self.is_fitted():
+            raise ValueError("Anomaly model not fitted")
+        
+        X = np.asarray(embeddings, dtype=np.float32)
+        if X.shape[0] == 0:
+            return [], []
+        
+        model = self.model
+        scores = model.score_samples(X)
+        predictions = np.where(scores - model.offset_ < 0, -1, 1)
+        return predictions.tolist(), scores.tolist()
+    
+    def is_fitted(self) -> bool:
+        # input: none; checks model state; output: fitted boolean
+        return self.model is not None
+    
+    def get_contamination(self) -> Optional[float]:
+        # input: none; reads the fitted model's contamination; output: rate or None when unfitted
+        model = self.model
+        return float(model.contamination) if model is not None else None
+    
+    def _new_model(self, contamination: float) -> IsolationForest:
+        # input: contamination; builds unfitted forest; output: isolation forest
+        return IsolationForest(
+            contamination=contamination,
+            random_state=42,
+            n_estimators=100,
+            n_jobs=self.n_jobs
+        )
+    
     def save_model(self, model_repo: IModelRepository) -> bool:
         # input: model repo; persists model; output: success status
         if self.model:
@@ -1,10 +1,14 @@
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Iterable, Dict, Any
+import copy
+import threading
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import PCA, IncrementalPCA
 from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
 import logging
 from src.application.services import IClusteringService
+from src.infrastructure.ml.k_selection import select_k
 from src.domain.entities import ClusterInfo
 from src.domain.repositories import IModelRepository
 
@@ -14,11 +18,26 @@ logger = logging.getLogger(__name__)
 class ClusteringService(IClusteringService):
     # performs clustering and dimensionality reduction
 
-    def __init__(self):
-        # input: none; initializes models; output: none
-        self.kmeans: Optional[KMeans] = None
-        self.pca: Optional[PCA] = None
-        self.tfidf: Optional[TfidfVectorizer] = None
+    def __init__(
+        self,
+        drift_threshold: float = 1.5,
+        batch_size: int = 1024,
+        max_vocabulary: int = 50000,
+        auto_k_workers: int = 4,
+        auto_k_sample_size: int = 2000,
+    ):
+        # input: drift ratio limit, minibatch size, tfidf vocabulary cap, k sweep params; initializes models; output: none
+        self.kmeans: Optional[MiniBatchKMeans] = None
+        self.pca: Optional[IncrementalPCA] = None
+        self.drift_threshold = drift_threshold
+        self.batch_size = batch_size
+        self.max_vocabulary = max_vocabulary
+        self.auto_k_workers = auto_k_workers
+        self.auto_k_sample_size = auto_k_sample_size
+        self.baseline_inertia: Optional[float] = None
+        self.drift_sum = 0.0
+        self.drift_count = 0
+        self._lock = threading.Lock()
 
     def fit_predict(
         self, embeddings: List[List[float]], texts: List[str], n_clusters: int
@@ -28,14 +47,133 @@ class ClusteringService(IClusteringService):
 
         X = np.array(embeddings)
 
-        self.kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        labels = self.kmeans.fit_predict(X)
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            random_state=42,
+            n_init=3,
+            batch_size=self.batch_size,
+        )
+        kmeans.fit(X)
+
+        # one distance pass yields both labels and centroid-nearest representatives
+        distances = kmeans.transform(X).astype(np.float32)
+        labels = distances.argmin(axis=1)
 
-        cluster_info = self._extract_cluster_info(labels, X, texts, n_clusters)
+        # the fitted model and its drift reference are published together;
+        # mean squared distance to the assigned centroid is that reference
+        with self._lock:
+            self.kmeans = kmeans
+            self.baseline_inertia = float(kmeans.inertia_) / max(len(X), 1)
+            self.drift_sum = 0.0
+            self.drift_count = 0
+
+        cluster_info = self._extract_cluster_info(
+            labels, X, texts, n_clusters, distances
+        )
 
         logger.info(f"Clustering completed: {n_clusters} clusters formed")
         return labels.tolist(), cluster_info
 
+    def select_k(
+        self,
+        embeddings: List[List[float]],
+        k_min: int,
+        k_max: int,
+        strata: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        # input: embeddings, k range, sampling strata; sweeps k in parallel; output: chosen k and score curve
+        if k_min > k_max:
+            raise ValueError(f"k_min ({k_min}) must not exceed k_max ({k_max})")
+
+        X = np.asarray(embeddings, dtype=np.float32)
+        k_max = min(k_max, X.shape[0] - 1)
+
+        if k_max < k_min:
+            raise ValueError(
+                f"Not enough chunks ({X.shape[0]}) to evaluate k in [{k_min}, {k_max}]"
+            )
+
+        chosen, elbow, scores = select_k(
+            X,
+            list(range(k_min, k_max + 1)),
+            strata=strata,
+            sample_size=self.auto_k_sample_size,
+            max_workers=self.auto_k_workers,
+            batch_size=self.batch_size,
+        )
+        return {"n_clusters": chosen, "elbow_k": elbow, "scores": scores}
+
+    def predict(
+        self, embeddings: List[List[float]], texts: List[str]
+    ) -> Tuple[List[int], List[ClusterInfo]]:
+        # input: embeddings, texts; assigns with fitted model; output: labels and cluster info
+        if not self.is_fitted():
+            raise ValueError("Clustering model not fitted")
+
+        X = np.array(embeddings)
+        kmeans = self.kmeans
+        distances = kmeans.transform(X).astype(np.float32)
+        labels = distances.argmin(axis=1)
+
+        n_clusters = kmeans.n_clusters
+        cluster_info = self._extract_cluster_info(
+            labels, X, texts, n_clusters, distances
+        )
+
+        logger.info(f"Assigned {len(X)} chunks to {n_clusters} existing clusters")
+        return labels.tolist(), cluster_info
+
+    def partial_fit(self, embeddings: List[List[float]]) -> List[int]:
+        # input: new embeddings; assigns and folds into online model; output: labels
+        if not self.is_fitted():
+            raise ValueError("Clustering model not fitted")
+
+        X = np.array(embeddings)
+        if X.shape[0] == 0:
+            return []
+
+        with self._lock:
+            centroid_distances = self.kmeans.transform(X)
+            labels = centroid_distances.argmin(axis=1)
+            distances = centroid_distances[np.arange(X.shape[0]), labels]
+
+            self.drift_sum += float(np.sum(distances**2))
+            self.drift_count += int(X.shape[0])
+
+            if hasattr(self.kmeans, "partial_fit"):
+                # update a copy: the live model may be shared with readers and the registry cache
+                kmeans = copy.deepcopy(self.kmeans)
+                kmeans.partial_fit(X)
+                self.kmeans = kmeans
+
+        logger.info(
+            f"Online clustering update: {X.shape[0]} chunks, drift={self.drift_ratio():.3f}"
+        )
+        return labels.tolist()
+
+    def is_fitted(self) -> bool:
+        # input: none; checks model state; output: fitted boolean
+        return self.kmeans is not None
+
+    def get_n_clusters(self) -> Optional[int]:
+        # input: none; reads the fitted model's k; output: cluster count or None
+        kmeans = self.kmeans
+        return int(kmeans.n_clusters) if kmeans is not None else None
+
+    def drift_ratio(self) -> float:
+        # input: none; compares online error to fit-time error; output: drift ratio
+        if not self.drift_count or not self.baseline_inertia:
+            return 0.0
+        return (self.drift_sum / self.drift_count) / self.baseline_inertia
+
+    def needs_refit(self, n_clusters: int) -> bool:
+        # input: requested k; checks model usability; output: refit boolean
+        if not self.is_fitted() or not hasattr(self.kmeans, "partial_fit"):
+            return True
+        if self.kmeans.n_clusters != n_clusters:
+            return True
+        return self.drift_ratio() > self.drift_threshold
+
     def reduce_dimensions(
         self, embeddings: List[List[float]], n_components: int = 2
     ) -> List[List[float]]:
@@ -44,74 +182,202 @@ class ClusteringService(IClusteringService):
 
         X = np.array(embeddings)
 
-        self.pca = PCA(n_components=n_components, random_state=42)
-        X_reduced = self.pca.fit_transform(X)
+        pca = PCA(n_components=n_components, random_state=42)
+        X_reduced = pca.fit_transform(X)
 
         logger.info(f"Dimension reduction completed: {X.shape} -> {X_reduced.shape}")
         return X_reduced.tolist()
 
+    def fit_projection(
+        self, embedding_batches: Iterable[List[List[float]]], n_components: int = 2
+    ) -> int:
+        # input: streamed embedding pages, n_dims; fits incremental pca; output: samples seen
+        ipca = IncrementalPCA(n_components=n_components)
+        pending = np.empty((0, 0))
+        n_seen = 0
+
+        for batch in embedding_batches:
+            X = np.asarray(batch, dtype=np.float32)
+            if X.shape[0] == 0:
+                continue
+            pending = X if pending.size == 0 else np.vstack([pending, X])
+            # each partial_fit call needs at least n_components rows
+            if pending.shape[0] >= n_components:
+                ipca.partial_fit(pending)
+                n_seen += pending.shape[0]
+                pending = np.empty((0, 0))
+
+        # a trailing remainder smaller than n_components cannot be fitted on its own
+        # and is too small to move the components, so it is skipped
+        if n_seen == 0:
+            raise ValueError("Not enough embeddings to fit the projection")
+
+        self.pca = ipca
+        logger.info(f"Projection fitted incrementally over {n_seen} embeddings")
+        return n_seen
+
+    def project(self, embeddings: List[List[float]]) -> List[List[float]]:
+        # input: embeddings; applies saved projection; output: reduced embeddings
+        if not self.has_projection():
+            raise ValueError("Projection model not fitted")
+        if len(embeddings) == 0:
+            return []
+        return self.pca.transform(np.asarray(embeddings, dtype=np.float32)).tolist()
+
+    def has_projection(self) -> bool:
+        # input: none; checks projection state; output: fitted boolean
+        return self.pca is not None
+
     def _extract_cluster_info(
         self,
         labels: np.ndarray,
         embeddings: np.ndarray,
         texts: List[str],
         n_clusters: int,
+        distances: np.ndarray,
+        n_representatives: int = 3,
     ) -> List[ClusterInfo]:
-        # input: labels, embeddings, texts; extracts info; output: cluster metadata
-        cluster_info = []
+        # input: labels, embeddings, texts, centroid distances; extracts info; output: cluster metadata
+        labels = np.asarray(labels)
+        n = labels.shape[0]
 
-        self.tfidf = TfidfVectorizer(max_features=10, stop_words="english")
+        indicator = sparse.csr_matrix(
+            (np.ones(n, dtype=np.float32), (labels, np.arange(n))),
+            shape=(n_clusters, n),
+        )
+        sizes = np.bincount(labels, minlength=n_clusters)
+        centroids = (indicator @ embeddings) / np.maximum(sizes, 1)[:, None]
 
-        for cluster_id in range(n_clusters):
-            mask = labels == cluster_id
-            cluster_texts = [texts[i] for i, m in enumerate(mask) if m]
-            cluster_embeddings = embeddings[mask]
+        top_terms = self._cluster_top_terms(indicator, texts, sizes)
+        representatives = self._nearest_to_centroids(
+            labels, distances, n_clusters, n_representatives
+        )
 
-            if len(cluster_texts) == 0:
+        cluster_info = []
+        for cluster_id in range(n_clusters):
+            if sizes[cluster_id] == 0:
                 continue
 
-            centroid = cluster_embeddings.mean(axis=0)
-
-            top_terms = []
-            if len(cluster_texts) > 1:
-                try:
-                    tfidf_matrix = self.tfidf.fit_transform(cluster_texts)
-                    feature_names = self.tfidf.get_feature_names_out()
-                    top_indices = tfidf_matrix.sum(axis=0).A1.argsort()[-5:][::-1]
-                    top_terms = [
-                        feature_names[i] for i in top_indices if i < len(feature_names)
-                    ]
-                except:
-                    top_terms = []
-
-            representative_chunks = cluster_texts[:3]
+            representative_chunks = [texts[i] for i in representatives[cluster_id]]
 
             info = ClusterInfo(
                 cluster_id=int(cluster_id),
-                size=int(mask.sum()),
-                centroid=centroid.tolist(),
-                top_terms=top_terms,
+                size=int(sizes[cluster_id]),
+                centroid=centroids[cluster_id].tolist(),
+                top_terms=top_terms[cluster_id],
                 representative_chunks=representative_chunks,
             )
             cluster_info.append(info)
 
         return cluster_info
 
-    def save_model(self, model_repo: IModelRepository) -> bool:
-        # input: model repo; persists models; output: success status
-        if self.kmeans:
-            model_repo.save_model(self.kmeans, "kmeans_clustering")
-        if self.pca:
-            model_repo.save_model(self.pca, "pca_reduction")
+    def _nearest_to_centroids(
+        self,
+        labels: np.ndarray,
+        distances: np.ndarray,
+        n_clusters: int,
+        n_representatives: int,
+    ) -> List[List[int]]:
+        # input: labels, point-centroid distances, k, count; selects closest members; output: indices per cluster
+        n = labels.shape[0]
+        if n == 0:
+            return [[] for _ in range(n_clusters)]
+
+        member_distances = np.where(
+            labels[:, None] == np.arange(n_clusters)[None, :], distances, np.inf
+        )
+
+        m = min(n_representatives, n)
+        if m < n:
+            candidates = np.argpartition(member_distances, m - 1, axis=0)[:m]
+        else:
+            candidates = np.tile(np.arange(n)[:, None], (1, n_clusters))
+
+        representatives = []
+        for cluster_id in range(n_clusters):
+            idx = candidates[:, cluster_id]
+            d = member_distances[idx, cluster_id]
+            keep = np.isfinite(d)
+            idx, d = idx[keep], d[keep]
+            representatives.append(idx[np.argsort(d)].tolist())
+
+        return representatives
+
+    def _cluster_top_terms(
+        self,
+        indicator: sparse.csr_matrix,
+        texts: List[str],
+        sizes: np.ndarray,
+        n_terms: int = 5,
+    ) -> List[List[str]]:
+        # input: label indicator, texts, cluster sizes; scores terms with corpus idf; output: top terms per cluster
+        n_clusters = indicator.shape[0]
+        top_terms: List[List[str]] = [[] for _ in range(n_clusters)]
+
+        # local vectorizer: concurrent fits must not share fitted vocabulary state
+        tfidf = TfidfVectorizer(max_features=self.max_vocabulary, stop_words="english")
+        try:
+            doc_term = tfidf.fit_transform(texts)
+        except ValueError:
+            logger.warning("No usable vocabulary for cluster top terms")
+            return top_terms
+
+        feature_names = tfidf.get_feature_names_out()
+        term_scores = (indicator @ doc_term).tocsr()
+
+        for cluster_id in range(n_clusters):
+            if sizes[cluster_id] < 2:
+                continue
+            row = term_scores.getrow(cluster_id)
+            if row.nnz == 0:
+                continue
+            k = min(n_terms, row.nnz)
+            best = np.argpartition(-row.data, k - 1)[:k]
+            best = best[np.argsort(-row.data[best])]
+            top_terms[cluster_id] = [feature_names[row.indices[i]] for i in best]
+
+        return top_terms
+
+    def save_model(self, model_repo: IModelRepository, checkpoint: bool = False) -> bool:
+        # input: model repo, checkpoint flag for incremental updates; persists models; output: success status
+        with self._lock:
+            kmeans, pca = self.kmeans, self.pca
+            drift_state = {
+                "baseline_inertia": self.baseline_inertia,
+                "drift_sum": self.drift_sum,
+                "drift_count": self.drift_count,
+            }
+
+        if kmeans:
+            # one artifact, so a rollback restores the centroids with their own drift baseline
+            model_repo.save_model(
+                {"kmeans": kmeans, "drift": drift_state},
+                "kmeans_clustering",
+                checkpoint=checkpoint,
+            )
+        # online updates leave the projection untouched
+        if pca and not checkpoint:
+            model_repo.save_model(pca, "pca_reduction")
         return True
 
     def load_model(self, model_repo: IModelRepository) -> bool:
         # input: model repo; loads models; output: success status
-        kmeans = model_repo.load_model("kmeans_clustering")
+        state = model_repo.load_model("kmeans_clustering")
         pca = model_repo.load_model("pca_reduction")
 
+        if isinstance(state, dict):
+            kmeans, drift_state = state["kmeans"], state["drift"]
+        else:
+            # versions written before the bundled format keep drift state separately
+            kmeans = state
+            drift_state = model_repo.load_model("kmeans_drift_state") or {}
+
         if kmeans:
-            self.kmeans = kmeans
+            with self._lock:
+                self.kmeans = kmeans
+                self.baseline_inertia = drift_state.get("baseline_inertia")
+                self.drift_sum = drift_state.get("drift_sum", 0.0)
+                self.drift_count = drift_state.get("drift_count", 0)
         if pca:
             self.pca = pca
 
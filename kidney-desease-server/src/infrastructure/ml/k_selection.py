@@ -0,0 +1,126 @@
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import tempfile
+from pathlib import Path
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score, pairwise_distances
+import logging
+
+logger = logging.getLogger(__name__)
+
+_snapshot: Optional[np.ndarray] = None
+_sample_index: Optional[np.ndarray] = None
+_sample_distances: Optional[np.ndarray] = None
+
+
+def _init_worker(snapshot_path: str, sample_path: str, distances_path: str):
+    # input: shared array paths; memory-maps the snapshot once per process; output: none
+    global _snapshot, _sample_index, _sample_distances
+    _snapshot = np.load(snapshot_path, mmap_mode="r")
+    _sample_index = np.load(sample_path)
+    _sample_distances = np.load(distances_path, mmap_mode="r")
+
+
+def _score_k(k: int, batch_size: int) -> Dict[str, float]:
+    # input: cluster count, minibatch size; fits and scores one k; output: score entry
+    model = MiniBatchKMeans(
+        n_clusters=k, random_state=42, n_init=3, batch_size=batch_size
+    )
+    model.fit(_snapshot)
+
+    sample_labels = model.predict(np.asarray(_snapshot[_sample_index]))
+    try:
+        silhouette = float(
+            silhouette_score(_sample_distances, sample_labels, metric="precomputed")
+        )
+    except ValueError:
+        silhouette = -1.0
+
+    return {"k": k, "silhouette": silhouette, "inertia": float(model.inertia_)}
+
+
+def stratified_sample(
+    n: int, sample_size: int, strata: Optional[List[str]] = None, seed: int = 42
+) -> np.ndarray:
+    # input: population size, sample size, stratum per row; draws proportional sample; output: row indices
+    rng = np.random.default_rng(seed)
+    if n <= sample_size:
+        return np.arange(n)
+    if not strata:
+        return np.sort(rng.choice(n, sample_size, replace=False))
+
+    _, stratum_ids = np.unique(np.asarray(strata), return_inverse=True)
+    order = np.argsort(stratum_ids, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(stratum_ids[order])) + 1)
+
+    quotas = np.array([len(g) for g in groups]) * sample_size / n
+    quotas = np.maximum(1, np.floor(quotas)).astype(int)
+
+    picked = [rng.choice(g, min(q, len(g)), replace=False) for g, q in zip(groups, quotas)]
+    picked = np.concatenate(picked)
+    if len(picked) > sample_size:
+        picked = rng.choice(picked, sample_size, replace=False)
+    return np.sort(picked)
+
+
+def elbow_k(scores: List[Dict[str, float]]) -> int:
+    # input: score curve; finds max distance from the endpoint chord; output: elbow k
+    ks = np.array([s["k"] for s in scores], dtype=np.float64)
+    inertia = np.array([s["inertia"] for s in scores], dtype=np.float64)
+    if len(ks) < 3:
+        return int(ks[0])
+
+    x = (ks - ks[0]) / max(ks[-1] - ks[0], 1e-12)
+    y = (inertia - inertia[-1]) / max(inertia[0] - inertia[-1], 1e-12)
+    # chord from (0, 1) to (1, 0) is x + y = 1; elbow sits furthest below it
+    return int(ks[np.argmax(1 - x - y)])
+
+
+def select_k(
+    embeddings: np.ndarray,
+    k_values: List[int],
+    strata: Optional[List[str]] = None,
+    sample_size: int = 2000,
+    max_workers: int = 4,
+    batch_size: int = 1024,
+    tolerance: float = 0.02,
+) -> Tuple[int, int, List[Dict[str, float]]]:
+    # input: embedding snapshot, candidate ks, strata, sweep params; scores ks in parallel; output: chosen k, elbow k, curve
+    if not k_values:
+        raise ValueError("No candidate k values to evaluate")
+    if min(k_values) < 2:
+        raise ValueError(f"k must be at least 2, got {min(k_values)}")
+
+    X = np.ascontiguousarray(embeddings, dtype=np.float32)
+    sample = stratified_sample(X.shape[0], sample_size, strata)
+    distances = pairwise_distances(X[sample]).astype(np.float32)
+
+    with tempfile.TemporaryDirectory(prefix="kselect_") as tmp:
+        snapshot_path = str(Path(tmp) / "snapshot.npy")
+        sample_path = str(Path(tmp) / "sample.npy")
+        distances_path = str(Path(tmp) / "distances.npy")
+        np.save(snapshot_path, X)
+        np.save(sample_path, sample)
+        np.save(distances_path, distances)
+
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(k_values)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(snapshot_path, sample_path, distances_path),
+        ) as pool:
+            scores = list(pool.map(_score_k, k_values, [batch_size] * len(k_values)))
+
+    scores.sort(key=lambda s: s["k"])
+    elbow = elbow_k(scores)
+
+    best = max(s["silhouette"] for s in scores)
+    candidates = [s["k"] for s in scores if s["silhouette"] >= best - tolerance]
+    chosen = min(candidates, key=lambda k: (abs(k - elbow), k))
+
+    logger.info(
+        f"Auto k selection over {k_values[0]}..{k_values[-1]}: chosen={chosen}, elbow={elbow}"
+    )
+    return chosen, elbow, scores
@@ -0,0 +1,299 @@
+from typing import List, Tuple, Dict, Optional
+import threading
+import numpy as np
+import logging
+from src.application.services import IKnnGraphService
+from src.domain.repositories import IModelRepository
+
+logger = logging.getLogger(__name__)
+
+
+class KnnGraphService(IKnnGraphService):
+    # maintains a k-nearest-neighbour graph over normalized chunk embeddings
+
+    def __init__(
+        self, k: int = 10, block_size: int = 1024, max_block_elements: int = 1 << 25
+    ):
+        # input: neighbours per node, rows per block, similarity block budget; initializes graph; output: none
+        self.k = k
+        self.block_size = block_size
+        self.max_block_elements = max_block_elements
+        self.chunk_ids: List[str] = []
+        self.document_ids: List[str] = []
+        self.id_to_index: Dict[str, int] = {}
+        self.doc_to_indices: Dict[str, List[int]] = {}
+        self.embeddings: Optional[np.ndarray] = None
+        self.neighbors: Optional[np.ndarray] = None
+        self.similarities: Optional[np.ndarray] = None
+        self.active: Optional[np.ndarray] = None
+        self._unsaved = 0
+        self._lock = threading.RLock()
+
+    def build(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        embeddings: List[List[float]],
+    ) -> int:
+        # input: ids, doc ids, embeddings; builds graph in blocks; output: node count
+        X = self._normalize(embeddings)
+        n = X.shape[0]
+
+        neighbors = np.full((n, self.k), -1, dtype=np.int32)
+        similarities = np.full((n, self.k), -np.inf, dtype=np.float16)
+
+        rows = self._rows_per_block(n)
+        for start in range(0, n, rows):
+            end = min(start + rows, n)
+            block_sims = X[start:end] @ X.T
+            block_sims[np.arange(end - start), np.arange(start, end)] = -np.inf
+            idx, sims = self._top_k(block_sims, np.arange(n, dtype=np.int32))
+            neighbors[start:end, : idx.shape[1]] = idx
+            similarities[start:end, : sims.shape[1]] = sims
+
+        with self._lock:
+            self.chunk_ids = list(chunk_ids)
+            self.document_ids = list(document_ids)
+            self.embeddings = X.astype(np.float16)
+            self.neighbors = neighbors
+            self.similarities = similarities
+            self.active = np.ones(n, dtype=bool)
+            self._unsaved = n
+            self._reindex()
+
+        logger.info(f"kNN graph built: {n} nodes, k={self.k}")
+        return n
+
+    def add(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        embeddings: List[List[float]],
+    ) -> int:
+        # input: new ids, doc ids, embeddings; folds nodes into graph; output: added count
+        if not chunk_ids:
+            return 0
+
+        with self._lock:
+            if not self.is_built():
+                return self.build(chunk_ids, document_ids, embeddings)
+
+            Y = self._normalize(embeddings)
+            n_old = self.embeddings.shape[0]
+            m = Y.shape[0]
+            all_indices = np.arange(n_old + m, dtype=np.int32)
+
+            new_neighbors = np.full((m, self.k), -1, dtype=np.int32)
+            new_similarities = np.full((m, self.k), -np.inf, dtype=np.float16)
+            inactive = ~np.concatenate([self.active, np.ones(m, dtype=bool)])
+
+            # widen the stored half-precision rows once rather than per block
+            existing = self.embeddings.astype(np.float32)
+            rows = self._rows_per_block(n_old + m)
+            for start in range(0, m, rows):
+                end = min(start + rows, m)
+                block_sims = np.hstack(
+                    [
+                        Y[start:end] @ existing.T,
+                        Y[start:end] @ Y.T,
+                    ]
+                )
+                block_sims[np.arange(end - start), n_old + np.arange(start, end)] = (
+                    -np.inf
+                )
+                block_sims[:, inactive] = -np.inf
+                idx, sims = self._top_k(block_sims, all_indices)
+                new_neighbors[start:end, : idx.shape[1]] = idx
+                new_similarities[start:end, : sims.shape[1]] = sims
+            del existing
+
+            # existing nodes may gain one of the new chunks as a closer neighbour; rows are
+            # rewritten in the stacked copies since loaded arrays may be read-only maps
+            neighbors = np.vstack([self.neighbors, new_neighbors])
+            similarities = np.vstack([self.similarities, new_similarities])
+            new_indices = np.arange(n_old, n_old + m, dtype=np.int32)
+            rows = self._rows_per_block(self.k + m)
+            for start in range(0, n_old, rows):
+                end = min(start + rows, n_old)
+                cross_sims = self.embeddings[start:end].astype(np.float32) @ Y.T
+                merged_sims = np.hstack(
+                    [similarities[start:end].astype(np.float32), cross_sims]
+                )
+                merged_idx = np.hstack(
+                    [
+                        neighbors[start:end],
+                        np.broadcast_to(new_indices, (end - start, m)),
+                    ]
+                )
+                order = np.argpartition(-merged_sims, self.k - 1, axis=1)[:, : self.k]
+                top_sims = np.take_along_axis(merged_sims, order, axis=1)
+                top_idx = np.take_along_axis(merged_idx, order, axis=1)
+                ranked = np.argsort(-top_sims, axis=1)
+                neighbors[start:end] = np.take_along_axis(top_idx, ranked, axis=1)
+                similarities[start:end] = np.take_along_axis(
+                    top_sims, ranked, axis=1
+                )
+
+            self.chunk_ids.extend(chunk_ids)
+            self.document_ids.extend(document_ids)
+            self.embeddings = np.vstack([self.embeddings, Y.astype(np.float16)])
+            self.neighbors = neighbors
+            self.similarities = similarities
+            self.active = np.concatenate([self.active, np.ones(m, dtype=bool)])
+            self._unsaved += m
+            self._reindex()
+
+        logger.info(f"kNN graph updated: {m} nodes added")
+        return m
+
+    def remove_document(self, document_id: str) -> int:
+        # input: document id; deactivates its nodes until next rebuild; output: removed count
+        with self._lock:
+            indices = self.doc_to_indices.pop(document_id, [])
+            if indices:
+                self.active[indices] = False
+                self._unsaved += len(indices)
+                for i in indices:
+                    self.id_to_index.pop(self.chunk_ids[i], None)
+
+        logger.info(f"kNN graph: deactivated {len(indices)} nodes of {document_id}")
+        return len(indices)
+
+    def related_chunks(self, chunk_id: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        # input: chunk id, k; reads neighbour row; output: (chunk id, similarity) pairs
+        with self._lock:
+            row = self.id_to_index.get(chunk_id)
+            if row is None:
+                raise LookupError(f"Chunk {chunk_id} not found in kNN graph")
+
+            related = []
+            for idx, sim in zip(self.neighbors[row], self.similarities[row]):
+                if idx < 0 or not self.active[idx]:
+                    continue
+                related.append((self.chunk_ids[idx], float(sim)))
+                if len(related) >= top_k:
+                    break
+
+        return related
+
+    def related_documents(
+        self, document_id: str, top_k: int = 10
+    ) -> List[Tuple[str, float]]:
+        # input: document id, k; aggregates chunk neighbours by document; output: (doc id, score) pairs
+        with self._lock:
+            rows = self.doc_to_indices.get(document_id)
+            if not rows:
+                raise LookupError(f"Document {document_id} not found in kNN graph")
+
+            scores: Dict[str, float] = {}
+            for row in rows:
+                for idx, sim in zip(self.neighbors[row], self.similarities[row]):
+                    if idx < 0 or not self.active[idx]:
+                        continue
+                    other = self.document_ids[idx]
+                    if other == document_id:
+                        continue
+                    scores[other] = max(scores.get(other, -1.0), float(sim))
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    def is_built(self) -> bool:
+        # input: none; checks graph state; output: built boolean
+        return self.neighbors is not None
+
+    def unsaved_changes(self) -> int:
+        # input: none; counts nodes added or removed since the last save or load; output: change count
+        return self._unsaved
+
+    def save_model(self, model_repo: IModelRepository, checkpoint: bool = False) -> bool:
+        # input: model repo, checkpoint flag for incremental updates; persists compact graph arrays; output: success status
+        with self._lock:
+            if not self.is_built():
+                return False
+            keep = self.active
+            remap = np.full(len(self.active), -1, dtype=np.int32)
+            remap[keep] = np.arange(int(keep.sum()), dtype=np.int32)
+            neighbors = self.neighbors[keep]
+            neighbors = np.where(neighbors >= 0, remap[neighbors], -1)
+            similarities = np.where(
+                neighbors >= 0, self.similarities[keep], -np.inf
+            ).astype(np.float16)
+            state = {
+                "k": self.k,
+                "chunk_ids": [c for c, a in zip(self.chunk_ids, keep) if a],
+                "document_ids": [d for d, a in zip(self.document_ids, keep) if a],
+                "embeddings": self.embeddings[keep],
+                "neighbors": neighbors.astype(np.int32),
+                "similarities": similarities,
+            }
+            saved_changes = self._unsaved
+
+        if not model_repo.save_model(state, "knn_graph", checkpoint=checkpoint):
+            return False
+        with self._lock:
+            # changes made while the snapshot was written stay pending
+            self._unsaved = max(0, self._unsaved - saved_changes)
+        return True
+
+    def load_model(self, model_repo: IModelRepository) -> bool:
+        # input: model repo; loads graph arrays; output: success status
+        state = model_repo.load_model("knn_graph")
+        if not state:
+            return False
+
+        with self._lock:
+            self.k = state["k"]
+            self.chunk_ids = list(state["chunk_ids"])
+            self.document_ids = list(state["document_ids"])
+            self.embeddings = state["embeddings"]
+            self.neighbors = state["neighbors"]
+            self.similarities = state["similarities"]
+            self.active = np.ones(len(self.chunk_ids), dtype=bool)
+            self._unsaved = 0
+            self._reindex()
+        return True
+
+    def _top_k(
+        self, block_sims: np.ndarray, candidates: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # input: similarity block, candidate indices; selects best k per row; output: indices and sims
+        k = min(self.k, block_sims.shape[1])
+        if k == 0:
+            return (
+                np.empty((block_sims.shape[0], 0), dtype=np.int32),
+                np.empty((block_sims.shape[0], 0), dtype=np.float16),
+            )
+
+        part = np.argpartition(-block_sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(block_sims, part, axis=1)
+        ranked = np.argsort(-top_sims, axis=1)
+        part = np.take_along_axis(part, ranked, axis=1)
+        top_sims = np.take_along_axis(top_sims, ranked, axis=1)
+
+        idx = candidates[part].astype(np.int32)
+        idx[np.isneginf(top_sims)] = -1
+        return idx, top_sims.astype(np.float16)
+
+    def _rows_per_block(self, n_cols: int) -> int:
+        # input: similarity columns; bounds block memory; output: rows per block
+        return max(1, min(self.block_size, self.max_block_elements // max(n_cols, 1)))
+
+    def _normalize(self, embeddings: List[List[float]]) -> np.ndarray:
+        # input: embeddings; l2-normalizes rows; output: float32 matrix
+        X = np.asarray(embeddings, dtype=np.float32)
+        if X.ndim != 2:
+            X = X.reshape(len(embeddings), -1)
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return X / norms
+
+    def _reindex(self):
+        # input: none; rebuilds id and document lookups; output: none
+        self.id_to_index = {}
+        self.doc_to_indices = {}
+        for i, (chunk_id, doc_id) in enumerate(zip(self.chunk_ids, self.document_ids)):
+            if not self.active[i]:
+                continue
+            self.id_to_index[chunk_id] = i
+            self.doc_to_indices.setdefault(doc_id, []).append(i)
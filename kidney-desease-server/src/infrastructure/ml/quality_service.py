@@ -1,6 +1,10 @@
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Any
+from datetime import datetime
+import copy
+import threading
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import logging
@@ -11,12 +15,49 @@ from src.domain.repositories import IModelRepository
 logger = logging.getLogger(__name__)
 
 
-class QualityClassificationService(IQualityClassificationService):
-    # classifies document quality using random forest
+class OnlineBlendClassifier:
+    # batch-trained forest blended with the online learner that has seen newer labels
+
+    def __init__(
+        self,
+        forest: RandomForestClassifier,
+        online: SGDClassifier,
+        online_weight: float,
+        n_classes: int,
+    ):
+        # input: fitted forest, fitted online learner, online share, class count; initializes; output: none
+        self.forest = forest
+        self.online = online
+        self.online_weight = online_weight
+        self.n_classes = n_classes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        # input: embedding matrix; averages both models over the full class set; output: class probabilities
+        forest_proba = np.zeros((X.shape[0], self.n_classes))
+        forest_proba[:, self.forest.classes_] = self.forest.predict_proba(X)
+        online_proba = np.zeros((X.shape[0], self.n_classes))
+        online_proba[:, self.online.classes_] = self.online.predict_proba(X)
+        return (
+            1 - self.online_weight
+        ) * forest_proba + self.online_weight * online_proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # input: embedding matrix; picks the most probable blended class; output: encoded labels
+        return self.predict_proba(X).argmax(axis=1)
+
 
-    def __init__(self):
-        # input: none; initializes model; output: none
-        self.model: Optional[RandomForestClassifier] = None
+class QualityClassificationService(IQualityClassificationService):
+    # classifies document quality using random forest blended with an online linear learner between retrains
+
+    def __init__(self, online_weight: float = 0.5):
+        # input: share of the online learner in blended predictions; initializes model; output: none
+        self.model: Optional[Any] = None
+        self.online: Optional[SGDClassifier] = None
+        self.online_weight = online_weight
+        self.version: Optional[str] = None
+        self.metrics: Dict[str, float] = {}
+        self.classes = np.arange(4)
+        self._update_lock = threading.Lock()
         self.label_mapping = {
             "high": QualityLabel.HIGH,
             "medium": QualityLabel.MEDIUM,
@@ -40,13 +81,19 @@ class QualityClassificationService(IQualityClassificationService):
             X, y, test_size=0.2, random_state=42, stratify=y
         )
 
-        self.model = RandomForestClassifier(
+        model = RandomForestClassifier(
             n_estimators=100, random_state=42, max_depth=10, min_samples_split=5
         )
+        model.fit(X_train, y_train)
 
-        self.model.fit(X_train, y_train)
+        # the online learner restarts from the full label set so later batches extend it
+        online = self._new_online()
+        online.partial_fit(X, y, classes=self.classes)
 
-        y_pred = self.model.predict(X_test)
+        with self._update_lock:
+            self._publish(model, online)
+
+        y_pred = model.predict(X_test)
 
         accuracy = accuracy_score(y_test, y_pred)
         precision, recall, f1, _ = precision_recall_fscore_support(
@@ -61,9 +108,46 @@ class QualityClassificationService(IQualityClassificationService):
             "n_samples": len(embeddings),
         }
 
+        self.metrics = metrics
         logger.info(f"Training completed: accuracy={accuracy:.3f}, f1={f1:.3f}")
         return metrics
 
+    def partial_fit(
+        self, embeddings: List[List[float]], labels: List[str]
+    ) -> Dict[str, float]:
+        # input: embeddings, labels; folds a label batch into the online learner and republishes the blend; output: batch metrics
+        X = np.array(embeddings)
+        y = np.array([self._encode_label(label) for label in labels])
+
+        with self._update_lock:
+            online = (
+                copy.deepcopy(self.online) if self.online is not None else self._new_online()
+            )
+
+            metrics = {"n_samples": len(embeddings)}
+            if self.online is not None:
+                # progressive validation: score the batch before learning from it
+                metrics["accuracy"] = float(accuracy_score(y, online.predict(X)))
+
+            online.partial_fit(X, y, classes=self.classes)
+
+            forest = self.model
+            if isinstance(forest, OnlineBlendClassifier):
+                forest = forest.forest
+            if isinstance(forest, RandomForestClassifier):
+                model = OnlineBlendClassifier(
+                    forest, online, self.online_weight, len(self.classes)
+                )
+            else:
+                # nothing batch-trained yet: the online learner serves alone
+                model = online
+            # later batches update a copy, so the published learner is never mutated
+            self._publish(model, online)
+            self.metrics = metrics
+
+        logger.info(f"Online quality update with {len(embeddings)} samples")
+        return metrics
+
     def predict(
         self, embeddings: List[List[float]]
     ) -> Tuple[List[QualityLabel], List[float]]:
@@ -72,9 +156,10 @@ class QualityClassificationService(IQualityClassificationService):
             raise ValueError("Model not trained. Call train() first.")
 
         X = np.array(embeddings)
+        model = self.model
 
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
+        predictions = model.predict(X)
+        probabilities = model.predict_proba(X)
 
         confidences = probabilities.max(axis=1)
 
@@ -87,19 +172,47 @@ class QualityClassificationService(IQualityClassificationService):
         # input: none; checks if trained; output: trained boolean
         return self.model is not None
 
-    def save_model(self, model_repo: IModelRepository) -> bool:
-        # input: model repo; persists model; output: success status
-        if self.model:
-            return model_repo.save_model(self.model, "quality_classifier")
+    def get_version(self) -> Optional[str]:
+        # input: none; reads current model version; output: version string or None
+        return self.version
+
+    def save_model(self, model_repo: IModelRepository, checkpoint: bool = False) -> bool:
+        # input: model repo, checkpoint flag for online updates; publishes predictor, online learner and version together; output: success status
+        model, online, version = self.model, self.online, self.version
+        if model is not None:
+            state = {"model": model, "online": online, "version": version}
+            return model_repo.save_model(
+                state, "quality_classifier", self.metrics, checkpoint=checkpoint
+            )
         return False
 
     def load_model(self, model_repo: IModelRepository) -> bool:
         # input: model repo; loads model; output: success status
-        model = model_repo.load_model("quality_classifier")
-        if model:
-            self.model = model
-            return True
-        return False
+        state = model_repo.load_model("quality_classifier")
+        if state is None:
+            return False
+
+        if not isinstance(state, dict):
+            # files written before the bundled format hold the bare forest
+            meta = model_repo.load_model("quality_classifier_meta") or {}
+            state = {"model": state, "online": None, "version": meta.get("version")}
+
+        with self._update_lock:
+            self.online = state["online"]
+            self.model = state["model"]
+            self.version = state["version"] or "unversioned"
+        return True
+
+    def _publish(self, model: Any, online: SGDClassifier):
+        # input: fitted predictor, online learner; swaps the live model; output: none
+        self.online = online
+        # model before version: a reader that sees the old version relabels later rather than mislabels
+        self.model = model
+        self.version = datetime.now().strftime("%Y%m%d%H%M%S%f")
+
+    def _new_online(self) -> SGDClassifier:
+        # input: none; creates the incremental learner; output: unfitted classifier
+        return SGDClassifier(loss="log_loss", alpha=1e-4, random_state=42)
 
     def _encode_label(self, label: str) -> int:
         # input: label string; encodes label; output: integer label
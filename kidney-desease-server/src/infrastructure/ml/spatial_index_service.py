@@ -0,0 +1,241 @@
+from typing import List, Dict, Any, Optional, Tuple
+import threading
+import numpy as np
+import logging
+from src.application.services import ISpatialIndexService
+
+logger = logging.getLogger(__name__)
+
+
+class SpatialIndexService(ISpatialIndexService):
+    # multi-resolution sorted grid over 2d points for level-of-detail queries
+
+    def __init__(self, max_level: int = 10):
+        # input: finest zoom level; initializes empty index; output: none
+        self.max_level = max_level
+        self.generation: Optional[int] = None
+        self.bounds: Optional[Tuple[float, float, float, float]] = None
+        self.points: Dict[str, Any] = {}
+        self.levels: List[Dict[str, np.ndarray]] = []
+        self._lock = threading.Lock()
+
+    def build(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        texts: List[str],
+        coordinates: List[List[float]],
+        labels: List[int],
+        generation: int,
+    ) -> int:
+        # input: point attributes, index generation; sorts points into grid cells; output: point count
+        xy = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        n = xy.shape[0]
+
+        if n == 0:
+            bounds = (0.0, 1.0, 0.0, 1.0)
+        else:
+            bounds = (
+                float(xy[:, 0].min()),
+                float(xy[:, 0].max()),
+                float(xy[:, 1].min()),
+                float(xy[:, 1].max()),
+            )
+
+        cx, cy = self._cells(xy[:, 0], xy[:, 1], bounds, self.max_level)
+        width = 1 << self.max_level
+        keys = cy * width + cx
+        order = np.argsort(keys, kind="stable")
+
+        points = {
+            "keys": keys[order],
+            "x": xy[order, 0].astype(np.float32),
+            "y": xy[order, 1].astype(np.float32),
+            "labels": np.asarray(labels, dtype=np.int32).reshape(-1)[order],
+            "chunk_ids": [chunk_ids[i] for i in order],
+            "document_ids": [document_ids[i] for i in order],
+            "texts": [texts[i] for i in order],
+        }
+
+        levels = [
+            self._aggregate(points, cx[order], cy[order], level)
+            for level in range(self.max_level + 1)
+        ]
+
+        with self._lock:
+            self.bounds = bounds
+            self.points = points
+            self.levels = levels
+            self.generation = generation
+
+        logger.info(f"Spatial index built: {n} points, {self.max_level + 1} levels")
+        return n
+
+    def query(
+        self,
+        x_min: Optional[float],
+        x_max: Optional[float],
+        y_min: Optional[float],
+        y_max: Optional[float],
+        zoom: int,
+        max_points: int,
+    ) -> Dict[str, Any]:
+        # input: viewport, zoom, point and bin budget; reads overlapping cells; output: bins or points, with the zoom served
+        with self._lock:
+            bounds = self.bounds
+            points = self.points
+            levels = self.levels
+
+        if bounds is None:
+            raise ValueError("Spatial index not built")
+
+        x_min = bounds[0] if x_min is None else x_min
+        x_max = bounds[1] if x_max is None else x_max
+        y_min = bounds[2] if y_min is None else y_min
+        y_max = bounds[3] if y_max is None else y_max
+        zoom = max(0, min(zoom, self.max_level))
+
+        if x_min > x_max or y_min > y_max:
+            raise ValueError("Viewport minimum must not exceed its maximum")
+
+        result = {
+            "zoom": zoom,
+            "bounds": list(bounds),
+            "total_in_viewport": 0,
+            "mode": "points",
+            "bins": [],
+            "points": [],
+        }
+
+        outside = (
+            x_max < bounds[0] or x_min > bounds[1] or y_max < bounds[2] or y_min > bounds[3]
+        )
+        if outside:
+            return result
+
+        level = levels[zoom]
+        bin_rows = self._viewport_rows(
+            level["keys"], (x_min, x_max, y_min, y_max), bounds, zoom
+        )
+        total = int(sum(level["counts"][lo:hi].sum() for lo, hi in bin_rows))
+        result["total_in_viewport"] = total
+
+        if total > max_points:
+            # dense viewports can hold more cells than the budget, so coarsen until they fit
+            viewport = (x_min, x_max, y_min, y_max)
+            while zoom > 0 and sum(hi - lo for lo, hi in bin_rows) > max_points:
+                zoom -= 1
+                level = levels[zoom]
+                bin_rows = self._viewport_rows(level["keys"], viewport, bounds, zoom)
+
+            result["zoom"] = zoom
+            result["mode"] = "bins"
+            for lo, hi in bin_rows:
+                for i in range(lo, hi):
+                    result["bins"].append(
+                        {
+                            "x": float(level["x"][i]),
+                            "y": float(level["y"][i]),
+                            "count": int(level["counts"][i]),
+                            "label": int(level["labels"][i]),
+                        }
+                    )
+            return result
+
+        point_rows = self._viewport_rows(
+            points["keys"], (x_min, x_max, y_min, y_max), bounds, self.max_level
+        )
+        for lo, hi in point_rows:
+            for i in range(lo, hi):
+                x, y = float(points["x"][i]), float(points["y"][i])
+                if not (x_min <= x <= x_max and y_min <= y <= y_max):
+                    continue
+                result["points"].append(
+                    {
+                        "chunk_id": points["chunk_ids"][i],
+                        "document_id": points["document_ids"][i],
+                        "x": x,
+                        "y": y,
+                        "label": int(points["labels"][i]),
+                        "text": points["texts"][i],
+                    }
+                )
+
+        result["total_in_viewport"] = len(result["points"])
+        return result
+
+    def _aggregate(
+        self, points: Dict[str, Any], cx: np.ndarray, cy: np.ndarray, level: int
+    ) -> Dict[str, np.ndarray]:
+        # input: sorted points, finest cells, level; aggregates into coarse cells; output: bin arrays
+        if len(cx) == 0:
+            return {
+                "keys": np.empty(0, dtype=np.int64),
+                "counts": np.empty(0, dtype=np.int64),
+                "x": np.empty(0, dtype=np.float32),
+                "y": np.empty(0, dtype=np.float32),
+                "labels": np.empty(0, dtype=np.int32),
+            }
+
+        shift = self.max_level - level
+        keys = (cy >> shift) * (1 << level) + (cx >> shift)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+
+        unique_keys, starts, counts = np.unique(
+            keys, return_index=True, return_counts=True
+        )
+        sum_x = np.add.reduceat(points["x"][order].astype(np.float64), starts)
+        sum_y = np.add.reduceat(points["y"][order].astype(np.float64), starts)
+
+        # dominant label per cell from the (cell, label) pair counts
+        pairs = np.stack([keys, points["labels"][order].astype(np.int64)], axis=1)
+        pair_keys, pair_counts = np.unique(pairs, axis=0, return_counts=True)
+        best = np.lexsort((-pair_counts, pair_keys[:, 0]))
+        pair_keys = pair_keys[best]
+        first = np.unique(pair_keys[:, 0], return_index=True)[1]
+
+        return {
+            "keys": unique_keys,
+            "counts": counts.astype(np.int64),
+            "x": (sum_x / np.maximum(counts, 1)).astype(np.float32),
+            "y": (sum_y / np.maximum(counts, 1)).astype(np.float32),
+            "labels": pair_keys[first, 1].astype(np.int32),
+        }
+
+    def _viewport_rows(
+        self,
+        keys: np.ndarray,
+        viewport: Tuple[float, float, float, float],
+        bounds: Tuple[float, float, float, float],
+        level: int,
+    ) -> List[Tuple[int, int]]:
+        # input: row-major cell keys, viewport, bounds, level; binary searches each row; output: index ranges
+        width = 1 << level
+        x_min, x_max, y_min, y_max = viewport
+        cx0, cy0 = self._cells(np.array([x_min]), np.array([y_min]), bounds, level)
+        cx1, cy1 = self._cells(np.array([x_max]), np.array([y_max]), bounds, level)
+        cx0, cx1 = int(cx0[0]), int(cx1[0])
+
+        ranges = []
+        for row in range(int(cy0[0]), int(cy1[0]) + 1):
+            lo = int(np.searchsorted(keys, row * width + cx0, side="left"))
+            hi = int(np.searchsorted(keys, row * width + cx1, side="right"))
+            if hi > lo:
+                ranges.append((lo, hi))
+        return ranges
+
+    def _cells(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        bounds: Tuple[float, float, float, float],
+        level: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # input: coordinates, bounds, level; maps to clipped grid cells; output: cell columns and rows
+        width = 1 << level
+        span_x = max(bounds[1] - bounds[0], 1e-12)
+        span_y = max(bounds[3] - bounds[2], 1e-12)
+        cx = np.floor((x - bounds[0]) / span_x * width).astype(np.int64)
+        cy = np.floor((y - bounds[2]) / span_y * width).astype(np.int64)
+        return np.clip(cx, 0, width - 1), np.clip(cy, 0, width - 1)
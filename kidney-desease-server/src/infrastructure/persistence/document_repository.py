@@ -1,13 +1,109 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Callable
+from datetime import datetime
+import base64
+import gzip
+import hashlib
 import json
+import os
+import threading
 import logging
 from pathlib import Path
-from src.domain.entities import Document
+from src.domain.entities import Document, DocumentType, ProcessingStatus
 from src.domain.repositories import IDocumentRepository
 
 logger = logging.getLogger(__name__)
 
 
+def hash_content(content: str) -> str:
+    # input: document text; hashes it for duplicate lookup; output: sha256 hex digest
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def compress_content(content: str) -> bytes:
+    # input: document text; gzips it for storage; output: compressed bytes
+    return gzip.compress(content.encode("utf-8"), compresslevel=6)
+
+
+def decompress_content(data: Optional[bytes]) -> str:
+    # input: stored blob or None; inflates it; output: document text
+    return gzip.decompress(data).decode("utf-8") if data else ""
+
+
+class LazyDocument(Document):
+    # document whose content is read from its blob on first access
+
+    def __init__(self, content_loader: Callable[[], str], **fields):
+        # input: content reader, remaining document fields; defers content; output: none
+        self._content_loader = content_loader
+        self._content: Optional[str] = None
+        super().__init__(content=None, **fields)
+
+    @property
+    def content(self) -> str:
+        # input: none; loads content once; output: document text
+        if self._content is None:
+            self._content = self._content_loader()
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[str]):
+        # input: text or None; replaces loaded content; output: none
+        self._content = value
+
+
+def to_naive(value: Optional[datetime]) -> Optional[datetime]:
+    # input: optional datetime; converts aware values to local naive time like stored ones; output: naive datetime or None
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def encode_cursor(created_at: datetime, doc_id: str) -> str:
+    # input: last row sort key; packs it into an opaque token; output: cursor string
+    raw = f"{created_at.isoformat(timespec='microseconds')}|{doc_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    # input: cursor string; unpacks the sort key it points past; output: created_at and document id
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, doc_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), doc_id
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def page_documents(
+    documents: Iterable[Document],
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[ProcessingStatus] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Tuple[List[Document], Optional[str]]:
+    # input: candidate documents, page size, cursor and filters; pages by scanning; output: documents and next cursor
+    after = decode_cursor(cursor) if cursor else None
+    created_after = to_naive(created_after)
+    created_before = to_naive(created_before)
+
+    matched = [
+        doc
+        for doc in documents
+        if (status is None or doc.status == status)
+        and (created_after is None or doc.created_at >= created_after)
+        and (created_before is None or doc.created_at < created_before)
+        and (after is None or (doc.created_at, doc.id) < after)
+    ]
+    matched.sort(key=lambda doc: (doc.created_at, doc.id), reverse=True)
+
+    page = matched[:limit]
+    next_cursor = None
+    if len(matched) > limit:
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+    return page, next_cursor
+
+
 class InMemoryDocumentRepository(IDocumentRepository):
     # in-memory document storage implementation
 
@@ -30,6 +126,42 @@ class InMemoryDocumentRepository(IDocumentRepository):
         docs = list(self.documents.values())
         return docs[skip : skip + limit]
 
+    def list_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[ProcessingStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        # input: page size, cursor, filters; pages stored documents newest first; output: documents and next cursor
+        return page_documents(
+            list(self.documents.values()),
+            limit,
+            cursor,
+            status,
+            created_after,
+            created_before,
+        )
+
+    def get_by_content_hash(self, content_hash: str) -> Optional[Document]:
+        # input: content digest; scans stored documents; output: document or None
+        for doc in self.documents.values():
+            if hash_content(doc.content) == content_hash:
+                return doc
+        return None
+
+    def update_status(
+        self, doc_id: str, status: ProcessingStatus, metadata: Dict[str, Any]
+    ) -> bool:
+        # input: document id, status, metadata; updates them in place; output: found status
+        document = self.documents.get(doc_id)
+        if document is None:
+            return False
+        document.status = status
+        document.metadata = metadata
+        return True
+
     def delete(self, doc_id: str) -> bool:
         # input: document id; deletes document; output: success status
         if doc_id in self.documents:
@@ -38,6 +170,19 @@ class InMemoryDocumentRepository(IDocumentRepository):
             return True
         return False
 
+    def get_stats(self) -> Dict[str, Any]:
+        # input: none; counts stored documents; output: totals by status and chunk counts
+        status_counts: Dict[str, int] = {}
+        total_chunks = 0
+        for doc in self.documents.values():
+            status_counts[doc.status.value] = status_counts.get(doc.status.value, 0) + 1
+            total_chunks += int(doc.metadata.get("chunks_count", 0))
+        return {
+            "total_documents": len(self.documents),
+            "status_counts": status_counts,
+            "total_chunks": total_chunks,
+        }
+
 
 class FileDocumentRepository(IDocumentRepository):
     # file-based document storage implementation
@@ -46,52 +191,55 @@ class FileDocumentRepository(IDocumentRepository):
         # input: storage directory; initializes; output: none
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # doc id -> (status, chunk count), kept in step with every save and delete
+        self._index: Dict[str, Tuple[str, int]] = {}
+        self._status_counts: Dict[str, int] = {}
+        self._total_chunks = 0
+        self._load_index()
         logger.info(f"Document repository initialized at {self.storage_dir}")
 
     def save(self, document: Document) -> Document:
-        # input: document entity; saves to file; output: saved document
+        # input: document entity; writes metadata, and content only when it changed; output: saved document
         file_path = self.storage_dir / f"{document.id}.json"
+        digest = hash_content(document.content)
 
-        doc_dict = {
-            "id": document.id,
-            "filename": document.filename,
-            "doc_type": document.doc_type.value,
-            "content": document.content,
-            "created_at": document.created_at.isoformat(),
-            "status": document.status.value,
-            "metadata": document.metadata,
-        }
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(doc_dict, f, ensure_ascii=False, indent=2)
+        with self._lock:
+            stored = self._read_metadata(document.id)
+            if stored is None or stored.get("content_hash") != digest:
+                self._atomic_write(
+                    self._content_path(document.id),
+                    compress_content(document.content),
+                )
+            self._write_metadata(document, digest)
+            self._track(
+                document.id,
+                document.status.value,
+                int(document.metadata.get("chunks_count", 0)),
+            )
 
         logger.debug(f"Saved document {document.id} to {file_path}")
         return document
 
     def get_by_id(self, doc_id: str) -> Optional[Document]:
-        # input: document id; retrieves from file; output: document or None
-        file_path = self.storage_dir / f"{doc_id}.json"
-
-        if not file_path.exists():
-            return None
-
+        # input: document id; reads metadata, deferring content; output: document or None
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                doc_dict = json.load(f)
+            doc_dict = self._read_metadata(doc_id)
+            if doc_dict is None:
+                return None
 
-            from datetime import datetime
-            from src.domain.entities import DocumentType, ProcessingStatus
-
-            document = Document(
+            fields = dict(
                 id=doc_dict["id"],
                 filename=doc_dict["filename"],
                 doc_type=DocumentType(doc_dict["doc_type"]),
-                content=doc_dict["content"],
                 created_at=datetime.fromisoformat(doc_dict["created_at"]),
                 status=ProcessingStatus(doc_dict["status"]),
                 metadata=doc_dict["metadata"],
             )
-            return document
+            # files written before the content split still embed the text
+            if "content" in doc_dict:
+                return Document(content=doc_dict["content"], **fields)
+            return LazyDocument(lambda: self._read_content(doc_id), **fields)
 
         except Exception as e:
             logger.error(f"Error loading document {doc_id}: {str(e)}")
@@ -109,12 +257,147 @@ class FileDocumentRepository(IDocumentRepository):
 
         return documents[skip : skip + limit]
 
+    def list_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[ProcessingStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        # input: page size, cursor, filters; pages by reading every file; output: documents and next cursor
+        return page_documents(
+            self.iter_documents(),
+            limit,
+            cursor,
+            status,
+            created_after,
+            created_before,
+        )
+
+    def get_by_content_hash(self, content_hash: str) -> Optional[Document]:
+        # input: content digest; scans stored metadata hashes; output: document or None
+        for file_path in sorted(self.storage_dir.glob("*.json")):
+            doc_dict = self._read_metadata(file_path.stem) or {}
+            digest = doc_dict.get("content_hash")
+            if digest is None and "content" in doc_dict:
+                digest = hash_content(doc_dict["content"])
+            if digest == content_hash:
+                return self.get_by_id(file_path.stem)
+        return None
+
+    def update_status(
+        self, doc_id: str, status: ProcessingStatus, metadata: Dict[str, Any]
+    ) -> bool:
+        # input: document id, status, metadata; rewrites only the metadata file; output: found status
+        with self._lock:
+            doc_dict = self._read_metadata(doc_id)
+            if doc_dict is None:
+                return False
+            doc_dict["status"] = status.value
+            doc_dict["metadata"] = metadata
+            self._atomic_write(
+                self.storage_dir / f"{doc_id}.json",
+                json.dumps(doc_dict, ensure_ascii=False).encode("utf-8"),
+            )
+            self._track(doc_id, status.value, int(metadata.get("chunks_count", 0)))
+        return True
+
     def delete(self, doc_id: str) -> bool:
-        # input: document id; deletes file; output: success status
+        # input: document id; deletes metadata and content files; output: success status
         file_path = self.storage_dir / f"{doc_id}.json"
 
-        if file_path.exists():
+        with self._lock:
+            if not file_path.exists():
+                return False
             file_path.unlink()
-            logger.info(f"Deleted document {doc_id}")
-            return True
-        return False
+            self._content_path(doc_id).unlink(missing_ok=True)
+            self._untrack(doc_id)
+
+        logger.info(f"Deleted document {doc_id}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        # input: none; reads maintained counters; output: totals by status and chunk counts
+        with self._lock:
+            return {
+                "total_documents": len(self._index),
+                "status_counts": dict(self._status_counts),
+                "total_chunks": self._total_chunks,
+            }
+
+    def _content_path(self, doc_id: str) -> Path:
+        # input: document id; locates its compressed content; output: blob path
+        return self.storage_dir / f"{doc_id}.content.gz"
+
+    def _read_metadata(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        # input: document id; parses its metadata file; output: metadata dict or None
+        file_path = self.storage_dir / f"{doc_id}.json"
+        if not file_path.exists():
+            return None
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_content(self, doc_id: str) -> str:
+        # input: document id; inflates its content blob; output: document text
+        file_path = self._content_path(doc_id)
+        if not file_path.exists():
+            return ""
+        return decompress_content(file_path.read_bytes())
+
+    def _write_metadata(self, document: Document, digest: str):
+        # input: document entity, content digest; writes compact metadata; output: none
+        doc_dict = {
+            "id": document.id,
+            "filename": document.filename,
+            "doc_type": document.doc_type.value,
+            "content_hash": digest,
+            "created_at": document.created_at.isoformat(),
+            "status": document.status.value,
+            "metadata": document.metadata,
+        }
+        self._atomic_write(
+            self.storage_dir / f"{document.id}.json",
+            json.dumps(doc_dict, ensure_ascii=False).encode("utf-8"),
+        )
+
+    def _atomic_write(self, path: Path, data: bytes):
+        # input: target path, bytes; writes a temp file then renames it; output: none
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def iter_documents(self) -> Iterable[Document]:
+        # input: none; parses every stored file; output: document iterator
+        for file_path in sorted(self.storage_dir.glob("*.json")):
+            document = self.get_by_id(file_path.stem)
+            if document:
+                yield document
+
+    def _load_index(self):
+        # input: none; builds counters with one scan at startup; output: none
+        for document in self.iter_documents():
+            self._track(
+                document.id,
+                document.status.value,
+                int(document.metadata.get("chunks_count", 0)),
+            )
+
+    def _track(self, doc_id: str, status: str, chunks_count: int):
+        # input: document id, status, chunk count; replaces its counter contribution; output: none
+        self._untrack(doc_id)
+        self._index[doc_id] = (status, chunks_count)
+        self._status_counts[status] = self._status_counts.get(status, 0) + 1
+        self._total_chunks += chunks_count
+
+    def _untrack(self, doc_id: str):
+        # input: document id; removes its counter contribution; output: none
+        previous = self._index.pop(doc_id, None)
+        if previous is None:
+            return
+        status, chunks_count = previous
+        self._status_counts[status] -= 1
+        if not self._status_counts[status]:
+            del self._status_counts[status]
+        self._total_chunks -= chunks_count
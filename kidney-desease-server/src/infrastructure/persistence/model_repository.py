@@ -1,4 +1,12 @@
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+import copy
+import fcntl
+import json
+import os
+import tempfile
+import threading
 import joblib
 import logging
 from pathlib import Path
@@ -8,37 +16,100 @@ logger = logging.getLogger(__name__)
 
 
 class FileModelRepository(IModelRepository):
-    # file-based ML model persistence implementation
+    # versioned file-based model registry with atomic publish and in-process cache
 
-    def __init__(self, storage_dir: str = "./data/models"):
-        # input: storage directory; initializes; output: none
+    def __init__(
+        self,
+        storage_dir: str = "./data/models",
+        max_versions: int = 5,
+        mmap_threshold: int = 16 * 1024 * 1024,
+    ):
+        # input: storage directory, versions kept per model, mmap file size floor; initializes; output: none
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.max_versions = max_versions
+        self.mmap_threshold = mmap_threshold
+        self._cache: Dict[Tuple[str, int], Any] = {}
+        self._manifests: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
         logger.info(f"Model repository initialized at {self.storage_dir}")
 
-    def save_model(self, model: Any, model_name: str) -> bool:
-        # input: model object, name; persists model; output: success status
+    def save_model(
+        self,
+        model: Any,
+        model_name: str,
+        metrics: Optional[Dict[str, float]] = None,
+        checkpoint: bool = False,
+    ) -> bool:
+        # input: model object, name, optional metrics, checkpoint flag; publishes a new version; output: success status
         try:
-            file_path = self.storage_dir / f"{model_name}.joblib"
-            joblib.dump(model, file_path)
-            logger.info(f"Saved model {model_name} to {file_path}")
+            model_dir = self.storage_dir / model_name
+            model_dir.mkdir(parents=True, exist_ok=True)
+
+            with self._model_lock(model_name):
+                manifest = self._read_manifest(model_name)
+                version = max([v["version"] for v in manifest["versions"]], default=0) + 1
+                file_name = f"v{version}.joblib"
+
+                self._atomic_write(
+                    model_dir / file_name, lambda f: joblib.dump(model, f)
+                )
+                size = (model_dir / file_name).stat().st_size
+
+                manifest["versions"].append(
+                    {
+                        "version": version,
+                        "file": file_name,
+                        "created_at": datetime.now().isoformat(),
+                        "size": size,
+                        "mmap": size >= self.mmap_threshold,
+                        "metrics": dict(metrics or {}),
+                        "checkpoint": checkpoint,
+                    }
+                )
+                manifest["current"] = version
+                self._prune(model_name, manifest)
+                self._write_manifest(model_name, manifest)
+                self._cache_current(model_name, version, model)
+
+            logger.info(f"Published model {model_name} version {version}")
             return True
 
         except Exception as e:
             logger.error(f"Error saving model {model_name}: {str(e)}")
             return False
 
-    def load_model(self, model_name: str) -> Optional[Any]:
-        # input: model name; loads model; output: model object or None
+    def load_model(
+        self, model_name: str, version: Optional[int] = None
+    ) -> Optional[Any]:
+        # input: model name, optional version; loads from cache or disk; output: model object or None
         try:
-            file_path = self.storage_dir / f"{model_name}.joblib"
+            with self._lock:
+                manifest = self._read_manifest(model_name)
 
-            if not file_path.exists():
-                logger.warning(f"Model {model_name} not found at {file_path}")
-                return None
+                if not manifest["versions"]:
+                    return self._load_legacy(model_name)
 
-            model = joblib.load(file_path)
-            logger.info(f"Loaded model {model_name} from {file_path}")
+                version = manifest["current"] if version is None else version
+                entry = self._find_version(manifest, version)
+                if entry is None:
+                    logger.warning(f"Model {model_name} has no version {version}")
+                    return None
+
+                key = (model_name, version)
+                if key in self._cache:
+                    return self._cache[key]
+
+                file_path = self.storage_dir / model_name / entry["file"]
+                # large array-backed models are mapped read-only so workers share OS pages
+                model = joblib.load(
+                    file_path, mmap_mode="r" if entry.get("mmap") else None
+                )
+                # older versions are read on demand; only the live one stays resident
+                if version == manifest["current"]:
+                    self._cache_current(model_name, version, model)
+
+            logger.info(f"Loaded model {model_name} version {version} from {file_path}")
             return model
 
         except Exception as e:
@@ -47,5 +118,129 @@ class FileModelRepository(IModelRepository):
 
     def model_exists(self, model_name: str) -> bool:
         # input: model name; checks existence; output: exists boolean
+        if self._read_manifest(model_name)["versions"]:
+            return True
+        return (self.storage_dir / f"{model_name}.joblib").exists()
+
+    def list_versions(self, model_name: str) -> List[Dict[str, Any]]:
+        # input: model name; reads the manifest; output: version entries with current flag
+        manifest = self._read_manifest(model_name)
+        return [
+            {**entry, "current": entry["version"] == manifest["current"]}
+            for entry in manifest["versions"]
+        ]
+
+    def rollback(self, model_name: str, version: int) -> bool:
+        # input: model name, kept version; repoints current without rewriting the model; output: success status
+        with self._model_lock(model_name):
+            manifest = self._read_manifest(model_name)
+            if self._find_version(manifest, version) is None:
+                raise LookupError(f"Model {model_name} has no version {version}")
+
+            manifest["current"] = version
+            self._write_manifest(model_name, manifest)
+            self._evict(model_name)
+
+        logger.info(f"Rolled back model {model_name} to version {version}")
+        return True
+
+    @contextmanager
+    def _model_lock(self, model_name: str):
+        # input: model name; serializes registry writes across threads and worker processes; output: lock context
+        lock_path = self.storage_dir / model_name / ".lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self, model_name: str) -> Dict[str, Any]:
+        # input: model name; reads manifest, reusing it while unchanged on disk; output: manifest dict
+        path = self.storage_dir / model_name / "manifest.json"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {"name": model_name, "current": None, "versions": []}
+
+        cached = self._manifests.get(model_name)
+        if cached and cached[0] == mtime:
+            return copy.deepcopy(cached[1])
+
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        self._manifests[model_name] = (mtime, manifest)
+        return copy.deepcopy(manifest)
+
+    def _write_manifest(self, model_name: str, manifest: Dict[str, Any]):
+        # input: model name, manifest; atomically replaces manifest file; output: none
+        path = self.storage_dir / model_name / "manifest.json"
+        self._atomic_write(
+            path, lambda f: f.write(json.dumps(manifest, indent=2).encode("utf-8"))
+        )
+        self._manifests.pop(model_name, None)
+
+    def _atomic_write(self, path: Path, write):
+        # input: target path, writer callback; writes temp file then renames; output: none
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _prune(self, model_name: str, manifest: Dict[str, Any]):
+        # input: model name, manifest; keeps retained releases, the latest checkpoint and current; output: none
+        versions = manifest["versions"]
+        releases = [v for v in versions if not v.get("checkpoint")]
+        checkpoints = [v for v in versions if v.get("checkpoint")]
+
+        # incremental checkpoints replace each other, so frequent saves never push releases out
+        keep_ids = {v["version"] for v in releases[-self.max_versions :]}
+        keep_ids.update(v["version"] for v in checkpoints[-1:])
+        keep_ids.add(manifest["current"])
+
+        keep = []
+        for entry in versions:
+            if entry["version"] in keep_ids:
+                keep.append(entry)
+                continue
+            (self.storage_dir / model_name / entry["file"]).unlink(missing_ok=True)
+        manifest["versions"] = keep
+
+    def _cache_current(self, model_name: str, version: int, model: Any):
+        # input: model name, current version, model; keeps one resident version per model; output: none
+        self._evict(model_name)
+        self._cache[(model_name, version)] = model
+
+    def _evict(self, model_name: str):
+        # input: model name; drops its cached versions; output: none
+        for key in [k for k in self._cache if k[0] == model_name]:
+            del self._cache[key]
+
+    def _find_version(
+        self, manifest: Dict[str, Any], version: int
+    ) -> Optional[Dict[str, Any]]:
+        # input: manifest, version; looks up entry; output: version entry or None
+        for entry in manifest["versions"]:
+            if entry["version"] == version:
+                return entry
+        return None
+
+    def _load_legacy(self, model_name: str) -> Optional[Any]:
+        # input: model name; reads pre-registry single file; output: model object or None
         file_path = self.storage_dir / f"{model_name}.joblib"
-        return file_path.exists()
+
+        if not file_path.exists():
+            logger.warning(f"Model {model_name} not found at {file_path}")
+            return None
+
+        model = joblib.load(file_path)
+        logger.info(f"Loaded model {model_name} from {file_path}")
+        return model
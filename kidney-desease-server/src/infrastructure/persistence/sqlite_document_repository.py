@@ -0,0 +1,354 @@
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from src.domain.entities import Document, DocumentType, ProcessingStatus
+from src.domain.repositories import IDocumentRepository
+from src.infrastructure.persistence.document_repository import (
+    FileDocumentRepository,
+    LazyDocument,
+    hash_content,
+    compress_content,
+    decompress_content,
+    to_naive,
+    encode_cursor,
+    decode_cursor,
+)
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "id, filename, doc_type, status, created_at, metadata"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    chunks_count INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_created ON documents (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_status_created
+    ON documents (status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents (content_hash);
+
+-- gzip content lives apart so listings and status updates never touch it
+CREATE TABLE IF NOT EXISTS document_contents (
+    id TEXT PRIMARY KEY,
+    content BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS document_counts (
+    status TEXT PRIMARY KEY,
+    documents INTEGER NOT NULL,
+    chunks INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS documents_count_insert AFTER INSERT ON documents
+BEGIN
+    INSERT INTO document_counts (status, documents, chunks)
+    VALUES (NEW.status, 1, NEW.chunks_count)
+    ON CONFLICT (status) DO UPDATE SET
+        documents = documents + 1, chunks = chunks + excluded.chunks;
+END;
+CREATE TRIGGER IF NOT EXISTS documents_count_delete AFTER DELETE ON documents
+BEGIN
+    UPDATE document_counts
+    SET documents = documents - 1, chunks = chunks - OLD.chunks_count
+    WHERE status = OLD.status;
+END;
+CREATE TRIGGER IF NOT EXISTS documents_count_update
+AFTER UPDATE OF status, chunks_count ON documents
+BEGIN
+    UPDATE document_counts
+    SET documents = documents - 1, chunks = chunks - OLD.chunks_count
+    WHERE status = OLD.status;
+    INSERT INTO document_counts (status, documents, chunks)
+    VALUES (NEW.status, 1, NEW.chunks_count)
+    ON CONFLICT (status) DO UPDATE SET
+        documents = documents + 1, chunks = chunks + excluded.chunks;
+END;
+
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    applied_at TEXT NOT NULL
+);
+"""
+
+
+class SqliteDocumentRepository(IDocumentRepository):
+    # sqlite document storage in WAL mode with indexed keyset pagination, trigger-kept counters and lazy gzip content
+
+    def __init__(self, db_path: str = "./data/documents.db"):
+        # input: database file path; creates schema and enables WAL; output: none
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # sqlite allows one writer; serializing here avoids busy retries
+        self._write_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._split_content(conn)
+        logger.info(f"Document repository initialized at {self.db_path}")
+
+    def save(self, document: Document) -> Document:
+        # input: document entity; upserts metadata, and content only when it changed; output: saved document
+        with self._write_lock, self._connection() as conn:
+            self._write(conn, document)
+
+        logger.debug(f"Saved document {document.id} to {self.db_path}")
+        return document
+
+    def get_by_id(self, doc_id: str) -> Optional[Document]:
+        # input: document id; reads its row; output: document or None
+        row = (
+            self._connection()
+            .execute(f"SELECT {_COLUMNS} FROM documents WHERE id = ?", (doc_id,))
+            .fetchone()
+        )
+        return self._to_document(row) if row else None
+
+    def get_all(self, skip: int = 0, limit: int = 100) -> List[Document]:
+        # input: pagination params; reads one offset page newest first; output: document list
+        rows = (
+            self._connection()
+            .execute(
+                f"SELECT {_COLUMNS} FROM documents "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, skip),
+            )
+            .fetchall()
+        )
+        return [self._to_document(row) for row in rows]
+
+    def list_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[ProcessingStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        # input: page size, cursor, filters; seeks the index past the cursor; output: documents and next cursor
+        clauses, params = [], []
+
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(self._timestamp(to_naive(created_after)))
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(self._timestamp(to_naive(created_before)))
+        if cursor:
+            after_created, after_id = decode_cursor(cursor)
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend([self._timestamp(after_created), after_id])
+
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = (
+            self._connection()
+            .execute(
+                f"SELECT {_COLUMNS} FROM documents {where}"
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit + 1),
+            )
+            .fetchall()
+        )
+
+        documents = [self._to_document(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(documents[-1].created_at, documents[-1].id)
+        return documents, next_cursor
+
+    def get_by_content_hash(self, content_hash: str) -> Optional[Document]:
+        # input: content digest; looks it up through the hash index; output: document or None
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT {_COLUMNS} FROM documents WHERE content_hash = ? "
+                "ORDER BY created_at LIMIT 1",
+                (content_hash,),
+            )
+            .fetchone()
+        )
+        return self._to_document(row) if row else None
+
+    def update_status(
+        self, doc_id: str, status: ProcessingStatus, metadata: Dict[str, Any]
+    ) -> bool:
+        # input: document id, status, metadata; updates the metadata row only; output: found status
+        with self._write_lock, self._connection() as conn:
+            updated = conn.execute(
+                "UPDATE documents SET status = ?, chunks_count = ?, metadata = ? "
+                "WHERE id = ?",
+                (
+                    status.value,
+                    int(metadata.get("chunks_count", 0)),
+                    json.dumps(metadata, ensure_ascii=False),
+                    doc_id,
+                ),
+            ).rowcount
+        return bool(updated)
+
+    def delete(self, doc_id: str) -> bool:
+        # input: document id; deletes its row and content; output: success status
+        with self._write_lock, self._connection() as conn:
+            deleted = conn.execute(
+                "DELETE FROM documents WHERE id = ?", (doc_id,)
+            ).rowcount
+            conn.execute("DELETE FROM document_contents WHERE id = ?", (doc_id,))
+
+        if not deleted:
+            return False
+        logger.info(f"Deleted document {doc_id}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        # input: none; reads trigger-maintained counters; output: totals by status and chunk counts
+        rows = (
+            self._connection()
+            .execute(
+                "SELECT status, documents, chunks FROM document_counts "
+                "WHERE documents > 0"
+            )
+            .fetchall()
+        )
+        return {
+            "total_documents": sum(row[1] for row in rows),
+            "status_counts": {row[0]: row[1] for row in rows},
+            "total_chunks": sum(row[2] for row in rows),
+        }
+
+    def migrate_from_json(self, json_dir: str) -> int:
+        # input: legacy json document directory; imports it once, keeping the files; output: imported count
+        source = Path(json_dir)
+
+        with self._write_lock, self._connection() as conn:
+            applied = conn.execute(
+                "SELECT 1 FROM migrations WHERE name = 'json_documents'"
+            ).fetchone()
+            if applied:
+                return 0
+
+            imported = 0
+            if source.is_dir():
+                for document in FileDocumentRepository(json_dir).iter_documents():
+                    if self._exists(conn, document.id):
+                        continue
+                    self._write(conn, document)
+                    imported += 1
+
+            conn.execute(
+                "INSERT INTO migrations (name, applied_at) VALUES (?, ?)",
+                ("json_documents", datetime.now().isoformat()),
+            )
+
+        logger.info(f"Migrated {imported} documents from {source} into {self.db_path}")
+        return imported
+
+    def _connection(self) -> sqlite3.Connection:
+        # input: none; opens one connection per thread on first use; output: connection
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, conn: sqlite3.Connection, document: Document):
+        # input: open transaction, document entity; upserts metadata and changed content; output: none
+        digest = hash_content(document.content)
+        stored = conn.execute(
+            "SELECT content_hash FROM documents WHERE id = ?", (document.id,)
+        ).fetchone()
+
+        conn.execute(
+            """
+            INSERT INTO documents (
+                id, filename, doc_type, status, created_at,
+                content_hash, chunks_count, metadata
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                filename = excluded.filename,
+                doc_type = excluded.doc_type,
+                status = excluded.status,
+                created_at = excluded.created_at,
+                content_hash = excluded.content_hash,
+                chunks_count = excluded.chunks_count,
+                metadata = excluded.metadata
+            """,
+            (
+                document.id,
+                document.filename,
+                document.doc_type.value,
+                document.status.value,
+                self._timestamp(document.created_at),
+                digest,
+                int(document.metadata.get("chunks_count", 0)),
+                json.dumps(document.metadata, ensure_ascii=False),
+            ),
+        )
+
+        if stored is None or stored[0] != digest:
+            conn.execute(
+                "INSERT OR REPLACE INTO document_contents (id, content) VALUES (?, ?)",
+                (document.id, compress_content(document.content)),
+            )
+
+    def _exists(self, conn: sqlite3.Connection, doc_id: str) -> bool:
+        # input: connection, document id; checks for its row; output: exists boolean
+        return (
+            conn.execute("SELECT 1 FROM documents WHERE id = ?", (doc_id,)).fetchone()
+            is not None
+        )
+
+    def _load_content(self, doc_id: str) -> str:
+        # input: document id; reads and inflates its content blob; output: document text
+        row = (
+            self._connection()
+            .execute("SELECT content FROM document_contents WHERE id = ?", (doc_id,))
+            .fetchone()
+        )
+        return decompress_content(row[0] if row else None)
+
+    def _split_content(self, conn: sqlite3.Connection):
+        # input: connection; moves inline content of older databases into gzip blobs; output: none
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(documents)")]
+        if "content" not in columns:
+            return
+
+        with conn:
+            rows = conn.execute("SELECT id, content FROM documents").fetchall()
+            conn.executemany(
+                "INSERT OR REPLACE INTO document_contents (id, content) VALUES (?, ?)",
+                [(doc_id, compress_content(content)) for doc_id, content in rows],
+            )
+            conn.execute("ALTER TABLE documents DROP COLUMN content")
+        logger.info(f"Moved content of {len(rows)} documents into compressed blobs")
+
+    def _timestamp(self, value: datetime) -> str:
+        # input: datetime; formats it with fixed precision so text order matches time order; output: iso string
+        return value.isoformat(timespec="microseconds")
+
+    def _to_document(self, row: Tuple[Any, ...]) -> Document:
+        # input: selected row; rebuilds the entity with deferred content; output: document
+        doc_id, filename, doc_type, status, created_at, metadata = row
+        return LazyDocument(
+            lambda: self._load_content(doc_id),
+            id=doc_id,
+            filename=filename,
+            doc_type=DocumentType(doc_type),
+            created_at=datetime.fromisoformat(created_at),
+            status=ProcessingStatus(status),
+            metadata=json.loads(metadata),
+        )
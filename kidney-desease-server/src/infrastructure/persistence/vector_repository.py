@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import chromadb
 from chromadb.config import Settings
 import logging
@@ -11,8 +11,10 @@ logger = logging.getLogger(__name__)
 class ChromaVectorRepository(IVectorRepository):
     # chromadb vector storage implementation
 
-    def __init__(self, persist_directory: str = "./data/chroma_db"):
-        # input: persist directory; initializes chromadb; output: none
+    def __init__(
+        self, persist_directory: str = "./data/chroma_db", batch_size: int = 5000
+    ):
+        # input: persist directory, id batch size; initializes chromadb; output: none
         logger.info(f"Initializing ChromaDB at {persist_directory}")
 
         self.client = chromadb.PersistentClient(
@@ -24,6 +26,10 @@ class ChromaVectorRepository(IVectorRepository):
             name="kidney_disease_docs", metadata={"hnsw:space": "cosine"}
         )
 
+        self.batch_size = batch_size
+        self.generation = 0
+        self.content_generation = 0
+
         logger.info("ChromaDB initialized successfully")
 
     def add_chunks(self, chunks: List[Chunk]) -> bool:
@@ -48,6 +54,8 @@ class ChromaVectorRepository(IVectorRepository):
             self.collection.add(
                 ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
             )
+            self.generation += 1
+            self.content_generation += 1
 
             logger.info(f"Added {len(chunks)} chunks to vector database")
             return True
@@ -99,34 +107,118 @@ class ChromaVectorRepository(IVectorRepository):
                 where=where_filter, include=["embeddings", "documents", "metadatas"]
             )
 
-            chunks = []
+            chunks = self._to_chunks(results)
 
-            has_embeddings = (
-                results["embeddings"] is not None and len(results["embeddings"]) > 0
-            )
+            logger.info(f"Retrieved {len(chunks)} chunks")
+            return chunks
+
+        except Exception as e:
+            logger.error(f"Error retrieving chunks: {str(e)}")
+            raise
+
+    def iter_chunks(
+        self,
+        batch_size: int = 1000,
+        include_embeddings: bool = True,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[List[Chunk]]:
+        # input: page size, embedding flag, filters; streams stored chunks; output: chunk pages
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
 
-            for i in range(len(results["ids"])):
-                chunk = Chunk(
-                    id=results["ids"][i],
-                    document_id=results["metadatas"][i].get("document_id", ""),
-                    content=results["documents"][i],
-                    chunk_index=results["metadatas"][i].get("chunk_index", 0),
-                    embedding=results["embeddings"][i] if has_embeddings else None,
-                    metadata=results["metadatas"][i],
+        offset = 0
+        while True:
+            try:
+                results = self.collection.get(
+                    where=filter_metadata or None,
+                    include=include,
+                    limit=batch_size,
+                    offset=offset,
                 )
-                chunks.append(chunk)
+            except Exception as e:
+                logger.error(f"Error paging chunks at offset {offset}: {str(e)}")
+                raise
+
+            if not results["ids"]:
+                break
+
+            yield self._to_chunks(results)
+
+            if len(results["ids"]) < batch_size:
+                break
+            offset += batch_size
+
+    def count_chunks(self, filter_metadata: Optional[Dict[str, Any]] = None) -> int:
+        # input: optional filters; counts stored chunks; output: chunk count
+        try:
+            if not filter_metadata:
+                return self.collection.count()
+            results = self.collection.get(where=filter_metadata, include=[])
+            return len(results["ids"])
+
+        except Exception as e:
+            logger.error(f"Error counting chunks: {str(e)}")
+            raise
+
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[Chunk]:
+        # input: chunk id; retrieves stored chunk with embedding; output: chunk or None
+        chunks = self.get_chunks_by_ids([chunk_id])
+        return chunks[0] if chunks else None
+
+    def get_chunks_by_ids(
+        self, chunk_ids: List[str], include_embeddings: bool = True
+    ) -> List[Chunk]:
+        # input: chunk ids, embedding flag; looks up by id in batches; output: found chunks
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        unique_ids = list(dict.fromkeys(chunk_ids))
+        chunks = []
+
+        try:
+            for start in range(0, len(unique_ids), self.batch_size):
+                results = self.collection.get(
+                    ids=unique_ids[start : start + self.batch_size],
+                    include=include,
+                )
+                chunks.extend(self._to_chunks(results))
 
-            logger.info(f"Retrieved {len(chunks)} chunks")
             return chunks
 
         except Exception as e:
-            logger.error(f"Error retrieving chunks: {str(e)}")
+            logger.error(f"Error retrieving chunks by id: {str(e)}")
+            raise
+
+    def update_metadata(
+        self, chunk_ids: List[str], metadatas: List[Dict[str, Any]]
+    ) -> int:
+        # input: chunk ids, partial metadata dicts; merges in batches; output: updated count
+        if not chunk_ids:
+            return 0
+
+        try:
+            for start in range(0, len(chunk_ids), self.batch_size):
+                end = start + self.batch_size
+                self.collection.update(
+                    ids=chunk_ids[start:end], metadatas=metadatas[start:end]
+                )
+
+            self.generation += 1
+            logger.info(f"Updated metadata for {len(chunk_ids)} chunks")
+            return len(chunk_ids)
+
+        except Exception as e:
+            logger.error(f"Error updating chunk metadata: {str(e)}")
             raise
 
     def delete_by_document(self, document_id: str) -> bool:
         # input: document id; deletes related chunks; output: success status
         try:
             self.collection.delete(where={"document_id": document_id})
+            self.generation += 1
+            self.content_generation += 1
             logger.info(f"Deleted chunks for document {document_id}")
             return True
 
@@ -148,3 +240,33 @@ class ChromaVectorRepository(IVectorRepository):
         except Exception as e:
             logger.error(f"Error retrieving embeddings: {str(e)}")
             raise
+
+    def get_generation(self) -> int:
+        # input: none; reads write counter; output: current index generation
+        return self.generation
+
+    def get_content_generation(self) -> int:
+        # input: none; reads the chunk add and delete counter; output: generation ignoring metadata writes
+        return self.content_generation
+
+    def _to_chunks(self, results: Dict[str, Any]) -> List[Chunk]:
+        # input: chromadb get results; maps rows to entities; output: chunk list
+        chunks = []
+
+        has_embeddings = (
+            results.get("embeddings") is not None and len(results["embeddings"]) > 0
+        )
+        has_documents = results.get("documents") is not None
+
+        for i in range(len(results["ids"])):
+            chunk = Chunk(
+                id=results["ids"][i],
+                document_id=results["metadatas"][i].get("document_id", ""),
+                content=results["documents"][i] if has_documents else "",
+                chunk_index=results["metadatas"][i].get("chunk_index", 0),
+                embedding=results["embeddings"][i] if has_embeddings else None,
+                metadata=results["metadatas"][i],
+            )
+            chunks.append(chunk)
+
+        return chunks
@@ -0,0 +1,168 @@
+from typing import Any, Callable, Dict, Optional
+from datetime import datetime
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsScheduler:
+    # recomputes analytics snapshots in a background thread on corpus churn or a timer
+
+    def __init__(
+        self,
+        jobs: Dict[str, Callable[[], Any]],
+        generation_fn: Callable[[], int],
+        interval_seconds: float = 900.0,
+        min_changes: int = 5,
+        max_staleness_seconds: float = 3600.0,
+        poll_seconds: float = 5.0,
+    ):
+        # input: named jobs, index generation reader, timer, churn trigger, staleness limit, poll period; initializes; output: none
+        self.jobs = jobs
+        self.generation_fn = generation_fn
+        self.interval_seconds = interval_seconds
+        self.min_changes = min_changes
+        self.max_staleness_seconds = max_staleness_seconds
+        self.poll_seconds = poll_seconds
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self.corpus_version = 0
+        self.cycle_version = 0
+        self.last_cycle_at: Optional[float] = None
+        self.running = False
+        self._forced = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        # input: none; starts the scheduler thread; output: none
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="analytics-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Analytics scheduler started")
+
+    def stop(self):
+        # input: none; signals the thread and waits briefly; output: none
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds)
+        logger.info("Analytics scheduler stopped")
+
+    def notify_change(self, count: int = 1):
+        # input: number of corpus changes; bumps corpus version, waking early past the threshold; output: none
+        with self._lock:
+            self.corpus_version += count
+            due = self.corpus_version - self.cycle_version >= self.min_changes
+        if due:
+            self._wake.set()
+
+    def trigger(self):
+        # input: none; requests an immediate recompute; output: none
+        with self._lock:
+            self._forced = True
+        self._wake.set()
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        # input: job name; reads the latest snapshot with freshness; output: snapshot dict or None
+        with self._lock:
+            snapshot = self.snapshots.get(name)
+            corpus_version = self.corpus_version
+        if snapshot is None:
+            return None
+
+        age = (datetime.now() - snapshot["computed_at"]).total_seconds()
+        return {
+            **snapshot,
+            "age_seconds": age,
+            "stale": snapshot["corpus_version"] != corpus_version
+            or age > self.max_staleness_seconds,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        # input: none; summarizes scheduler state; output: status dictionary
+        with self._lock:
+            pending = self.corpus_version - self.cycle_version
+            names = list(self.snapshots)
+        return {
+            "running": self.running,
+            "pending_changes": pending,
+            "last_cycle_at": (
+                datetime.fromtimestamp(self.last_cycle_at) if self.last_cycle_at else None
+            ),
+            "snapshots": {
+                name: {
+                    key: value
+                    for key, value in self.get(name).items()
+                    if key != "result"
+                }
+                for name in names
+            },
+        }
+
+    def run_cycle(self):
+        # input: none; runs every job once, keeping the previous snapshot on failure; output: none
+        with self._lock:
+            corpus_version = self.corpus_version
+            self._forced = False
+        self.running = True
+
+        try:
+            for name, job in self.jobs.items():
+                generation = self.generation_fn()
+                started = time.perf_counter()
+                try:
+                    result = job()
+                except Exception as e:
+                    logger.warning(f"Analytics job {name} failed: {str(e)}")
+                    continue
+
+                duration = time.perf_counter() - started
+                with self._lock:
+                    self.snapshots[name] = {
+                        "result": result,
+                        "generation": generation,
+                        "corpus_version": corpus_version,
+                        "computed_at": datetime.now(),
+                        "duration_seconds": duration,
+                    }
+                logger.info(
+                    f"Analytics job {name} refreshed at generation {generation} in {duration:.2f}s"
+                )
+        finally:
+            with self._lock:
+                self.cycle_version = corpus_version
+            self.last_cycle_at = time.time()
+            self.running = False
+
+    def _due(self) -> bool:
+        # input: none; checks forced, churn and timer triggers; output: due boolean
+        with self._lock:
+            pending = self.corpus_version - self.cycle_version
+            forced = self._forced
+            missing = len(self.snapshots) < len(self.jobs)
+
+        if forced or pending >= self.min_changes:
+            return True
+        if self.last_cycle_at is None:
+            return True
+        elapsed = time.time() - self.last_cycle_at
+        return elapsed >= self.interval_seconds and (pending > 0 or missing)
+
+    def _loop(self):
+        # input: none; polls triggers until stopped; output: none
+        while not self._stop.is_set():
+            if self._due():
+                try:
+                    self.run_cycle()
+                except Exception as e:
+                    logger.error(f"Analytics cycle failed: {str(e)}")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
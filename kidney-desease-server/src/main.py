@@ -3,6 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 from pathlib import Path
 from src.config.settings import settings
+from src.api.upload_limit import UploadSizeLimitMiddleware
+from src.api.dependencies import (
+    get_search_executor,
+    get_analytics_executor,
+    get_analytics_scheduler,
+    get_pdf_extractor,
+    get_related_use_case,
+)
 from src.api.routes import (
     documents,
     search,
@@ -11,6 +19,8 @@ from src.api.routes import (
     quality,
     visualization,
     status,
+    related,
+    registry,
 )
 
 logging.basicConfig(
@@ -34,6 +44,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# runs before the multipart parser so oversized bodies are never spooled in full
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.max_upload_size + settings.upload_multipart_overhead,
+    paths=["/documents/upload"],
+)
+
 app.include_router(documents.router)
 app.include_router(search.router)
 app.include_router(clustering.router)
@@ -41,6 +58,8 @@ app.include_router(anomaly.router)
 app.include_router(quality.router)
 app.include_router(visualization.router)
 app.include_router(status.router)
+app.include_router(related.router)
+app.include_router(registry.router)
 
 
 @app.on_event("startup")
@@ -57,6 +76,22 @@ async def startup_event():
     logger.info(f"Embedding model: {settings.embedding_model}")
     logger.info(f"Chunk size: {settings.chunk_size}")
 
+    if settings.analytics_scheduler_enabled:
+        get_analytics_scheduler().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # input: none; stops background scheduler and worker pools, saving pending graph changes; output: none
+    if settings.analytics_scheduler_enabled:
+        get_analytics_scheduler().stop()
+    get_search_executor().shutdown()
+    get_analytics_executor().shutdown()
+    get_related_use_case().flush()
+    if get_pdf_extractor() is not None:
+        get_pdf_extractor().shutdown()
+    logger.info("Worker pools stopped")
+
 
 @app.get("/")
 async def root():
@@ -70,8 +105,13 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    # input: none; checks health; output: health status
-    return {"status": "healthy"}
+    # input: none; checks health; output: health status and worker pool load
+    pdf_extractor = get_pdf_extractor()
+    return {
+        "status": "healthy",
+        "executors": [get_search_executor().stats(), get_analytics_executor().stats()],
+        "pdf_extraction": pdf_extractor.stats() if pdf_extractor else None,
+    }
 
 
 if __name__ == "__main__":